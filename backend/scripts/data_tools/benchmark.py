@@ -0,0 +1,302 @@
+from __future__ import annotations
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import sys
+import tempfile
+import time
+from queue import Empty
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from data_processor import DataProcessor
+from data_converter import DataConverter
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+# ----------------- Synthetic data -----------------
+NAMES = ['Alice', 'Bob', 'Charlie', 'Diana', 'Eve', 'Frank', 'Grace', 'Heidi']
+CITIES = ['New York', 'London', 'Tokyo', 'Paris', 'Sydney', 'Berlin', 'Toronto']
+DEPARTMENTS = ['IT', 'HR', 'Finance', 'Sales', 'Legal']
+
+
+def generate_chunk(rows: int, rng: np.random.Generator, null_ratio: float = 0.05, offset: int = 0) -> pd.DataFrame:
+    # create_sample_data's schema plus float, bool, datetime and padded text columns
+    df = pd.DataFrame({
+        'id': np.arange(offset, offset + rows),
+        'name': rng.choice(NAMES, rows),
+        'age': rng.integers(18, 70, rows),
+        'city': rng.choice(CITIES, rows),
+        'salary': rng.integers(30_000, 150_000, rows).astype(float),
+        'department': rng.choice(DEPARTMENTS, rows),
+        'score': rng.normal(50, 15, rows).round(3),
+        'active': rng.random(rows) < 0.8,
+        'joined': pd.Timestamp('2015-01-01') + pd.to_timedelta(rng.integers(0, 3650, rows), unit='D'),
+        'notes': np.char.add('  note ', rng.integers(0, 1000, rows).astype(str)),
+    })
+    for col in ('city', 'salary', 'score', 'notes'):
+        df.loc[rng.random(rows) < null_ratio, col] = None
+    return df
+
+
+def generate_dataset(path: str, rows: int, null_ratio: float = 0.05, seed: int = 42, chunk_rows: int = 1_000_000) -> str:
+    # Written chunk by chunk so 1e8-row files never sit in memory
+    rng = np.random.default_rng(seed)
+    written = 0
+    first = True
+    while first or written < rows:
+        n = min(chunk_rows, rows - written)
+        generate_chunk(n, rng, null_ratio, written).to_csv(path, index=False, mode='w' if first else 'a', header=first)
+        written += n
+        first = False
+    return path
+
+
+# ----------------- Cases -----------------
+# Each case takes (input csv, scratch dir, stream) and returns the number of rows it processed.
+# stream=True means the input is too large for the in-memory code path.
+FILTERS = [
+    {"column": "age", "operator": "greater_than", "value": 30},
+    {"column": "department", "operator": "in", "value": ["IT", "Finance"]},
+    {"column": "notes", "operator": "contains", "value": "9"},
+]
+
+
+def case_read(path: str, work: str, stream: bool) -> int:
+    processor = DataProcessor(verbose=False)
+    if stream:
+        return sum(len(chunk) for chunk in processor.iter_chunks(path))
+    return len(processor.read_data(path))
+
+
+def case_clean(path: str, work: str, stream: bool) -> int:
+    processor = DataProcessor(verbose=False)
+    out = os.path.join(work, 'cleaned.csv')
+    if stream:
+        return processor.clean_file(path, out)["rows_in"]
+    df = processor.read_data(path)
+    processor.write_data(processor.clean_data(df), out)
+    return len(df)
+
+
+def case_filter(path: str, work: str, stream: bool) -> int:
+    processor = DataProcessor(verbose=False)
+    if stream:
+        rows = 0
+        for chunk in processor.iter_chunks(path):
+            processor.filter_data(chunk, FILTERS)
+            rows += len(chunk)
+        return rows
+    df = processor.read_data(path)
+    processor.filter_data(df, FILTERS)
+    return len(df)
+
+
+def case_aggregate(path: str, work: str, stream: bool) -> int:
+    processor = DataProcessor(verbose=False)
+    aggs = {"salary": ["mean", "std"], "age": "max"}
+    if stream:
+        rows = 0
+
+        def counted():
+            nonlocal rows
+            for chunk in processor.iter_chunks(path):
+                rows += len(chunk)
+                yield chunk
+        processor.aggregate_data(counted(), "department", aggs)
+        return rows
+    df = processor.read_data(path)
+    processor.aggregate_data(df, "department", aggs)
+    return len(df)
+
+
+def case_convert(path: str, work: str, stream: bool) -> Optional[int]:
+    if stream:
+        return None
+    converter = DataConverter()
+    converter.convert_file(path, os.path.join(work, 'converted.json'))
+    with open(path, encoding='utf-8') as f:
+        return sum(1 for _ in f) - 1
+
+
+def case_plot(path: str, work: str, stream: bool) -> Optional[int]:
+    if stream:
+        return None
+    os.environ.setdefault('MPLBACKEND', 'Agg')
+    from data_visualizer import DataVisualizer
+    visualizer = DataVisualizer()
+    df = visualizer.load_data(path)
+    visualizer.create_histogram(df, 'salary', output_file=os.path.join(work, 'histogram.png'))
+    return len(df)
+
+
+CASES: Dict[str, Callable[[str, str, bool], Optional[int]]] = {
+    "read": case_read,
+    "clean": case_clean,
+    "filter": case_filter,
+    "aggregate": case_aggregate,
+    "convert": case_convert,
+    "plot": case_plot,
+}
+
+
+# ----------------- Runner -----------------
+def _peak_rss() -> Optional[int]:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS and kilobytes elsewhere
+    return int(peak if sys.platform == 'darwin' else peak * 1024)
+
+
+def _child(name: str, path: str, work: str, stream: bool, queue: Any) -> None:
+    import io
+    import contextlib
+    try:
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            rows = CASES[name](path, work, stream)
+        wall = time.perf_counter() - start
+        queue.put({"status": "ok" if rows is not None else "skipped", "rows": rows, "wall_s": wall, "peak_rss_bytes": _peak_rss()})
+    except Exception as e:
+        queue.put({"status": "error", "error": f"{type(e).__name__}: {e}"})
+
+
+def run_case(name: str, path: str, work: str, stream: bool) -> Dict[str, Any]:
+    # Every case runs in a fresh process so peak RSS belongs to that case alone
+    queue = multiprocessing.Queue()
+    proc = multiprocessing.Process(target=_child, args=(name, path, work, stream, queue))
+    proc.start()
+    result = None
+    while result is None:
+        try:
+            result = queue.get(timeout=1.0)
+        except Empty:
+            # A child killed before reporting (e.g. by the OOM killer) never puts a result
+            if not proc.is_alive():
+                try:
+                    result = queue.get(timeout=1.0)
+                except Empty:
+                    proc.join()
+                    result = {"status": "error", "error": f"exit code {proc.exitcode}"}
+    proc.join()
+    if result.get("status") == "ok":
+        result["rows_per_s"] = result["rows"] / result["wall_s"] if result["wall_s"] else None
+    return result
+
+
+def run_benchmarks(sizes: List[int], cases: List[str], work: str, stream_above: int = 5_000_000,
+                   null_ratio: float = 0.05) -> Dict[str, Any]:
+    results = []
+    for rows in sizes:
+        path = os.path.join(work, f"synthetic_{rows}.csv")
+        if not os.path.exists(path):
+            print(f"Generating {rows:,} rows -> {path}")
+            generate_dataset(path, rows, null_ratio)
+        stream = rows > stream_above
+        for name in cases:
+            result = run_case(name, path, work, stream)
+            result.update({"case": name, "size": rows, "stream": stream})
+            results.append(result)
+            print(format_result(result))
+    return {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+        "results": results,
+    }
+
+
+def format_result(result: Dict[str, Any]) -> str:
+    label = f"{result['case']:<10} {result['size']:>12,}"
+    if result["status"] != "ok":
+        return f"{label}  {result['status']} {result.get('error', '')}".rstrip()
+    rss = result.get("peak_rss_bytes")
+    rss_txt = f"{rss / 1024 ** 2:,.0f} MiB" if rss else "n/a"
+    return f"{label}  {result['wall_s']:8.3f}s  {result['rows_per_s']:>14,.0f} rows/s  peak {rss_txt}"
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], tolerance: float = 0.2) -> List[str]:
+    # A case regresses when wall time or peak RSS grew by more than tolerance
+    base = {(r["case"], r["size"], r["stream"]): r for r in baseline.get("results", []) if r.get("status") == "ok"}
+    regressions = []
+    for r in current["results"]:
+        old = base.get((r["case"], r["size"], r["stream"]))
+        if r.get("status") != "ok" or old is None:
+            continue
+        for key in ("wall_s", "peak_rss_bytes"):
+            if r.get(key) and old.get(key) and r[key] > old[key] * (1 + tolerance):
+                regressions.append(f"{r['case']} @ {r['size']:,} rows: {key} {old[key]:.4g} -> {r[key]:.4g} "
+                                   f"(+{r[key] / old[key] - 1:.0%})")
+    return regressions
+
+
+# ----------------- CLI -----------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmarks for DataProcessor, DataConverter and DataVisualizer")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    gen = sub.add_parser("generate", help="Write a synthetic CSV dataset")
+    gen.add_argument("output")
+    gen.add_argument("rows", type=float)
+    gen.add_argument("--null-ratio", type=float, default=0.05)
+    gen.add_argument("--seed", type=int, default=42)
+
+    run = sub.add_parser("run", help="Run the benchmark cases")
+    run.add_argument("--rows", default="1e3,1e5", help="Comma separated dataset sizes, e.g. 1e3,1e6,1e8")
+    run.add_argument("--cases", default=",".join(CASES), help="Comma separated subset of: " + ", ".join(CASES))
+    run.add_argument("--workdir", help="Directory for datasets and outputs (default: a temp dir)")
+    run.add_argument("--stream-above", type=float, default=5e6, help="Use the chunked code paths above this many rows")
+    run.add_argument("--null-ratio", type=float, default=0.05)
+    run.add_argument("--out", default="bench_results.json", help="JSON results file")
+    run.add_argument("--baseline", help="Baseline results to compare against")
+    run.add_argument("--save-baseline", help="Also write the results to this baseline file")
+    run.add_argument("--tolerance", type=float, default=0.2, help="Allowed slowdown/growth before flagging (0.2 = 20%%)")
+
+    args = parser.parse_args()
+
+    if args.command == "generate":
+        generate_dataset(args.output, int(args.rows), args.null_ratio, args.seed)
+        print(f"Synthetic dataset written to {args.output}")
+        sys.exit(0)
+
+    unknown = [c for c in args.cases.split(",") if c not in CASES]
+    if unknown:
+        print(f"Unknown cases: {', '.join(unknown)}")
+        sys.exit(1)
+    work = args.workdir or tempfile.mkdtemp(prefix="data_tools_bench_")
+    os.makedirs(work, exist_ok=True)
+    sizes = [int(float(s)) for s in args.rows.split(",")]
+    report = run_benchmarks(sizes, args.cases.split(","), work, int(args.stream_above), args.null_ratio)
+
+    with open(args.out, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"Results saved to {args.out}")
+    if args.save_baseline:
+        with open(args.save_baseline, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline saved to {args.save_baseline}")
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.tolerance)
+        if regressions:
+            print("\nRegressions:")
+            for line in regressions:
+                print(f" {line}")
+            sys.exit(1)
+        print("\nNo regressions against baseline")
@@ -0,0 +1,108 @@
+from __future__ import annotations
+import bz2
+import gzip
+import io
+import lzma
+import os
+from typing import Any, Dict, Optional, Tuple, Union
+
+# Compound extensions: data.csv.gz is CSV compressed with gzip
+EXTENSIONS = {'gz': 'gzip', 'gzip': 'gzip', 'bz2': 'bz2', 'xz': 'xz', 'zst': 'zstd', 'zstd': 'zstd'}
+_MAGIC = ((b'\x1f\x8b', 'gzip'), (b'\xfd7zXZ\x00', 'xz'), (b'\x28\xb5\x2f\xfd', 'zstd'))
+
+# Defaults for zstd writes; threads=-1 compresses on every core, 0 compresses inline
+ZSTD_LEVEL = 3
+ZSTD_THREADS = -1
+
+# compression arguments follow pandas: 'infer' (extension, plus magic bytes when reading),
+# None, a method name, or a dict such as {'method': 'zstd', 'level': 19, 'threads': 8}
+Compression = Union[str, Dict[str, Any], None]
+
+
+def split_compression(path: str) -> Tuple[str, Optional[str]]:
+    # ('data.csv', 'gzip') for data.csv.gz; (path, None) when there is no compression suffix
+    root, ext = os.path.splitext(path)
+    method = EXTENSIONS.get(ext.lower().lstrip('.'))
+    return (root, method) if method else (path, None)
+
+
+def data_extension(path: str) -> str:
+    # The format extension underneath any compression suffix: 'csv' for data.csv.gz
+    return os.path.splitext(split_compression(path)[0])[1].lower().lstrip('.')
+
+
+def _sniff(path: str) -> Optional[str]:
+    try:
+        with open(path, 'rb') as f:
+            head = f.read(6)
+    except OSError:
+        return None
+    if head[:3] == b'BZh' and head[3:4].isdigit():
+        return 'bz2'
+    return next((method for magic, method in _MAGIC if head.startswith(magic)), None)
+
+
+def resolve(path: str, compression: Compression = 'infer', write: bool = False) -> Optional[Dict[str, Any]]:
+    # {'method': ..., options} for path, or None when it is (to be) stored uncompressed
+    options = dict(compression) if isinstance(compression, dict) else {'method': compression}
+    if options['method'] == 'infer':
+        options['method'] = split_compression(path)[1] or (None if write else _sniff(path))
+    if options['method'] is None:
+        return None
+    if options['method'] not in ('gzip', 'bz2', 'xz', 'zstd'):
+        raise ValueError(f"Unsupported compression: {options['method']}")
+    if write and options['method'] == 'zstd':
+        options.setdefault('level', ZSTD_LEVEL)
+        options.setdefault('threads', ZSTD_THREADS)
+    return options
+
+
+def _zstandard() -> Any:
+    try:
+        import zstandard
+    except ImportError as e:
+        raise ImportError("zstd compression needs the 'zstandard' package (pip install zstandard)") from e
+    return zstandard
+
+
+def pandas_compression(path: str, compression: Compression = 'infer', write: bool = False) -> Any:
+    # The same choice spelled as pandas' compression= argument
+    options = resolve(path, compression, write)
+    if options is None:
+        return None
+    method = options['method']
+    if not write:
+        return method
+    level = options.get('level')
+    if method == 'zstd':
+        _zstandard()
+        return {'method': 'zstd', 'level': level, 'threads': options['threads']}
+    if level is None:
+        return method
+    return {'method': method, 'preset' if method == 'xz' else 'compresslevel': level}
+
+
+def open_file(path: str, mode: str = 'rb', compression: Compression = 'infer', encoding: Optional[str] = 'utf-8',
+              newline: Optional[str] = None) -> Any:
+    # open() with transparent (de)compression; 'r'/'w'/'a' modes with or without 'b'
+    write = any(m in mode for m in 'wa')
+    options = resolve(path, compression, write)
+    text = 'b' not in mode
+    if options is None:
+        return open(path, mode, encoding=encoding if text else None, newline=newline if text else None)
+    binary = mode.replace('t', '').replace('b', '') + 'b'
+    method, level = options['method'], options.get('level')
+    if method == 'gzip':
+        raw = gzip.open(path, binary, compresslevel=9 if level is None else level)
+    elif method == 'bz2':
+        raw = bz2.open(path, binary, compresslevel=9 if level is None else level)
+    elif method == 'xz':
+        raw = lzma.open(path, binary, preset=level if write else None)
+    else:
+        zstandard = _zstandard()
+        cctx = zstandard.ZstdCompressor(level=level, threads=options['threads']) if write else None
+        raw = zstandard.open(path, binary, cctx=cctx)
+        if not write:
+            # The bare reader cannot iterate lines
+            raw = io.BufferedReader(raw)
+    return io.TextIOWrapper(raw, encoding=encoding or 'utf-8', newline=newline) if text else raw
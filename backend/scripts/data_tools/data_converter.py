@@ -1,20 +1,513 @@
 from __future__ import annotations
+import contextlib
+import functools
+import hashlib
 import json
 import os
+import re
+import time
+from operator import itemgetter
+import numpy as np
 import pandas as pd
 import xml.etree.ElementTree as ET
-from xml.dom import minidom
-from typing import Any, Dict, List, Optional, Union
+from concurrent.futures import ProcessPoolExecutor
+from xml.sax.saxutils import escape
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Union
+
+try:
+    from .compression import Compression, data_extension, open_file, pandas_compression, resolve, split_compression
+    from .profiling import profiled
+except ImportError:
+    from compression import Compression, data_extension, open_file, pandas_compression, resolve, split_compression
+    from profiling import profiled
+
+try:
+    import orjson  # optional: faster JSON encoding/decoding
+except ImportError:
+    orjson = None
+
+
+def _iter_records(data: Union[pd.DataFrame, Iterable[Any]], batch: int = 10_000) -> Iterator[Dict[str, Any]]:
+    # Row dicts from a DataFrame, a list of dicts, or a stream of DataFrame chunks / dicts;
+    # frames are converted a slice at a time so the full record list never exists
+    frames = [data] if isinstance(data, pd.DataFrame) else data
+    for part in frames:
+        if isinstance(part, pd.DataFrame):
+            for start in range(0, len(part), batch):
+                yield from part.iloc[start:start + batch].to_dict(orient='records')
+        else:
+            yield part
+
+
+def _json_loads(text: Union[str, bytes]) -> Any:
+    if orjson is not None:
+        try:
+            return orjson.loads(text)
+        except orjson.JSONDecodeError:
+            pass  # e.g. NaN/Infinity, which json.dump writes and json.loads accepts
+    return json.loads(text)
+
+
+def _json_dumps(value: Any, indent: Optional[int] = None, fast: bool = True) -> str:
+    # orjson only knows two-space indentation; anything else goes through the json module
+    if fast and orjson is not None and indent in (None, 2):
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(value, default=str, option=option).decode('utf-8')
+    return json.dumps(value, ensure_ascii=False, indent=indent, default=str)
+
+
+def _first_char(f: Any) -> str:
+    # First non-whitespace character of a text stream (consumed: decompressing streams cannot rewind)
+    while True:
+        ch = f.read(1)
+        if not ch or not ch.isspace():
+            return ch
+
+
+def _iter_json_array(f: Any, block_size: int = 1 << 20) -> Iterator[Any]:
+    # Decodes the elements of a top-level JSON array one at a time from a text stream,
+    # holding only the undecoded tail of the current block in memory
+    decoder = json.JSONDecoder()
+    buf, pos, eof, size = '', 0, False, block_size
+    started = False
+    while True:
+        while pos < len(buf) and buf[pos] in ' \t\r\n':
+            pos += 1
+        if pos >= len(buf):
+            if eof:
+                raise ValueError("Unexpected end of JSON array")
+            block = f.read(size)
+            buf, pos, eof = buf[pos:] + block, 0, not block
+            continue
+        ch = buf[pos]
+        if not started:
+            if ch != '[':
+                raise ValueError("Top-level JSON value is not an array")
+            started = True
+            pos += 1
+        elif ch == ']':
+            return
+        elif ch == ',':
+            pos += 1
+        else:
+            try:
+                value, end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                end = None
+            # An element touching the end of the buffer may continue in the next block
+            if end is None or (end >= len(buf) and not eof):
+                if eof:
+                    raise ValueError(f"Malformed JSON array element at offset {pos}")
+                block = f.read(size)
+                buf, pos, eof = buf[pos:] + block, 0, not block
+                size *= 2
+                continue
+            size = block_size
+            pos = end
+            yield value
+
+
+def _batched(records: Iterable[Any], chunk_size: Optional[int]) -> Iterator[Any]:
+    # Records unchanged, or DataFrames of chunk_size records
+    if chunk_size is None:
+        yield from records
+        return
+    batch = []
+    for record in records:
+        batch.append(record)
+        if len(batch) >= chunk_size:
+            yield pd.DataFrame(batch)
+            batch = []
+    if batch:
+        yield pd.DataFrame(batch)
+
+
+# json.dumps(v, ensure_ascii=False) with the encoder built once instead of on every call
+_encode_list = json.JSONEncoder(ensure_ascii=False).encode
+
+# Padding for keys a record does not have, as opposed to an explicit null
+_MISSING = object()
+
+
+def _split_dicts(values: List[Any]) -> tuple:
+    # Splits a column holding dicts into one column per key, plus the column's non-dict
+    # values (or None if there are none). Columns whose dicts all share one key set are
+    # split with one itemgetter map per key, without a Python loop per value.
+    if values and set(map(type, values)) == {dict} and len(set(map(len, values))) == 1:
+        # Equal sizes and every key of the first dict present means identical key sets
+        try:
+            return [(key, list(map(itemgetter(key), values))) for key in values[0]], None
+        except KeyError:
+            pass
+    n = len(values)
+    columns: Dict[Any, List[Any]] = {}
+    rest = None
+    for i, value in enumerate(values):
+        if isinstance(value, dict):
+            for key, item in value.items():
+                column = columns.get(key)
+                if column is None:
+                    columns[key] = column = [_MISSING] * n
+                column[i] = item
+        elif value is not _MISSING:
+            if rest is None:
+                rest = [_MISSING] * n
+            rest[i] = value
+    return list(columns.items()), rest
+
+
+def _flatten_columns(records: List[Any], separator: str, lists: str) -> Dict[Any, List[Any]]:
+    # Flattens a list of records one column at a time with an explicit stack, so nesting
+    # depth is not limited by recursion; columns come out in depth-first key order.
+    out: Dict[Any, List[Any]] = {}
+    exploded: List[tuple] = []
+    stack: List[tuple] = [(None, records)]
+    while True:
+        while stack:
+            prefix, values = stack.pop()
+            kinds = set(map(type, values))
+            if any(issubclass(t, dict) for t in kinds):
+                children, rest = _split_dicts(values)
+                if rest is not None:
+                    stack.append((prefix, rest))
+                for key, column in reversed(children):
+                    stack.append((key if prefix is None else f"{prefix}{separator}{key}", column))
+            elif any(issubclass(t, list) for t in kinds):
+                if lists == 'json':
+                    out[prefix] = list(map(_encode_list, values)) if kinds == {list} else \
+                        [_encode_list(v) if isinstance(v, list) else v for v in values]
+                elif lists == 'index':
+                    stack.append((prefix, [dict(zip(map(str, range(len(v))), v)) if isinstance(v, list) else v
+                                           for v in values]))
+                else:
+                    exploded.append((prefix, values))
+            else:
+                out[prefix] = values
+        if not exploded:
+            return out
+        # explode: one row per list element (an empty list keeps one row); every other
+        # column is repeated to match and the elements are flattened like any column
+        prefix, values = exploded.pop(0)
+        counts = [len(v) or 1 if isinstance(v, list) else 1 for v in values]
+        index = np.repeat(np.arange(len(values)), counts)
+
+        def take(column: List[Any]) -> List[Any]:
+            return np.asarray(column + [None], dtype=object)[:-1][index].tolist()
+
+        out = {key: take(column) for key, column in out.items()}
+        exploded = [(key, take(column)) for key, column in exploded]
+        stack.append((prefix, [x for v in values for x in ((v or [None]) if isinstance(v, list) else [v])]))
+
+
+# Attribute values are always double-quoted, as minidom wrote them
+_ATTR_ENTITIES = {'"': '&quot;'}
+# Element and attribute names minidom would accept (no namespace prefixes, as ElementTree
+# left them unbound)
+_XML_NAME = re.compile(r'[^\W\d][\w.\-]*\Z')
+
+
+@functools.lru_cache(maxsize=4096)
+def _xml_name(name: str) -> str:
+    if not _XML_NAME.match(name):
+        raise ValueError(f"Invalid XML name: {name!r}")
+    return name
+
+
+def _xml_item(row: Dict[str, Any], item_element: str, pretty: bool, indent: str) -> str:
+    attrs = "".join(f' {_xml_name(k[1:])}="{escape(str(v), _ATTR_ENTITIES)}"'
+                    for k, v in row.items() if str(k).startswith('@'))
+    nl, pad, child_pad = ("\n", indent, indent * 2) if pretty else ("", "", "")
+    parts = [f"{pad}<{item_element}{attrs}>"]
+    for k, v in row.items():
+        k = str(k)
+        if k.startswith('@'):
+            continue
+        _xml_name(k)
+        text = '' if v is None else str(v)
+        parts.append(f"{child_pad}<{k}>{escape(text)}</{k}>" if text else f"{child_pad}<{k}/>")
+    parts.append(f"{pad}</{item_element}>")
+    return nl.join(parts) + nl
+
+
+def _file_digest(path: str) -> str:
+    digest = hashlib.blake2b(digest_size=20)
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _convert_tree_job(job: tuple) -> Dict[str, Any]:
+    # Runs in a pool worker: skip when the output is up to date, otherwise convert into a
+    # temporary file next to the output and rename it, so a crash never leaves a fresh-looking
+    # partial output behind
+    src, dst, check, known, compression = job
+    start = time.perf_counter()
+    result = {"source": src, "output": dst, "bytes": os.path.getsize(src), "digest": None}
+    if check == 'hash':
+        result["digest"] = _file_digest(src)
+        fresh = result["digest"] == known and os.path.exists(dst)
+    else:
+        fresh = os.path.exists(dst) and os.path.getmtime(dst) >= os.path.getmtime(src)
+    if fresh:
+        return dict(result, status="skipped", seconds=time.perf_counter() - start)
+    folder, name = os.path.split(dst)
+    tmp = os.path.join(folder, f".{os.getpid()}.{name}")
+    try:
+        ok = DataConverter(compression).convert_file(src, tmp)
+        if ok:
+            os.replace(tmp, dst)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+    return dict(result, status="converted" if ok else "failed", seconds=time.perf_counter() - start)
+
+
+def _key_before(df: pd.DataFrame, keys: List[str], bound: tuple) -> np.ndarray:
+    # Rows whose key tuple sorts strictly before bound (lexicographic over keys)
+    mask = np.zeros(len(df), dtype=bool)
+    for col, value in zip(reversed(keys), reversed(bound)):
+        column = df[col].to_numpy()
+        mask = (column < value) | ((column == value) & mask)
+    return mask
+
+
+def _last_key(df: pd.DataFrame, keys: List[str]) -> tuple:
+    return tuple(df[keys].iloc[-1].tolist())
+
+
+def _diff_block(left: pd.DataFrame, right: pd.DataFrame, keys: List[str], value_cols: List[str]) -> tuple:
+    # Aligns one key range of both sides (every row of a key is in the same range) and returns
+    # (removed, added, changed cells, changed row count).
+    # Per-row hashes of the value columns weed out identical rows before any cell is compared.
+    left = left.reset_index(drop=True)
+    right = right.reset_index(drop=True)
+    sides = []
+    for df in (left, right):
+        side = df[keys].assign(_h=pd.util.hash_pandas_object(df[value_cols], index=False).to_numpy(), _pos=np.arange(len(df)))
+        # Repeated keys pair up by occurrence order instead of as a cross product
+        side['_n'] = side.groupby(keys, sort=False, dropna=False).cumcount()
+        sides.append(side)
+    merged = sides[0].merge(sides[1], on=keys + ['_n'], how='outer', suffixes=('_l', '_r'), indicator=True)
+    removed = left.iloc[merged.loc[merged['_merge'] == 'left_only', '_pos_l'].astype(int)]
+    added = right.iloc[merged.loc[merged['_merge'] == 'right_only', '_pos_r'].astype(int)]
+    both = merged[(merged['_merge'] == 'both') & (merged['_h_l'] != merged['_h_r'])]
+    lpos, rpos = both['_pos_l'].astype(int).to_numpy(), both['_pos_r'].astype(int).to_numpy()
+    cells = []
+    changed_rows = np.zeros(len(both), dtype=bool)
+    for col in value_cols:
+        old, new = left[col].to_numpy()[lpos], right[col].to_numpy()[rpos]
+        # Equal values, or nulls on both sides, are not changes (hash differences can come from dtypes alone)
+        differs = ~((old == new) | (pd.isna(old) & pd.isna(new)))
+        if differs.any():
+            changed_rows |= differs
+            cell = both.loc[differs, keys].reset_index(drop=True)
+            cell['column'] = col
+            cell['old'] = old[differs]
+            cell['new'] = new[differs]
+            cells.append(cell)
+    return removed, added, cells, int(changed_rows.sum())
+
+
+# ---------- Codecs ----------
+# A file format: the extensions it owns, a content sniffer (first bytes -> bool) and the
+# operations it supports. Operations are DataConverter method names, or functions that take
+# the converter first:
+#   read(path) -> data                      whole-file read
+#   write(data, path) -> bool               whole-object write (tabular: needs rows)
+#   records(path, chunk_size) -> iterator   record dicts, or DataFrames of chunk_size rows;
+#                                           None when this particular file cannot stream
+#   write_stream(records, path) -> bool     writes from records(chunk_size=None), a re-callable
+#                                           stream, without collecting it
+# compressible formats also work behind a .gz/.bz2/.xz/.zst suffix. magic marks a sniffer
+# that matches a binary magic number, which is trusted over the file's extension; other
+# sniffers are heuristics used only for files without a known extension.
+class Codec:
+    def __init__(self, name: str, extensions: Iterable[str], read: Any = None, write: Any = None,
+                 records: Any = None, write_stream: Any = None, sniff: Optional[Callable[[bytes], bool]] = None,
+                 tabular: bool = False, compressible: bool = True, magic: bool = False):
+        self.name = name
+        self.extensions = tuple(extensions)
+        self.read = read
+        self.write = write
+        self.records = records
+        self.write_stream = write_stream
+        self.sniff = sniff
+        self.tabular = tabular
+        self.compressible = compressible
+        self.magic = magic
+
+
+_CODECS: Dict[str, Codec] = {}
+_EXTENSIONS: Dict[str, str] = {}
+# (source codec, target codec) -> fn(source, target) converting without Python rows; source and
+# target are paths, or binary file objects when the file is compressed
+_DIRECT: Dict[tuple, Callable[[str, str], None]] = {}
+
+
+def register_codec(codec: Codec) -> Codec:
+    # Later registrations win, both for the name and for each extension
+    _CODECS[codec.name] = codec
+    for ext in codec.extensions:
+        _EXTENSIONS[ext.lower().lstrip('.')] = codec.name
+    return codec
+
+
+def register_direct(source: str, target: str, fn: Callable[[str, str], None]) -> None:
+    # fn may raise to hand the file back to the general read/write path
+    _DIRECT[(source, target)] = fn
+
+
+_SNIFF_BYTES = 64 * 1024
+
+
+def _text_start(head: bytes) -> bytes:
+    return head[3:].lstrip() if head.startswith(b'\xef\xbb\xbf') else head.lstrip()
+
+
+def _one_value_per_line(head: bytes) -> Optional[bool]:
+    # True when the head reads as NDJSON, False when it reads as one multi-line document,
+    # None when a single (or truncated) first line leaves it open
+    first, newline, rest = _text_start(head).partition(b'\n')
+    if not newline:
+        return None
+    try:
+        json.loads(first)
+    except ValueError:
+        return False
+    return True if rest.strip() else None
+
+
+def _sniff_json(head: bytes) -> bool:
+    return _text_start(head)[:1] in (b'[', b'{') and _one_value_per_line(head) is not True
+
+
+def _sniff_ndjson(head: bytes) -> bool:
+    return _text_start(head)[:1] == b'{' and _one_value_per_line(head) is not False
+
+
+def _sniff_csv(head: bytes) -> bool:
+    text = _text_start(head)
+    return bool(text) and b'\x00' not in text and text[:1] not in (b'[', b'{', b'<')
+
+
+def _arrow_batches(path: Any, fmt: str) -> tuple:
+    # (schema, record batch iterator) read straight into Arrow memory
+    import pyarrow as pa
+    import pyarrow.csv as pv
+    import pyarrow.json as pj
+    import pyarrow.parquet as pq
+    if fmt in ('csv', 'ndjson'):
+        # Empty CSV cells are nulls in every column, as with pandas
+        options = pv.ConvertOptions(strings_can_be_null=True)
+        reader = pv.open_csv(path, convert_options=options) if fmt == 'csv' else pj.open_json(path)
+        temporal = {field.name for field in reader.schema if pa.types.is_temporal(field.type)}
+        if temporal:
+            # pandas keeps dates in text as strings, so Arrow is asked for strings too
+            if not isinstance(path, str):
+                path.seek(0)
+            if fmt == 'csv':
+                options.column_types = {name: pa.string() for name in temporal}
+                reader = pv.open_csv(path, convert_options=options)
+            else:
+                schema = pa.schema([field.with_type(pa.string()) if field.name in temporal else field
+                                    for field in reader.schema])
+                reader = pj.open_json(path, parse_options=pj.ParseOptions(explicit_schema=schema))
+        return reader.schema, iter(reader)
+    if fmt == 'parquet':
+        parquet = pq.ParquetFile(path)
+        return parquet.schema_arrow, parquet.iter_batches()
+    reader = pa.ipc.open_file(path)
+    return reader.schema, (reader.get_batch(i) for i in range(reader.num_record_batches))
+
+
+def _arrow_copy(source: str, target: str) -> Callable[[str, str], None]:
+    def convert(input_path: Any, output_path: Any) -> None:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        schema, batches = _arrow_batches(input_path, source)
+        if target == 'parquet':
+            writer = pq.ParquetWriter(output_path, schema)
+        else:
+            writer = pa.ipc.new_file(output_path, schema)
+        with writer:
+            for batch in batches:
+                writer.write_batch(batch)
+    return convert
+
+
+def _tabular(data: Any) -> pd.DataFrame:
+    if isinstance(data, pd.DataFrame):
+        return data
+    if isinstance(data, list) and (len(data) == 0 or isinstance(data[0], dict)):
+        return pd.DataFrame(data)
+    raise ValueError("Input is not tabular; cannot convert to CSV/Excel safely.")
+
+
+
+# Built-in formats. Content sniffing tries them in this order, so binary magic numbers go first.
+register_codec(Codec('parquet', ['parquet', 'pq'], read='read_parquet', write='write_parquet',
+                     records=lambda c, path, chunk_size: c.iter_arrow(path, 'parquet', chunk_size),
+                     sniff=lambda head: head[:4] == b'PAR1', tabular=True, compressible=False, magic=True))
+register_codec(Codec('ipc', ['feather', 'arrow', 'ipc'], read='read_feather', write='write_feather',
+                     records=lambda c, path, chunk_size: c.iter_arrow(path, 'ipc', chunk_size),
+                     sniff=lambda head: head[:6] == b'ARROW1' or head[:4] == b'FEA1', tabular=True,
+                     compressible=False, magic=True))
+register_codec(Codec('excel', ['xlsx', 'xls'], read='read_excel', write='write_excel',
+                     sniff=lambda head: head[:4] in (b'PK\x03\x04', b'\xd0\xcf\x11\xe0'), tabular=True,
+                     compressible=False, magic=True))
+register_codec(Codec('xml', ['xml'], read='read_xml', write='write_xml',
+                     records=lambda c, path, chunk_size: c.iter_xml(path, chunk_size=chunk_size),
+                     write_stream=lambda c, records, path: c.write_xml(records(), path),
+                     sniff=lambda head: _text_start(head)[:1] == b'<'))
+register_codec(Codec('json', ['json'], read='read_json', write='write_json', records='_json_records',
+                     write_stream=lambda c, records, path: c.write_json(records(), path), sniff=_sniff_json))
+register_codec(Codec('ndjson', ['ndjson', 'jsonl'], read='read_ndjson', write='write_ndjson', records='iter_ndjson',
+                     write_stream=lambda c, records, path: c.write_ndjson(records(), path), sniff=_sniff_ndjson))
+register_codec(Codec('csv', ['csv'], read='read_csv', write='write_csv', write_stream='_write_csv_stream',
+                     sniff=_sniff_csv, tabular=True))
+register_codec(Codec('txt', ['txt'], read='read_text', write='write_text'))
+
+# Only typed targets: Arrow's CSV writer quotes every string, prints 0.0 as 0 and lowercases
+# booleans, so CSV output goes through pandas like every other conversion
+for _source in ('csv', 'ndjson', 'parquet', 'ipc'):
+    for _target in ('parquet', 'ipc'):
+        if _source != _target:
+            register_direct(_source, _target, _arrow_copy(_source, _target))
 
 class DataConverter:
-    def __init__(self):
-        self.supported_formats = ['json', 'csv', 'xml', 'txt', 'xlsx']
+    def __init__(self, compression: Compression = 'infer'):
+        # How outputs are compressed: 'infer' from a .gz/.bz2/.xz/.zst suffix, None, a method,
+        # or a dict such as {'method': 'zstd', 'level': 19, 'threads': 8}. Inputs are always
+        # decompressed by suffix or magic bytes.
+        self.compression = compression
+
+    def _open(self, file_path: str, mode: str = 'rb', newline: Optional[str] = None) -> Any:
+        write = any(m in mode for m in 'wa')
+        return open_file(file_path, mode, self.compression if write else 'infer', newline=newline)
+
+    def _pandas_compression(self, file_path: str, write: bool = False) -> Any:
+        return pandas_compression(file_path, self.compression if write else 'infer', write)
+
+    def _compressed(self, file_path: str, write: bool = False) -> bool:
+        return resolve(file_path, self.compression if write else 'infer', write) is not None
+
+    def _native(self, file_path: str, mode: str) -> Any:
+        # The path itself for uncompressed files (native readers are faster), else a codec stream
+        if self._compressed(file_path, 'w' in mode):
+            return self._open(file_path, mode)
+        return contextlib.nullcontext(file_path)
+
+    @property
+    def supported_formats(self) -> List[str]:
+        return list(_EXTENSIONS)
 
     # ---------- JSON ----------
+    @profiled(reads='file_path')
     def read_json(self, file_path: str) -> Union[pd.DataFrame, dict, list]:
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            with self._open(file_path, 'rb') as f:
+                data = _json_loads(f.read())
             if isinstance(data, list) and (len(data) == 0 or isinstance(data[0], dict)):
                 return pd.DataFrame(data)
             return data
@@ -22,36 +515,112 @@ class DataConverter:
             print(f"Error reading JSON: {e}")
             return None
 
-    def write_json(self, data: Union[pd.DataFrame, dict, list], file_path: str, indent: int = 2) -> bool:
+    def iter_json(self, file_path: str, chunk_size: Optional[int] = None) -> Iterator[Any]:
+        # Incremental reader: the elements of a top-level array are decoded one at a time
+        # and yielded as records, or DataFrames of chunk_size records. Any other top-level
+        # value is loaded whole and yielded once.
+        with self._open(file_path, 'r') as f:
+            first = _first_char(f)
+        with self._open(file_path, 'r') as f:
+            if first != '[':
+                yield _json_loads(f.read())
+                return
+            yield from _batched(_iter_json_array(f), chunk_size)
+
+    def _json_records(self, file_path: str, chunk_size: Optional[int] = None) -> Optional[Iterator[Any]]:
+        # Only a top-level array of objects streams as records; anything else is read whole
+        with self._open(file_path, 'r') as f:
+            if _first_char(f) != '[':
+                return None
+        first = next(iter(self.iter_json(file_path)), None)
+        if first is not None and not isinstance(first, dict):
+            return None
+        return self.iter_json(file_path, chunk_size)
+
+    @profiled(writes='file_path')
+    def write_json(self, data: Union[pd.DataFrame, dict, Iterable[Any]], file_path: str, indent: Optional[int] = 2,
+                   fast: bool = True) -> bool:
+        # Records are encoded and written one at a time (orjson when installed and fast=True),
+        # so DataFrames, lists and streams of records or DataFrame chunks never become one big
+        # list. Anything else (a dict, string or scalar) is one JSON value. The layout matches
+        # json.dump; orjson writes NaN/Infinity as null and may spell floats differently
+        # (1e16 for 1e+16), so fast=False reproduces json.dump exactly.
         try:
-            if isinstance(data, pd.DataFrame):
-                data = data.to_dict(orient='records')
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=indent)
+            with self._open(file_path, 'w') as f:
+                if not isinstance(data, (pd.DataFrame, list, tuple, Iterator)):
+                    f.write(_json_dumps(data, indent, fast))
+                    return True
+                pad = " " * indent if indent else ""
+                sep, nl = (",\n", "\n") if indent is not None else (", ", "")
+                first = True
+                for record in _iter_records(data):
+                    text = _json_dumps(record, indent, fast)
+                    if pad:
+                        text = pad + text.replace("\n", "\n" + pad)
+                    f.write(("[" + nl if first else sep) + text)
+                    first = False
+                f.write("[]" if first else nl + "]")
             return True
         except Exception as e:
             print(f"Error writing JSON: {e}")
             return False
 
+    # ---------- NDJSON ----------
+    @profiled(reads='file_path')
+    def read_ndjson(self, file_path: str) -> Optional[pd.DataFrame]:
+        try:
+            return pd.DataFrame(list(self.iter_ndjson(file_path)))
+        except Exception as e:
+            print(f"Error reading NDJSON: {e}")
+            return None
+
+    def iter_ndjson(self, file_path: str, chunk_size: Optional[int] = None) -> Iterator[Any]:
+        def records() -> Iterator[Any]:
+            with self._open(file_path, 'rb') as f:
+                for line in f:
+                    if line.strip():
+                        yield _json_loads(line)
+        return _batched(records(), chunk_size)
+
+    @profiled(writes='file_path')
+    def write_ndjson(self, data: Union[pd.DataFrame, Iterable[Any]], file_path: str, fast: bool = True) -> bool:
+        try:
+            with self._open(file_path, 'w') as f:
+                batch = []
+                for record in _iter_records(data):
+                    batch.append(_json_dumps(record, None, fast))
+                    if len(batch) >= 1000:
+                        f.write("\n".join(batch) + "\n")
+                        batch = []
+                if batch:
+                    f.write("\n".join(batch) + "\n")
+            return True
+        except Exception as e:
+            print(f"Error writing NDJSON: {e}")
+            return False
+
     # ---------- CSV ----------
+    @profiled(reads='file_path')
     def read_csv(self, file_path: str, delimiter: str = ',') -> Optional[pd.DataFrame]:
         try:
-            return pd.read_csv(file_path, sep=delimiter)
+            return pd.read_csv(file_path, sep=delimiter, compression=self._pandas_compression(file_path))
         except Exception as e:
             print(f"Error reading CSV: {e}")
             return None
 
+    @profiled(writes='file_path')
     def write_csv(self, data: Union[pd.DataFrame, List[dict]], file_path: str, delimiter: str = ',') -> bool:
         try:
             if not isinstance(data, pd.DataFrame):
                 data = pd.DataFrame(data)
-            data.to_csv(file_path, index=False, sep=delimiter)
+            data.to_csv(file_path, index=False, sep=delimiter, compression=self._pandas_compression(file_path, True))
             return True
         except Exception as e:
             print(f"Error writing CSV: {e}")
             return False
 
     # ---------- Excel ----------
+    @profiled(reads='file_path')
     def read_excel(self, file_path: str, sheet_name: Union[str, int] = 0) -> Optional[pd.DataFrame]:
         try:
             return pd.read_excel(file_path, sheet_name=sheet_name)
@@ -59,6 +628,7 @@ class DataConverter:
             print(f"Error reading Excel: {e}")
             return None
 
+    @profiled(writes='file_path')
     def write_excel(self, data: Union[pd.DataFrame, List[dict]], file_path: str, sheet_name: str = 'Sheet1') -> bool:
         try:
             if not isinstance(data, pd.DataFrame):
@@ -70,62 +640,187 @@ class DataConverter:
             print(f"Error writing Excel: {e}")
             return False
 
+    # ---------- Parquet / Arrow IPC ----------
+    @profiled(reads='file_path')
+    def read_parquet(self, file_path: str) -> Optional[pd.DataFrame]:
+        try:
+            return pd.read_parquet(file_path)
+        except Exception as e:
+            print(f"Error reading Parquet: {e}")
+            return None
+
+    @profiled(writes='file_path')
+    def write_parquet(self, data: Union[pd.DataFrame, List[dict]], file_path: str) -> bool:
+        try:
+            _tabular(data).to_parquet(file_path, index=False)
+            return True
+        except Exception as e:
+            print(f"Error writing Parquet: {e}")
+            return False
+
+    @profiled(reads='file_path')
+    def read_feather(self, file_path: str) -> Optional[pd.DataFrame]:
+        try:
+            return pd.read_feather(file_path)
+        except Exception as e:
+            print(f"Error reading Feather: {e}")
+            return None
+
+    @profiled(writes='file_path')
+    def write_feather(self, data: Union[pd.DataFrame, List[dict]], file_path: str) -> bool:
+        try:
+            _tabular(data).reset_index(drop=True).to_feather(file_path)
+            return True
+        except Exception as e:
+            print(f"Error writing Feather: {e}")
+            return False
+
+    def iter_arrow(self, file_path: str, fmt: str, chunk_size: Optional[int] = None) -> Iterator[Any]:
+        # Record batches converted to DataFrames one at a time, or to record dicts without chunk_size
+        _, batches = _arrow_batches(file_path, fmt)
+        for batch in batches:
+            if chunk_size:
+                yield from (batch.slice(start, chunk_size).to_pandas() for start in range(0, batch.num_rows, chunk_size))
+            else:
+                yield from batch.to_pylist()
+
+    # ---------- Text ----------
+    @profiled(reads='file_path')
+    def read_text(self, file_path: str) -> Optional[str]:
+        try:
+            with self._open(file_path, 'r') as f:
+                return f.read()
+        except Exception as e:
+            print(f"Error reading text: {e}")
+            return None
+
+    @profiled(writes='file_path')
+    def write_text(self, data: Any, file_path: str) -> bool:
+        try:
+            if isinstance(data, pd.DataFrame):
+                payload = data.to_csv(index=False)
+            elif isinstance(data, (dict, list)):
+                payload = json.dumps(data, ensure_ascii=False, indent=2)
+            else:
+                payload = str(data)
+            with self._open(file_path, 'w') as f:
+                f.write(payload)
+            return True
+        except Exception as e:
+            print(f"Error writing text: {e}")
+            return False
+
     # ---------- XML ----------
+    @profiled(reads='file_path')
     def read_xml(self, file_path: str, root_element='root', item_element='item') -> Optional[List[Dict[str, Any]]]:
         try:
-            tree = ET.parse(file_path)
-            root = tree.getroot()
-            rows = []
-            for item in root.findall(f'.//{item_element}'):
-                row = {child.tag: child.text for child in item}
-                for attr_name, attr_value in item.attrib.items():
-                    row[f'@{attr_name}'] = attr_value
-                rows.append(row)
-            return rows
+            return list(self.iter_xml(file_path, item_element))
         except Exception as e:
             print(f"Error reading XML: {e}")
             return None
 
-    def write_xml(self, data: Union[pd.DataFrame, List[Dict[str, Any]]], file_path: str, root_element='root', item_element='item') -> bool:
+    def iter_xml(self, file_path: str, item_element: str = 'item',
+                 chunk_size: Optional[int] = None) -> Iterator[Union[Dict[str, Any], pd.DataFrame]]:
+        # Streams <item> rows with iterparse, clearing each finished item (and detaching it
+        # from the root) so memory stays flat; yields dicts, or DataFrames of chunk_size rows
+        rows: List[Dict[str, Any]] = []
+        root = None
+        with self._open(file_path, 'rb') as f:
+            for event, elem in ET.iterparse(f, events=('start', 'end')):
+                if root is None:
+                    root = elem
+                if event != 'end' or elem.tag != item_element:
+                    continue
+                row = {child.tag: child.text for child in elem}
+                for attr_name, attr_value in elem.attrib.items():
+                    row[f'@{attr_name}'] = attr_value
+                elem.clear()
+                root.clear()
+                if chunk_size is None:
+                    yield row
+                    continue
+                rows.append(row)
+                if len(rows) >= chunk_size:
+                    yield pd.DataFrame(rows)
+                    rows = []
+        if chunk_size is not None and rows:
+            yield pd.DataFrame(rows)
+
+    @profiled(writes='file_path')
+    def write_xml(self, data: Union[pd.DataFrame, Iterable[Any]], file_path: str, root_element='root',
+                  item_element='item', pretty: bool = True, indent: str = " ") -> bool:
+        # One <item> is serialized and written at a time; data may also be a stream of
+        # row dicts or DataFrame chunks (e.g. from iter_xml)
+        opened = False
         try:
-            if isinstance(data, pd.DataFrame):
-                data = data.to_dict(orient='records')
-            root = ET.Element(root_element)
-            for row in data:
-                item = ET.SubElement(root, item_element)
-                for k, v in row.items():
-                    if k.startswith('@'):
-                        item.set(k[1:], str(v))
-                    else:
-                        child = ET.SubElement(item, str(k))
-                        child.text = '' if v is None else str(v)
-            xml_str = ET.tostring(root, encoding='utf-8')
-            reparsed = minidom.parseString(xml_str)
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(reparsed.toprettyxml(indent=" "))
+            _xml_name(root_element)
+            _xml_name(item_element)
+            nl = "\n" if pretty else ""
+            with self._open(file_path, 'w') as f:
+                opened = True
+                f.write(f'<?xml version="1.0" ?>{nl}<{root_element}>{nl}')
+                batch = []
+                for row in _iter_records(data):
+                    batch.append(_xml_item(row, item_element, pretty, indent))
+                    if len(batch) >= 1000:
+                        f.write("".join(batch))
+                        batch = []
+                f.write("".join(batch))
+                f.write(f"</{root_element}>{nl}")
             return True
         except Exception as e:
             print(f"Error writing XML: {e}")
+            # Don't leave a truncated document behind
+            if opened and os.path.exists(file_path):
+                os.remove(file_path)
             return False
 
     # ---------- Flatten / Unflatten ----------
-    def flatten_json(self, data: Union[dict, list], separator='.') -> Union[dict, List[dict]]:
-        def _flatten(obj, parent_key=''):
-            items = []
-            if isinstance(obj, dict):
-                for k, v in obj.items():
-                    new_key = f"{parent_key}{separator}{k}" if parent_key else k
-                    items.extend(_flatten(v, new_key).items())
-                return dict(items)
-            elif isinstance(obj, list):
-                return {parent_key: json.dumps(obj, ensure_ascii=False)}
-            else:
-                return {parent_key: obj}
-        if isinstance(data, list):
-            return [_flatten(el) if isinstance(el, (dict, list)) else el for el in data]
-        return _flatten(data)
+    @profiled()
+    def flatten_json(self, data: Union[dict, list], separator='.', lists: str = 'json',
+                     as_frame: bool = False) -> Union[dict, List[dict], pd.DataFrame]:
+        # Lists are JSON-encoded ('json'), spread into key.0, key.1, ... ('index') or turned
+        # into one row per element ('explode'). Records are flattened column-wise over a
+        # schema unified across all of them; as_frame returns those columns as a DataFrame.
+        if lists not in ('json', 'index', 'explode'):
+            raise ValueError(f"Unknown list handling: {lists}")
+        single = isinstance(data, dict)
+        records = [data] if single else data
+        if not all(isinstance(el, dict) for el in records):
+            # Mixed lists: scalars pass through, nested lists flatten on their own
+            if as_frame:
+                raise ValueError("as_frame needs every element to be an object")
+            return [self.flatten_json(el, separator, lists) if isinstance(el, dict) else
+                    {'': json.dumps(el, ensure_ascii=False)} if isinstance(el, list) else el for el in records]
+        columns = _flatten_columns(records, separator, lists)
+        padded = {key for key, column in columns.items() if object in set(map(type, column))}
+        if as_frame:
+            return pd.DataFrame({key: [None if v is _MISSING else v for v in column] if key in padded else column
+                                 for key, column in columns.items()})
+        keys = list(columns)
+        if padded:
+            rows = [{k: v for k, v in zip(keys, row) if v is not _MISSING} for row in zip(*columns.values())]
+        else:
+            rows = [dict(zip(keys, row)) for row in zip(*columns.values())]
+        if not columns:
+            rows = [{} for _ in records]
+        if single and len(rows) == 1:
+            return rows[0]
+        return rows
+
+    @profiled()
+    def unflatten_json(self, data: Union[dict, List[dict], pd.DataFrame], separator='.',
+                       lists: Optional[str] = None) -> Union[dict, List[dict]]:
+        # Inverse of flatten_json: lists='index' turns objects keyed 0..n-1 back into lists,
+        # lists='json' decodes JSON-encoded arrays. Null cells of a DataFrame are the padding
+        # of the unified schema and are dropped.
+        if lists == 'explode':
+            raise ValueError("Exploded rows cannot be regrouped; flatten with lists='index' or 'json' to round-trip")
+        if isinstance(data, pd.DataFrame):
+            keys = list(data.columns)
+            data = [{k: v for k, v in zip(keys, row) if not (v is None or (isinstance(v, float) and v != v))}
+                    for row in data.itertuples(index=False, name=None)]
 
-    def unflatten_json(self, data: Union[dict, List[dict]], separator='.') -> Union[dict, List[dict]]:
         def _unflatten(flat_dict):
             result = {}
             for k, v in flat_dict.items():
@@ -135,8 +830,32 @@ class DataConverter:
                     if part not in d:
                         d[part] = {}
                     d = d[part]
+                if lists == 'json' and isinstance(v, str) and v.startswith('[') and v.endswith(']'):
+                    try:
+                        v = json.loads(v)
+                    except ValueError:
+                        pass
                 d[parts[-1]] = v
+            if lists == 'index':
+                result = _relist(result)
             return result
+
+        def _relist(obj):
+            # Bottom-up without recursion: containers are rebuilt children first
+            order, stack = [], [(None, None, obj)]
+            while stack:
+                parent, key, node = stack.pop()
+                order.append((parent, key, node))
+                if isinstance(node, dict):
+                    stack.extend((node, k, v) for k, v in node.items())
+            for parent, key, node in reversed(order):
+                if isinstance(node, dict) and node and all(k == str(i) for i, k in enumerate(node)):
+                    node = list(node.values())
+                    if parent is None:
+                        return node
+                    parent[key] = node
+            return obj
+
         if isinstance(data, list):
             return [_unflatten(item) if isinstance(item, dict) else item for item in data]
         return _unflatten(data)
@@ -144,7 +863,7 @@ class DataConverter:
     # ---------- Validation ----------
     def validate_json(self, file_path: str) -> tuple[bool, str]:
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
+            with self._open(file_path, 'r') as f:
                 json.load(f)
             return True, "Valid JSON"
         except json.JSONDecodeError as e:
@@ -174,7 +893,11 @@ class DataConverter:
             return False, f"Error validating CSV: {e}"
 
     # ---------- Compare ----------
-    def compare_data(self, file1: str, file2: str) -> Optional[Dict[str, Any]]:
+    @profiled(reads='file1')
+    def compare_data(self, file1: str, file2: str, keys: Optional[Union[str, List[str]]] = None,
+                     chunk_size: int = 100_000, presorted: bool = False) -> Optional[Dict[str, Any]]:
+        if keys is not None:
+            return self._diff_by_keys(file1, file2, [keys] if isinstance(keys, str) else list(keys), chunk_size, presorted)
         data1 = self.auto_read(file1)
         data2 = self.auto_read(file2)
         if data1 is None or data2 is None:
@@ -190,62 +913,289 @@ class DataConverter:
                 return {'equal': False, 'reason': f"Records differ at index {i}", 'record1': item1, 'record2': item2}
         return {'equal': True, 'reason': "Files contain identical data"}
 
+    def _iter_frames(self, file_path: str, chunk_size: int) -> Iterator[pd.DataFrame]:
+        codec = self._detect(file_path)
+        if codec is not None and codec.name in ('csv', 'txt'):
+            yield from pd.read_csv(file_path, sep='\t' if codec.name == 'txt' else ',', chunksize=chunk_size,
+                                   compression=self._pandas_compression(file_path))
+            return
+        records = self._record_stream(file_path, codec)
+        if records is not None:
+            yield from records(chunk_size)
+            return
+        data = self.auto_read(file_path)
+        if not isinstance(data, pd.DataFrame):
+            raise ValueError(f"{file_path} is not tabular; cannot diff by key")
+        yield data
+
+    def _diff_by_keys(self, file1: str, file2: str, keys: List[str], chunk_size: int,
+                      presorted: bool) -> Dict[str, Any]:
+        # Both inputs stream in key order (external sort unless presorted) and are merged
+        # block by block: each round handles every key below the smaller of the two buffers'
+        # last keys, so memory stays around two chunks whatever the file sizes. Rows with a null
+        # key have no place in that order; they are set aside and compared as a last block.
+        def ordered(path: str, nulls: List[pd.DataFrame]) -> Iterator[pd.DataFrame]:
+            def keyed() -> Iterator[pd.DataFrame]:
+                for frame in self._iter_frames(path, chunk_size):
+                    missing = [k for k in keys if k not in frame.columns]
+                    if missing:
+                        raise ValueError(f"Key columns missing from an input: {missing}")
+                    null = frame[keys].isna().any(axis=1).to_numpy()
+                    if null.any():
+                        nulls.append(frame[null])
+                        frame = frame[~null]
+                    yield frame
+
+            frames = keyed()
+            if not presorted:
+                try:
+                    from .data_processor import DataProcessor
+                except ImportError:
+                    from data_processor import DataProcessor
+                frames = DataProcessor(verbose=False).sort_data(frames, keys)
+            for frame in frames:
+                if len(frame):
+                    yield frame
+
+        left_nulls: List[pd.DataFrame] = []
+        right_nulls: List[pd.DataFrame] = []
+        left_chunks, right_chunks = ordered(file1, left_nulls), ordered(file2, right_nulls)
+        left = next(left_chunks, None)
+        right = next(right_chunks, None)
+        if left is None:
+            left = left_nulls[0].iloc[0:0] if left_nulls else pd.DataFrame(columns=keys)
+        if right is None:
+            right = right_nulls[0].iloc[0:0] if right_nulls else pd.DataFrame(columns=keys)
+        missing = [k for k in keys if k not in left.columns or k not in right.columns]
+        if missing:
+            raise ValueError(f"Key columns missing from an input: {missing}")
+        value_cols = [c for c in left.columns if c in right.columns and c not in keys]
+        report = {
+            'keys': keys,
+            'columns_removed': [c for c in left.columns if c not in right.columns],
+            'columns_added': [c for c in right.columns if c not in left.columns],
+        }
+        removed: List[pd.DataFrame] = []
+        added: List[pd.DataFrame] = []
+        cells: List[pd.DataFrame] = []
+        changed = 0
+        left_done, right_done = len(left) == 0, len(right) == 0
+
+        def absorb(a: pd.DataFrame, b: pd.DataFrame) -> None:
+            nonlocal changed
+            r, a_rows, c, n = _diff_block(a, b, keys, value_cols)
+            removed.append(r)
+            added.append(a_rows)
+            cells.extend(c)
+            changed += n
+
+        def pull(buffer: pd.DataFrame, chunks: Iterator[pd.DataFrame]) -> tuple:
+            chunk = next(chunks, None)
+            if chunk is None:
+                return buffer, True
+            if presorted and not pd.MultiIndex.from_frame(chunk[keys]).is_monotonic_increasing:
+                raise ValueError("Input is not sorted by the key columns; use presorted=False")
+            return pd.concat([buffer, chunk], ignore_index=True), False
+
+        while not (left_done and right_done):
+            bounds = [_last_key(df, keys) for df, done in ((left, left_done), (right, right_done)) if not done]
+            bound = min(bounds)
+            lmask, rmask = _key_before(left, keys, bound), _key_before(right, keys, bound)
+            if lmask.any() or rmask.any():
+                absorb(left[lmask], right[rmask])
+                left, right = left[~lmask], right[~rmask]
+            # Sides whose buffered keys end at the bound need more rows before it can move on
+            if not left_done and (not len(left) or _last_key(left, keys) == bound):
+                left, left_done = pull(left, left_chunks)
+            if not right_done and (not len(right) or _last_key(right, keys) == bound):
+                right, right_done = pull(right, right_chunks)
+        absorb(left, right)
+        if left_nulls or right_nulls:
+            absorb(pd.concat(left_nulls or [left.iloc[0:0]], ignore_index=True),
+                   pd.concat(right_nulls or [right.iloc[0:0]], ignore_index=True))
+
+        removed_df = pd.concat(removed, ignore_index=True)
+        added_df = pd.concat(added, ignore_index=True)
+        cells_df = pd.concat(cells, ignore_index=True) if cells else pd.DataFrame(columns=keys + ['column', 'old', 'new'])
+        equal = not (len(removed_df) or len(added_df) or changed or report['columns_removed'] or report['columns_added'])
+        report.update({
+            'equal': equal,
+            'reason': "Files contain identical data" if equal else
+                      f"{len(added_df)} added, {len(removed_df)} removed, {changed} changed rows",
+            'added': added_df,
+            'removed': removed_df,
+            'changed_rows': changed,
+            'changed_cells': cells_df,
+        })
+        return report
+
+    # ---------- Format detection ----------
+    def codec_for(self, file_path: str) -> Optional[Codec]:
+        # The codec registered for the path's extension
+        name = _EXTENSIONS.get(data_extension(file_path))
+        return _CODECS.get(name) if name else None
+
+    def detect_format(self, file_path: str) -> Optional[str]:
+        codec = self._detect(file_path)
+        return codec.name if codec else None
+
+    def _detect(self, file_path: str) -> Optional[Codec]:
+        # The extension's codec unless a binary magic number says otherwise (a .csv that is
+        # really Parquet); without a known extension, the first codec whose sniffer matches
+        by_ext = self.codec_for(file_path)
+        with self._open(file_path, 'rb') as f:
+            head = f.read(_SNIFF_BYTES)
+        if by_ext is not None:
+            codec = by_ext
+            if not (by_ext.magic and by_ext.sniff(head)):
+                codec = next((c for c in _CODECS.values() if c.magic and c.sniff(head)), by_ext)
+        else:
+            codec = next((c for c in _CODECS.values() if c.sniff is not None and c.sniff(head)), None)
+        if codec is not None and not codec.compressible and self._compressed(file_path):
+            raise ValueError(f"Compressed {codec.name} files are not supported")
+        return codec
+
+    def _call(self, op: Any, *args) -> Any:
+        return getattr(self, op)(*args) if isinstance(op, str) else op(self, *args)
+
     # ---------- Auto-read ----------
     def auto_read(self, file_path: str) -> Any:
-        ext = os.path.splitext(file_path)[1].lower().lstrip('.')
         try:
-            if ext == 'csv':
-                return self.read_csv(file_path)
-            if ext in ('json',):
-                return self.read_json(file_path)
-            if ext in ('xls', 'xlsx'):
-                return self.read_excel(file_path)
-            if ext in ('xml',):
-                return self.read_xml(file_path)
-            if ext in ('txt',):
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    return f.read()
-            print(f"Unsupported file extension: {ext}")
-            return None
+            codec = self._detect(file_path)
+            if codec is None or codec.read is None:
+                print(f"Unsupported file format: {file_path}")
+                return None
+            return self._call(codec.read, file_path)
         except Exception as e:
             print(f"Error auto-reading {file_path}: {e}")
             return None
 
     # ---------- Convert ----------
-    def convert_file(self, input_path: str, output_path: str) -> bool:
+    @profiled(reads='input_path', writes='output_path')
+    def convert_file(self, input_path: str, output_path: str, direct: bool = True) -> bool:
+        # Cheapest route first: a registered direct path (Arrow batches, no Python rows), then
+        # record streaming when the source can stream and the target can write a stream, and
+        # finally a whole read followed by a whole write
         try:
-            data = self.auto_read(input_path)
+            source = self._detect(input_path)
+            target = self.codec_for(output_path)
+            if source is None or source.read is None:
+                print(f"Unsupported file format: {input_path}")
+                return False
+            if target is None or target.write is None:
+                print(f"Unsupported output extension: {data_extension(output_path)}")
+                return False
+            if not target.compressible and self._compressed(output_path, write=True):
+                raise ValueError(f"Compressed {target.name} files are not supported")
+            if direct and (source.name, target.name) in _DIRECT:
+                try:
+                    with self._native(input_path, 'rb') as src, self._native(output_path, 'wb') as dst:
+                        _DIRECT[(source.name, target.name)](src, dst)
+                    return True
+                except Exception:
+                    pass  # e.g. pyarrow missing, nested values or a schema change mid-file
+            records = self._record_stream(input_path, source)
+            if records is not None and target.write_stream is not None:
+                return self._call(target.write_stream, records, output_path)
+            data = self._call(source.read, input_path)
             if data is None:
                 return False
-            out_ext = os.path.splitext(output_path)[1].lower().lstrip('.')
-            # Tabular outputs
-            if out_ext in ('csv', 'xlsx'):
-                if isinstance(data, pd.DataFrame):
-                    df = data
-                elif isinstance(data, list) and (len(data) == 0 or isinstance(data[0], dict)):
-                    df = pd.DataFrame(data)
-                else:
-                    raise ValueError("Input is not tabular; cannot convert to CSV/Excel safely.")
-                if out_ext == 'csv':
-                    df.to_csv(output_path, index=False)
-                else:
-                    self.write_excel(df, output_path)
-                return True
-            if out_ext == 'json':
-                return self.write_json(data, output_path)
-            if out_ext == 'xml':
-                return self.write_xml(data, output_path)
-            if out_ext == 'txt':
-                payload = data.to_csv(index=False) if isinstance(data, pd.DataFrame) else json.dumps(data, ensure_ascii=False, indent=2) if isinstance(data, (dict, list)) else str(data)
-                with open(output_path, 'w', encoding='utf-8') as f:
-                    f.write(payload)
-                return True
-            print(f"Unsupported output extension: {out_ext}")
-            return False
+            return self._call(target.write, _tabular(data) if target.tabular else data, output_path)
         except Exception as e:
             print(f"Error converting file: {e}")
             return False
 
+    def convert_tree(self, src_dir: str, dst_dir: str, out_ext: str, workers: Optional[int] = None,
+                     check: str = 'mtime') -> Dict[str, Any]:
+        # Converts every supported file under src_dir to out_ext under the same relative path in
+        # dst_dir. Outputs newer than their source (check='mtime'), or whose source digest matches
+        # the manifest kept in dst_dir (check='hash'), are skipped.
+        out_ext = out_ext.lower().lstrip('.')
+        src_dir, dst_dir = os.path.abspath(src_dir), os.path.abspath(dst_dir)
+        manifest_path = os.path.join(dst_dir, '.convert_manifest.json')
+        manifest: Dict[str, str] = {}
+        if check == 'hash' and os.path.exists(manifest_path):
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+
+        targets: Dict[str, List[str]] = {}
+        for root, dirs, names in os.walk(src_dir):
+            # Never pick up our own outputs when dst_dir sits inside src_dir
+            dirs[:] = sorted(d for d in dirs if not d.startswith('.') and os.path.join(root, d) != dst_dir)
+            for name in sorted(names):
+                if name.startswith('.') or data_extension(name) not in self.supported_formats:
+                    continue
+                rel = os.path.relpath(os.path.join(root, name), src_dir)
+                stem = os.path.splitext(split_compression(rel)[0])[0]
+                targets.setdefault(f"{stem}.{out_ext}", []).append(rel)
+        # Sources sharing a stem (x.json and x.xml) keep their whole name instead: x.json.csv
+        outputs: Dict[str, str] = {}
+        for target, rels in targets.items():
+            for rel in rels:
+                out = target if len(rels) == 1 else f"{rel}.{out_ext}"
+                if out in outputs:
+                    raise ValueError(f"{rel} and {outputs[out]} would both be converted to {out}")
+                outputs[out] = rel
+        jobs = []
+        for out, rel in sorted(outputs.items(), key=lambda item: item[1]):
+            dst = os.path.join(dst_dir, out)
+            os.makedirs(os.path.dirname(dst), exist_ok=True)
+            jobs.append((os.path.join(src_dir, rel), dst, check, manifest.get(rel), self.compression))
+
+        start = time.perf_counter()
+        if workers == 1 or len(jobs) < 2:
+            files = [_convert_tree_job(job) for job in jobs]
+        else:
+            workers = workers or os.cpu_count() or 1
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                # Batches of jobs per task keep IPC overhead low for many small files
+                files = list(pool.map(_convert_tree_job, jobs, chunksize=max(1, len(jobs) // (workers * 8))))
+        elapsed = time.perf_counter() - start
+
+        if check == 'hash':
+            for item in files:
+                if item["status"] != "failed":
+                    manifest[os.path.relpath(item["source"], src_dir)] = item["digest"]
+            os.makedirs(dst_dir, exist_ok=True)
+            with open(manifest_path, 'w', encoding='utf-8') as f:
+                json.dump(manifest, f, indent=2)
+        for item in files:
+            del item["digest"]
+
+        done = [item for item in files if item["status"] == "converted"]
+        converted_bytes = sum(item["bytes"] for item in done)
+        summary = {
+            "files": len(files),
+            "converted": len(done),
+            "skipped": sum(item["status"] == "skipped" for item in files),
+            "failed": sum(item["status"] == "failed" for item in files),
+            "seconds": elapsed,
+            "files_per_s": len(done) / elapsed if elapsed else None,
+            "mb_per_s": converted_bytes / 1024 ** 2 / elapsed if elapsed else None,
+        }
+        return {"files": files, "summary": summary}
+
+    def _record_stream(self, input_path: str, codec: Optional[Codec]) -> Optional[Callable[..., Iterator[Any]]]:
+        # A re-callable record stream, records(chunk_size=None), when the codec can stream this file
+        if codec is None or codec.records is None or self._call(codec.records, input_path, None) is None:
+            return None
+        return lambda chunk_size=None: self._call(codec.records, input_path, chunk_size)
+
+    def _write_csv_stream(self, records: Callable[..., Iterator[Any]], output_path: str,
+                          chunk_size: int = 50_000) -> bool:
+        # CSV needs every column up front: a cheap first pass collects them in order
+        columns: Dict[str, None] = {}
+        for row in records():
+            columns.update(dict.fromkeys(row))
+        with self._open(output_path, 'w', newline='') as f:
+            header = True
+            for chunk in records(chunk_size):
+                chunk.reindex(columns=list(columns)).to_csv(f, index=False, header=header)
+                header = False
+            if header:
+                pd.DataFrame(columns=list(columns)).to_csv(f, index=False)
+        return True
+
     # ---------- Sample Files ----------
     def create_sample_files(self, out_dir: str) -> Dict[str, str]:
         os.makedirs(out_dir, exist_ok=True)
@@ -1,61 +1,1255 @@
 from __future__ import annotations
+import glob
+import hashlib
+import io
+import json
+import math
 import os
+import pickle
+import queue
+import re
+import shutil
 import sys
-from typing import Any, Dict, List, Optional, Union
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Union
+import numpy as np
 import pandas as pd
 
+try:
+    from .compression import Compression, data_extension, open_file, pandas_compression, resolve
+    from .profiling import Profiler, profiled, with_profilers
+except ImportError:
+    from compression import Compression, data_extension, open_file, pandas_compression, resolve
+    from profiling import Profiler, profiled, with_profilers
+
+
+# Set of 64-bit row hashes kept as sorted numpy runs (8 bytes per distinct row)
+class _RowHashIndex:
+    def __init__(self):
+        self._runs: List[np.ndarray] = []
+
+    def __len__(self) -> int:
+        return sum(len(run) for run in self._runs)
+
+    def add(self, hashes: np.ndarray) -> np.ndarray:
+        # Returns a mask marking the first occurrence of each previously unseen hash
+        uniq, first_idx = np.unique(hashes, return_index=True)
+        fresh = np.ones(len(uniq), dtype=bool)
+        for run in self._runs:
+            pos = np.minimum(np.searchsorted(run, uniq), len(run) - 1)
+            fresh &= run[pos] != uniq
+        mask = np.zeros(len(hashes), dtype=bool)
+        mask[first_idx[fresh]] = True
+        new = uniq[fresh]
+        if len(new):
+            self._runs.append(new)
+            # Merge runs of similar size so lookups stay logarithmic in the number of runs
+            while len(self._runs) > 1 and len(self._runs[-2]) <= 2 * len(self._runs[-1]):
+                last = self._runs.pop()
+                self._runs[-1] = np.sort(np.concatenate([self._runs[-1], last]))
+        return mask
+
+
+# Bloom filter over 64-bit hashes; membership may report false positives at about error_rate
+class _BloomFilter:
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        self.bits = max(64, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.bits / capacity * math.log(2)))
+        self.error_rate = error_rate
+        self._array = np.zeros((self.bits + 7) // 8, dtype=np.uint8)
+
+    def _positions(self, hashes: np.ndarray) -> np.ndarray:
+        # Kirsch-Mitzenmacher double hashing from the two 32-bit halves
+        h1 = (hashes & np.uint64(0xFFFFFFFF)).astype(np.uint64)
+        h2 = (hashes >> np.uint64(32)) | np.uint64(1)
+        i = np.arange(self.hashes, dtype=np.uint64)[:, None]
+        return ((h1[None, :] + i * h2[None, :]) % np.uint64(self.bits)).astype(np.int64)
+
+    def add(self, hashes: np.ndarray) -> np.ndarray:
+        # Returns a mask of hashes that were (probably) already present
+        pos = self._positions(hashes)
+        present = ((self._array[pos >> 3] >> (pos & 7).astype(np.uint8)) & 1).all(axis=0)
+        np.bitwise_or.at(self._array, pos.ravel() >> 3, (np.uint8(1) << (pos.ravel() & 7).astype(np.uint8)))
+        return present
+
+
+# HyperLogLog distinct counter over 64-bit hashes (standard error 1.04 / sqrt(2 ** p))
+class _HyperLogLog:
+    def __init__(self, p: int = 14):
+        self.p = p
+        self.registers = np.zeros(1 << p, dtype=np.uint8)
+
+    def add(self, hashes: np.ndarray) -> None:
+        p = np.uint64(self.p)
+        idx = (hashes >> (np.uint64(64) - p)).astype(np.int64)
+        # Rank = position of the first set bit in the remaining 64 - p bits
+        w = (hashes << p) | (np.uint64(1) << (p - np.uint64(1)))
+        hi = (w >> np.uint64(32)).astype(np.float64)
+        lo = (w & np.uint64(0xFFFFFFFF)).astype(np.float64)
+        clz = np.where(hi > 0, 32 - np.frexp(hi)[1], 64 - np.frexp(lo)[1])
+        np.maximum.at(self.registers, idx, (clz + 1).astype(np.uint8))
+
+    def merge(self, other: _HyperLogLog) -> None:
+        np.maximum(self.registers, other.registers, out=self.registers)
+
+    def estimate(self) -> int:
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / np.sum(np.ldexp(1.0, -self.registers.astype(np.int64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if raw <= 2.5 * m and zeros:
+            # Linear counting for small cardinalities
+            return int(round(m * math.log(m / zeros)))
+        return int(round(raw))
+
+    def relative_error(self) -> float:
+        return 1.04 / math.sqrt(len(self.registers))
+
+
+def _merge_dtype(prev: Any, new: Any) -> Any:
+    # The dtype that holds both chunks' values; incompatible kinds fall back to object
+    if prev is None or prev == new:
+        return new
+    try:
+        return np.result_type(prev, new)
+    except TypeError:
+        return np.dtype(object)
+
+
+# Mergeable get_data_info state for chunked input: row hashes feed the duplicate counter
+# ("exact" sorted-hash index or fixed-size "bloom" filter), column hashes feed HyperLogLogs.
+class _InfoState:
+    def __init__(self, duplicates: str = "exact", expected_rows: int = 10_000_000):
+        self.seen = _RowHashIndex() if duplicates == "exact" else _BloomFilter(expected_rows)
+        self.dtypes: Dict[str, Any] = {}
+        self.nulls: Dict[str, int] = {}
+        self.sketches: Dict[str, _HyperLogLog] = {}
+        self.rows = self.dupes = self.memory = 0
+
+    def update(self, chunk: pd.DataFrame) -> None:
+        self.rows += len(chunk)
+        self.memory += int(chunk.memory_usage(deep=True).sum())
+        row_hashes = pd.util.hash_pandas_object(chunk, index=False).to_numpy()
+        if isinstance(self.seen, _RowHashIndex):
+            self.dupes += int(len(chunk) - self.seen.add(row_hashes).sum())
+        else:
+            uniq = np.unique(row_hashes)
+            self.dupes += len(chunk) - len(uniq) + int(self.seen.add(uniq).sum())
+        for col in chunk.columns:
+            series = chunk[col]
+            self.dtypes[col] = _merge_dtype(self.dtypes.get(col), series.dtype)
+            self.nulls[col] = self.nulls.get(col, 0) + int(series.isna().sum())
+            values = series.dropna()
+            if col not in self.sketches:
+                self.sketches[col] = _HyperLogLog()
+            self.sketches[col].add(pd.util.hash_pandas_object(values, index=False).to_numpy())
+
+    def result(self) -> Dict[str, Any]:
+        info = {
+            "rows": self.rows,
+            "columns": len(self.dtypes),
+            "dtypes": {c: str(t) for c, t in self.dtypes.items()},
+            "null_counts": dict(self.nulls),
+            "duplicates": self.dupes,
+            "memory_usage": self.memory,
+            "distinct_counts": {c: h.estimate() for c, h in self.sketches.items()},
+            "distinct_error": _HyperLogLog().relative_error(),
+        }
+        if isinstance(self.seen, _BloomFilter):
+            # False positives can only inflate the duplicate count
+            info["duplicates_error_rate"] = self.seen.error_rate
+        return info
+
+
+# filter_data operators, each mapping (column, value) to a row mask
+_OPERATORS: Dict[str, Callable[[pd.Series, Any], pd.Series]] = {
+    "equals": lambda s, v: s == v,
+    "not_equals": lambda s, v: s != v,
+    "greater_than": lambda s, v: s > v,
+    "less_than": lambda s, v: s < v,
+    "in": lambda s, v: s.isin(v),
+    "between": lambda s, v: s.between(v[0], v[1]),
+    "contains": lambda s, v: s.astype(str).str.contains(str(v), na=False),
+}
+# Operators that are expensive per row; evaluated last and only on surviving rows
+_DEFERRED_OPERATORS = {"contains"}
+
+
+def compile_conditions(conditions: List[Dict[str, Any]]) -> Callable[[pd.DataFrame], np.ndarray]:
+    cheap, deferred = [], []
+    for cond in conditions:
+        op = cond["operator"]
+        if op not in _OPERATORS:
+            continue
+        step = (cond["column"], _OPERATORS[op], cond.get("value"))
+        (deferred if op in _DEFERRED_OPERATORS else cheap).append(step)
+
+    def predicate(df: pd.DataFrame) -> np.ndarray:
+        mask = np.ones(len(df), dtype=bool)
+        for col, fn, val in cheap:
+            mask &= fn(df[col], val).to_numpy(dtype=bool, na_value=False)
+        for col, fn, val in deferred:
+            idx = np.flatnonzero(mask)
+            if not len(idx):
+                break
+            mask[idx] = fn(df[col].iloc[idx], val).to_numpy(dtype=bool, na_value=False)
+        return mask
+
+    return predicate
+
+
+# Columnar formats read through pyarrow.dataset, keyed by extension
+_ARROW_FORMATS = {'parquet': 'parquet', 'pq': 'parquet', 'feather': 'ipc', 'arrow': 'ipc', 'ipc': 'ipc'}
+
+
+def _arrow_filter(conditions: List[Dict[str, Any]]) -> Any:
+    # Translate the conditions pyarrow can evaluate natively; the rest are applied after the read
+    import pyarrow.dataset as ds
+    expr = None
+    for cond in conditions:
+        field, op, val = ds.field(cond["column"]), cond["operator"], cond.get("value")
+        if op == "equals":
+            term = field == val
+        elif op == "not_equals":
+            term = field != val
+        elif op == "greater_than":
+            term = field > val
+        elif op == "less_than":
+            term = field < val
+        elif op == "in":
+            term = field.isin(list(val))
+        elif op == "between":
+            term = (field >= val[0]) & (field <= val[1])
+        else:
+            continue
+        expr = term if expr is None else expr & term
+    return expr
+
+
+def _arrow_schema(tables: List[Any]) -> Any:
+    # Column types over the chunks where a column has values: an all-null chunk (NaN floats,
+    # None objects) does not pin a type, and a column null everywhere keeps its first type
+    import pyarrow as pa
+    first = tables[0].schema
+    fields = []
+    for field in first:
+        types = [t.schema.field(field.name).type for t in tables
+                 if t.column(field.name).null_count < t.num_rows] or [field.type]
+        unified = pa.unify_schemas([pa.schema([(field.name, t)]) for t in types], promote_options='permissive')
+        fields.append(unified.field(field.name))
+    schema = pa.schema(fields)
+    # The pandas metadata describes the first chunk's dtypes, which only hold if no type changed
+    return schema.with_metadata(first.metadata) if schema.equals(first) else schema
+
+
+def _conform_table(table: Any, schema: Any) -> Any:
+    import pyarrow as pa
+    columns = []
+    for field in schema:
+        column = table.column(field.name)
+        if column.type != field.type:
+            column = pa.nulls(len(column), field.type) if column.null_count == len(column) else column.cast(field.type)
+        columns.append(column)
+    return pa.Table.from_arrays(columns, schema=schema)
+
+
+# Partial statistics each aggregation needs so that per-chunk results can be merged
+_AGG_PARTIALS = {
+    "sum": ("sum",),
+    "count": ("count",),
+    "min": ("min",),
+    "max": ("max",),
+    "mean": ("sum", "count"),
+    "var": ("sum", "count", "m2"),
+    "std": ("sum", "count", "m2"),
+    "size": ("size",),
+}
+
+
+def _partial_aggregate(chunk: pd.DataFrame, group_by: Union[str, List[str]], needed: Dict[str, set]) -> pd.DataFrame:
+    g = chunk.groupby(group_by)
+    parts = {}
+    for col, stats in needed.items():
+        if "size" in stats:
+            parts[(col, "size")] = g.size()
+        s = g[col]
+        if "count" in stats:
+            parts[(col, "count")] = s.count()
+        if "sum" in stats:
+            parts[(col, "sum")] = s.sum()
+        if "min" in stats:
+            parts[(col, "min")] = s.min()
+        if "max" in stats:
+            parts[(col, "max")] = s.max()
+        if "m2" in stats:
+            parts[(col, "m2")] = (s.var(ddof=0) * parts[(col, "count")]).fillna(0.0)
+    return pd.DataFrame(parts)
+
+
+def _combine_partials(frames: List[pd.DataFrame]) -> pd.DataFrame:
+    df = pd.concat(frames)
+    levels = list(range(df.index.nlevels))
+    out = {}
+    for col, stat in df.columns:
+        g = df[(col, stat)].groupby(level=levels)
+        if stat in ("sum", "count", "size"):
+            out[(col, stat)] = g.sum()
+        elif stat == "min":
+            out[(col, stat)] = g.min()
+        elif stat == "max":
+            out[(col, stat)] = g.max()
+    for col, stat in df.columns:
+        if stat != "m2":
+            continue
+        # Chan et al. merge of Welford states: M2 = sum(M2_i + n_i * (mean_i - mean)^2)
+        n = df[(col, "count")]
+        mean_i = df[(col, "sum")] / n.where(n > 0)
+        total = out[(col, "sum")] / out[(col, "count")].where(out[(col, "count")] > 0)
+        dev = mean_i.to_numpy() - total.reindex(df.index).to_numpy()
+        contrib = (df[(col, "m2")] + n * dev ** 2).fillna(0.0)
+        out[(col, "m2")] = contrib.groupby(level=levels).sum()
+    return pd.DataFrame(out)
+
+
+def _finalize_aggregates(partial: pd.DataFrame, aggregations: Dict[str, Union[str, List[str]]]) -> pd.DataFrame:
+    multi = any(isinstance(funcs, list) for funcs in aggregations.values())
+    result = {}
+    for col, funcs in aggregations.items():
+        for func in ([funcs] if isinstance(funcs, str) else funcs):
+            if func in ("sum", "count", "min", "max", "size"):
+                value = partial[(col, func)]
+            else:
+                n = partial[(col, "count")]
+                if func == "mean":
+                    value = partial[(col, "sum")] / n.where(n > 0)
+                else:
+                    value = partial[(col, "m2")] / (n - 1).where(n > 1)
+                    if func == "std":
+                        value = np.sqrt(value)
+            result[(col, func) if multi else col] = value
+    out = pd.DataFrame(result)
+    if multi:
+        out.columns = pd.MultiIndex.from_tuples(out.columns)
+    return out.sort_index().reset_index()
+
+
+# Mergeable KLL quantile sketch (Karnin, Lang, Liberty 2016) over float values
+class _KLLSketch:
+    def __init__(self, k: int = 200, seed: int = 42):
+        self.k = k
+        self.levels: List[np.ndarray] = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    def _capacity(self, level: int) -> int:
+        return max(2, int(self.k * (2 / 3) ** (len(self.levels) - 1 - level)))
+
+    def _compress(self) -> None:
+        level = 0
+        while level < len(self.levels):
+            items = self.levels[level]
+            if len(items) > self._capacity(level):
+                items = np.sort(items)
+                even = len(items) - len(items) % 2
+                promoted = items[int(self._rng.integers(2)):even:2]
+                self.levels[level] = items[even:]
+                if level + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+                # Capacities depend on the height, so re-check from the bottom
+                level = 0
+                continue
+            level += 1
+
+    def update(self, values: np.ndarray) -> None:
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self._compress()
+
+    def merge(self, other: _KLLSketch) -> None:
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for level, items in enumerate(other.levels):
+            self.levels[level] = np.concatenate([self.levels[level], items])
+        self._compress()
+
+    def quantiles(self, qs: List[float]) -> List[float]:
+        items = np.concatenate(self.levels)
+        if not len(items):
+            return [float('nan')] * len(qs)
+        weights = np.concatenate([np.full(len(lvl), 2 ** i, dtype=np.int64) for i, lvl in enumerate(self.levels)])
+        order = np.argsort(items, kind='stable')
+        items, cum = items[order], np.cumsum(weights[order])
+        idx = np.searchsorted(cum, np.asarray(qs) * cum[-1], side='left')
+        return [float(v) for v in items[np.minimum(idx, len(items) - 1)]]
+
+    def rank_error(self) -> float:
+        # Empirical single-rank error bound (99% confidence) from the Apache DataSketches KLL study
+        return 2.296 / self.k ** 0.9723
+
+
+# Streaming count/mean/M2/min/max plus a quantile sketch for one column
+class _ColumnStats:
+    def __init__(self, k: int = 200, seed: int = 42):
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = float('inf')
+        self.max = float('-inf')
+        self.sketch = _KLLSketch(k, seed)
+
+    def update(self, values: np.ndarray) -> None:
+        if not len(values):
+            return
+        other = _ColumnStats(self.sketch.k)
+        other.n, other.mean = len(values), float(values.mean())
+        other.m2 = float(((values - other.mean) ** 2).sum())
+        other.min, other.max = float(values.min()), float(values.max())
+        self._merge_moments(other)
+        self.sketch.update(values)
+
+    def merge(self, other: _ColumnStats) -> None:
+        self._merge_moments(other)
+        self.sketch.merge(other.sketch)
+
+    def _merge_moments(self, other: _ColumnStats) -> None:
+        if not other.n:
+            return
+        n = self.n + other.n
+        delta = other.mean - self.mean
+        self.mean += delta * other.n / n
+        self.m2 += other.m2 + delta ** 2 * self.n * other.n / n
+        self.n = n
+        self.min, self.max = min(self.min, other.min), max(self.max, other.max)
+
+    def result(self) -> Dict[str, Any]:
+        nan = float('nan')
+        q1, median, q3 = self.sketch.quantiles([0.25, 0.5, 0.75])
+        return {
+            "count": self.n,
+            "mean": self.mean if self.n else nan,
+            "median": median,
+            "std": (self.m2 / (self.n - 1)) ** 0.5 if self.n > 1 else nan,
+            "min": self.min if self.n else nan,
+            "max": self.max if self.n else nan,
+            "quartiles": {0.25: q1, 0.5: median, 0.75: q3},
+            "rank_error": self.sketch.rank_error(),
+        }
+
+
+def _chunk_statistics(chunk: pd.DataFrame, k: int, seed: int) -> Dict[str, _ColumnStats]:
+    states = {}
+    for col in chunk.select_dtypes(include=['number']).columns:
+        state = _ColumnStats(k, seed)
+        state.update(chunk[col].dropna().to_numpy(dtype=np.float64))
+        states[col] = state
+    return states
+
+
+# Per-column _ColumnStats merged across chunks (and across runs, for checkpoints)
+class _StatsState:
+    def __init__(self, k: int = 200, seed: int = 42):
+        self.k = k
+        self.seed = seed
+        self.chunks = 0
+        self.columns: Dict[str, _ColumnStats] = {}
+
+    def update(self, chunk: pd.DataFrame) -> None:
+        self.absorb(_chunk_statistics(chunk, self.k, self.seed + self.chunks))
+
+    def absorb(self, states: Dict[str, _ColumnStats]) -> None:
+        self.chunks += 1
+        for col, state in states.items():
+            if col in self.columns:
+                self.columns[col].merge(state)
+            else:
+                self.columns[col] = state
+
+    def result(self) -> Dict[str, Any]:
+        return {col: state.result() for col, state in self.columns.items()}
+
+
+def _exact_statistics(values: np.ndarray) -> Dict[str, Any]:
+    nan = float('nan')
+    n = len(values)
+    if not n:
+        return {"count": 0, "mean": nan, "median": nan, "std": nan, "min": nan, "max": nan,
+                "quartiles": {0.25: nan, 0.5: nan, 0.75: nan}}
+    q1, median, q3 = (float(q) for q in np.quantile(values, [0.25, 0.5, 0.75]))
+    return {
+        "count": n,
+        "mean": float(values.mean()),
+        "median": median,
+        "std": float(values.std(ddof=1)) if n > 1 else nan,
+        "min": float(values.min()),
+        "max": float(values.max()),
+        "quartiles": {0.25: q1, 0.5: median, 0.75: q3},
+    }
+
+
+# One sorted run spilled by the external sort, read back block by block
+class _SortRun:
+    def __init__(self, path: str):
+        import pyarrow as pa
+        self._source = pa.memory_map(path)
+        self._reader = pa.ipc.open_file(self._source)
+        self._next = 0
+
+    def read(self, rows: int) -> Optional[pd.DataFrame]:
+        import pyarrow as pa
+        batches, n = [], 0
+        while self._next < self._reader.num_record_batches and n < rows:
+            batch = self._reader.get_batch(self._next)
+            self._next += 1
+            batches.append(batch)
+            n += batch.num_rows
+        return pa.Table.from_batches(batches).to_pandas() if batches else None
+
+    def close(self) -> None:
+        self._source.close()
+
+
+def _partition_ids(chunk: pd.DataFrame, on: List[str], partitions: int) -> np.ndarray:
+    keys = chunk[on].copy()
+    for col in on:
+        # Hash numeric keys as float64 so 1 and 1.0 land in the same partition, as pd.merge matches them
+        if pd.api.types.is_numeric_dtype(keys[col]) and not pd.api.types.is_bool_dtype(keys[col]):
+            keys[col] = keys[col].astype(np.float64)
+    return pd.util.hash_pandas_object(keys, index=False).to_numpy() % partitions
+
+
+def _load_partition(path: str) -> Optional[pd.DataFrame]:
+    if not os.path.exists(path):
+        return None
+    frames = []
+    with open(path, 'rb') as f:
+        while True:
+            try:
+                frames.append(pickle.load(f))
+            except EOFError:
+                break
+    return pd.concat(frames, ignore_index=True)
+
+
+def _join_partition(left_path: str, right_path: str, on: List[str], how: str,
+                    left_empty: pd.DataFrame, right_empty: pd.DataFrame) -> pd.DataFrame:
+    left = _load_partition(left_path)
+    right = _load_partition(right_path)
+    # A side with no rows in this partition still needs its columns and dtypes, so every
+    # partition's result has the same schema
+    if left is None:
+        left = left_empty
+    if right is None:
+        right = right_empty
+    out = pd.merge(left, right, on=on, how=how)
+    # Columns of a side that may go unmatched turn float/object wherever a row finds no
+    # partner; cast them that way in every partition so all partitions agree
+    sides = ((left_empty, right_empty, '_x', ('right', 'outer')), (right_empty, left_empty, '_y', ('left', 'outer')))
+    for side, other, suffix, hows in sides:
+        if how not in hows:
+            continue
+        for col in side.columns.difference(on):
+            name = col + suffix if col in other.columns else col
+            if side[col].dtype.kind in 'iu':
+                out[name] = out[name].astype(np.float64)
+            elif side[col].dtype.kind == 'b':
+                out[name] = out[name].astype(object)
+    return out
+
+
+# Fixed-size uniform sample over a stream of chunks (Li's Algorithm L)
+class _Reservoir:
+    def __init__(self, n: int, rng: np.random.Generator):
+        self.n = n
+        self.rng = rng
+        self.seen = 0
+        self.frame: Optional[pd.DataFrame] = None
+        self.w = math.exp(math.log(self._uniform()) / n)
+        self.next = n + self._skip()
+
+    def _uniform(self) -> float:
+        return 1.0 - self.rng.random()
+
+    def _skip(self) -> int:
+        return int(math.floor(math.log(self._uniform()) / math.log(1.0 - self.w)))
+
+    def feed(self, chunk: pd.DataFrame) -> None:
+        start, end = self.seen, self.seen + len(chunk)
+        self.seen = end
+        filled = 0 if self.frame is None else len(self.frame)
+        if filled < self.n:
+            head = chunk.iloc[:self.n - filled]
+            self.frame = head if self.frame is None else pd.concat([self.frame, head])
+        # Only the rows Algorithm L lands on are touched; later hits on a slot win
+        replacements: Dict[int, int] = {}
+        while self.next < end:
+            replacements[int(self.rng.integers(self.n))] = self.next - start
+            self.w *= math.exp(math.log(self._uniform()) / self.n)
+            self.next += self._skip() + 1
+        if replacements:
+            keep = np.ones(self.n, dtype=bool)
+            keep[list(replacements)] = False
+            self.frame = pd.concat([self.frame[keep], chunk.iloc[list(replacements.values())]])
+
+
+# Read-only view of an open binary file that stops at `end`, so a CSV reader only
+# sees the complete lines appended since the last checkpoint
+class _ByteRange(io.RawIOBase):
+    def __init__(self, f: Any, end: int):
+        self.f = f
+        self.end = end
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        size = min(len(buffer), self.end - self.f.tell())
+        if size <= 0:
+            return 0
+        data = self.f.read(size)
+        buffer[:len(data)] = data
+        return len(data)
+
+
+def _complete_end(f: Any, start: int, size: int) -> int:
+    # Offset just past the last newline at or after start; a half-written last line waits
+    pos = size
+    while pos > start:
+        block = max(start, pos - 65536)
+        f.seek(block)
+        idx = f.read(pos - block).rfind(b'\n')
+        if idx >= 0:
+            return block + idx + 1
+        pos = block
+    return start
+
+
+def _region_digests(f: Any, offset: int, span: int = 65536) -> tuple:
+    # The first and last `span` bytes before offset; either changing means the file was rewritten
+    f.seek(0)
+    head = hashlib.blake2b(f.read(min(offset, span)), digest_size=16).hexdigest()
+    edge_start = max(0, offset - span)
+    f.seek(edge_start)
+    edge = hashlib.blake2b(f.read(offset - edge_start), digest_size=16).hexdigest()
+    return head, edge
+
+
+# Feeds a single-use chunk stream to a side consumer (a pipeline write or stats step)
+# running in a thread while the main chain keeps pulling the same chunks. The bounded
+# queue keeps at most `depth` chunks in flight.
+class _StreamTap:
+    _DONE = object()
+
+    def __init__(self, consume: Callable[[Iterator[pd.DataFrame]], Any], depth: int = 4):
+        self.queue: queue.Queue = queue.Queue(maxsize=depth)
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        # The consumer's profiled calls are recorded by the profilers active here
+        self.thread = threading.Thread(target=with_profilers(self._run), args=(consume,), daemon=True)
+        self.thread.start()
+
+    def _chunks(self) -> Iterator[pd.DataFrame]:
+        while True:
+            chunk = self.queue.get()
+            if chunk is self._DONE:
+                return
+            yield chunk
+
+    def _run(self, consume: Callable[[Iterator[pd.DataFrame]], Any]) -> None:
+        chunks = self._chunks()
+        try:
+            self.result = consume(chunks)
+        except BaseException as e:
+            self.error = e
+        # Keep draining so a failed consumer never blocks the producer
+        for _ in chunks:
+            pass
+
+    def wrap(self, stream: Iterable[pd.DataFrame]) -> Iterator[pd.DataFrame]:
+        try:
+            for chunk in stream:
+                self.queue.put(chunk)
+                yield chunk
+        finally:
+            self.queue.put(self._DONE)
+
+    def join(self) -> Any:
+        self.thread.join()
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+_ISO_DATE = re.compile(r'^\d{4}-\d{2}-\d{2}')
+
+
+def _looks_like_dates(series: pd.Series, sample: int = 1000) -> bool:
+    values = series.dropna().iloc[:sample]
+    return bool(values.map(lambda v: isinstance(v, str) and _ISO_DATE.match(v) is not None).all())
+
+
+# Schema sidecar contents inferred from one frame or merged over chunks: column dtypes
+# plus the string columns holding ISO dates, which are read with parse_dates instead
+class _SchemaBuilder:
+    def __init__(self):
+        self.dtypes: Dict[str, Any] = {}
+        self.dates: Optional[List[str]] = None
+
+    def update(self, chunk: pd.DataFrame) -> None:
+        for col in chunk.columns:
+            self.dtypes[col] = _merge_dtype(self.dtypes.get(col), chunk[col].dtype)
+        candidates = self.dates if self.dates is not None else \
+            [c for c in chunk.columns if chunk[c].dtype == object]
+        self.dates = [c for c in candidates if _looks_like_dates(chunk[c])]
+
+    def result(self, header: str) -> Dict[str, Any]:
+        dates = [c for c in self.dates or [] if self.dtypes[c] == object]
+        return {"header": header, "dtype": {c: str(t) for c, t in self.dtypes.items() if c not in dates},
+                "parse_dates": dates}
+
+
+def _file_stat(file_path: str) -> List[int]:
+    st = os.stat(file_path)
+    return [st.st_size, st.st_mtime_ns]
+
+
+def _declared_schema(schema: Dict[str, Any]) -> Dict[str, Any]:
+    # Only the types declare_schema recorded; they outlive re-inference after the file changes
+    declared = set(schema.get("declared", []))
+    return {"header": schema["header"], "dtype": {c: t for c, t in schema["dtype"].items() if c in declared},
+            "parse_dates": [c for c in schema["parse_dates"] if c in declared], "declared": sorted(declared)}
+
+
+def _with_declared(schema: Dict[str, Any], declared: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    if not declared or not declared.get("declared"):
+        return schema
+    dates = set(declared["parse_dates"])
+    schema["dtype"] = {c: t for c, t in schema["dtype"].items() if c not in dates}
+    schema["dtype"].update(declared["dtype"])
+    schema["parse_dates"] = list(dict.fromkeys([c for c in schema["parse_dates"] if c not in declared["dtype"]]
+                                               + declared["parse_dates"]))
+    schema["declared"] = declared["declared"]
+    return schema
+
+
+def _csv_header(file_path: str, encoding: Optional[str] = None, compression: Compression = 'infer') -> str:
+    with open_file(file_path, 'r', compression, encoding=encoding or 'utf-8', newline='') as f:
+        return f.readline().rstrip('\r\n')
+
+
+# Extensions read_data understands, used to pick data files out of a dataset directory
+_DATA_EXTENSIONS = {'csv', 'json', 'xls', 'xlsx', 'txt', *_ARROW_FORMATS}
+
+
+def _dataset_files(pattern: str) -> List[tuple]:
+    # (path, {key: value}) for every data file under a directory or matching a glob;
+    # hive-style `key=value` directories become partition values
+    if os.path.isdir(pattern):
+        paths = [os.path.join(root, name) for root, dirs, names in os.walk(pattern) for name in names]
+    else:
+        paths = glob.glob(pattern, recursive=True)
+    files = []
+    for path in sorted(paths):
+        name = os.path.basename(path)
+        if name.startswith(('.', '_')) or data_extension(name) not in _DATA_EXTENSIONS:
+            continue
+        parts = os.path.normpath(os.path.dirname(path)).split(os.sep)
+        files.append((path, dict(p.split('=', 1) for p in parts if '=' in p)))
+    return files
+
+
+def _partition_table(files: List[tuple]) -> pd.DataFrame:
+    # One row per file; keys whose values all parse as numbers become numeric
+    table = pd.DataFrame([partition for _, partition in files], index=range(len(files)))
+    for key in table.columns:
+        numeric = pd.to_numeric(table[key], errors='coerce')
+        if not numeric.isna().any():
+            table[key] = numeric
+    return table
+
+
+def _with_partition(df: pd.DataFrame, partition: Dict[str, Any], columns: Optional[List[str]]) -> pd.DataFrame:
+    df = df.copy(deep=False)
+    for key, value in partition.items():
+        df[key] = value
+    return df[list(columns)] if columns else df
+
+
+def _read_dataset_file(processor: DataProcessor, file_path: str, partition: Dict[str, Any],
+                       read_cols: Optional[List[str]], columns: Optional[List[str]],
+                       conditions: Optional[List[Dict[str, Any]]], kwargs: Dict[str, Any]) -> pd.DataFrame:
+    df = processor.read_data(file_path, columns=read_cols, conditions=conditions, **kwargs)
+    return _with_partition(df, partition, columns)
+
+
+# Pipeline step name -> DataProcessor method; step keys other than op/as/from are its kwargs
+_PIPELINE_STEPS = {
+    "clean": "clean_data",
+    "convert_data_types": "convert_data_types",
+    "filter": "filter_data",
+    "aggregate": "aggregate_data",
+    "pivot": "pivot_data",
+    "sort": "sort_data",
+    "sample": "sample_data",
+    "stats": "get_statistics",
+    "write": "write_data",
+}
+
+
+# On-disk cache of computed results keyed on (file fingerprint, operation, parameters).
+# The fingerprint is size + mtime + inode, or a content hash with content_hash=True.
+# Entries are pickles; the least recently used are evicted past max_bytes. The directory
+# is only created by the first put.
+class ResultCache:
+    def __init__(self, cache_dir: Optional[str] = None, max_bytes: int = 512 * 1024 ** 2, content_hash: bool = False):
+        self.cache_dir = cache_dir or os.environ.get("PYEVERYDAY_CACHE_DIR") or \
+            os.path.join(os.path.expanduser("~"), ".cache", "pyeveryday", "data_processor")
+        self.max_bytes = max_bytes
+        self.content_hash = content_hash
+
+    def fingerprint(self, file_path: str) -> str:
+        if os.path.isdir(file_path) or glob.has_magic(file_path):
+            # A multi-file dataset changes when any of its files does
+            return "|".join(self.fingerprint(path) for path, _ in _dataset_files(file_path))
+        st = os.stat(file_path)
+        if not self.content_hash:
+            return f"{os.path.abspath(file_path)}:{st.st_size}:{st.st_mtime_ns}:{st.st_ino}"
+        digest = hashlib.blake2b(digest_size=20)
+        with open(file_path, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(block)
+        return f"{st.st_size}:{digest.hexdigest()}"
+
+    def key(self, file_path: str, operation: str, params: Optional[Dict[str, Any]] = None) -> str:
+        payload = json.dumps([self.fingerprint(file_path), operation, params or {}], sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> tuple:
+        path = os.path.join(self.cache_dir, f"{key}.pkl")
+        try:
+            with open(path, 'rb') as f:
+                value = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return False, None
+        # Touch the entry so eviction sees it as recently used
+        os.utime(path)
+        return True, value
+
+    def put(self, key: str, value: Any) -> None:
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = os.path.join(self.cache_dir, f"{key}.pkl")
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, 'wb') as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+        self.evict()
+
+    def get_or_compute(self, file_path: str, operation: str, params: Optional[Dict[str, Any]],
+                       compute: Callable[[], Any]) -> Any:
+        key = self.key(file_path, operation, params)
+        hit, value = self.get(key)
+        if hit:
+            return value
+        value = compute()
+        self.put(key, value)
+        return value
+
+    def _entries(self) -> List[str]:
+        try:
+            return [name for name in os.listdir(self.cache_dir) if name.endswith('.pkl')]
+        except FileNotFoundError:
+            return []
+
+    def evict(self) -> None:
+        entries = []
+        for name in self._entries():
+            path = os.path.join(self.cache_dir, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+
+    def clear(self) -> None:
+        for name in self._entries():
+            os.remove(os.path.join(self.cache_dir, name))
+
 
 class DataProcessor:
-    def __init__(self, verbose: bool = True):
+    def __init__(self, verbose: bool = True, schema_cache: bool = False, schema_dir: Optional[str] = None):
         self.verbose = verbose
+        # CSV/TXT reads record their inferred dtypes in a sidecar and reuse them afterwards
+        self.schema_cache = schema_cache
+        self.schema_dir = schema_dir
 
     # ----------------- IO -----------------
-    def read_data(self, file_path: str, chunk_size: Optional[int] = None) -> Union[pd.DataFrame, pd.io.parsers.TextFileReader]:
-        ext = os.path.splitext(file_path)[1].lower().lstrip('.')
+    @profiled(reads='file_path')
+    def read_data(self, file_path: str, chunk_size: Optional[int] = None, columns: Optional[List[str]] = None,
+                  conditions: Optional[List[Dict[str, Any]]] = None, compact: bool = False,
+                  workers: Optional[int] = None, **kwargs) -> Union[pd.DataFrame, pd.io.parsers.TextFileReader]:
+        if os.path.isdir(file_path) or glob.has_magic(file_path):
+            return self._read_dataset(file_path, chunk_size, columns, conditions, compact, workers, **kwargs)
+        read_cols = columns
+        if columns and conditions:
+            # Filter columns have to be read even when they are projected away
+            read_cols = list(dict.fromkeys(list(columns) + [c["column"] for c in conditions]))
+        data = self._read_raw(file_path, chunk_size, read_cols, conditions, **kwargs)
+        if not conditions and not columns and not compact:
+            return data
+        # Push the filter into the read so dropped rows never accumulate
+        predicate = compile_conditions(conditions) if conditions else None
+
+        def finish(df: pd.DataFrame) -> pd.DataFrame:
+            if predicate is not None:
+                df = df[predicate(df)]
+            if columns and list(df.columns) != list(columns):
+                df = df[list(columns)]
+            if compact:
+                # Chunks only get the Arrow string conversion so their dtypes agree with each other
+                df = self.compact_dtypes(df, stable=not is_frame)
+            return df
+
+        is_frame = isinstance(data, pd.DataFrame)
+        if is_frame:
+            return finish(data)
+        return (finish(chunk) for chunk in self._iter_reader(data))
+
+    def _read_dataset(self, pattern: str, chunk_size: Optional[int], columns: Optional[List[str]],
+                      conditions: Optional[List[Dict[str, Any]]], compact: bool, workers: Optional[int],
+                      **kwargs) -> Union[pd.DataFrame, Iterator[pd.DataFrame]]:
+        # A glob or (hive-partitioned) directory of files read as one dataset. Conditions on
+        # partition keys prune whole files before any is opened; whole-file reads fan out
+        # to a process pool, chunked reads go file by file.
+        files = _dataset_files(pattern)
+        if not files:
+            raise FileNotFoundError(f"No data files match: {pattern}")
+        table = _partition_table(files)
+        keys = list(table.columns)
+        partition_conds = [c for c in conditions or [] if c["column"] in keys]
+        data_conds = [c for c in conditions or [] if c["column"] not in keys] or None
+        if partition_conds:
+            keep = compile_conditions(partition_conds)(table)
+            if self.verbose:
+                print(f"Partition pruning kept {int(keep.sum())} of {len(files)} files")
+            table = table[keep]
+        jobs = [(files[i][0], {k: v for k, v in row.items() if pd.notna(v)})
+                for i, row in zip(table.index, table.to_dict(orient='records'))]
+        read_cols = ([c for c in columns if c not in keys] or None) if columns else None
+
+        if chunk_size:
+            def chunks() -> Iterator[pd.DataFrame]:
+                for path, partition in jobs:
+                    for chunk in self.iter_chunks(path, chunk_size, columns=read_cols, conditions=data_conds, **kwargs):
+                        chunk = _with_partition(chunk, partition, columns)
+                        yield self.compact_dtypes(chunk, stable=True) if compact else chunk
+            return chunks()
+
+        workers = min(workers or os.cpu_count() or 1, len(jobs))
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = [pool.submit(_read_dataset_file, self, path, partition, read_cols, columns, data_conds, kwargs)
+                           for path, partition in jobs]
+                frames = [future.result() for future in futures]
+        else:
+            frames = [_read_dataset_file(self, path, partition, read_cols, columns, data_conds, kwargs)
+                      for path, partition in jobs]
+        df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=columns)
+        return self.compact_dtypes(df) if compact else df
+
+    def _iter_reader(self, reader: Any) -> Iterator[pd.DataFrame]:
+        if hasattr(reader, '__enter__'):
+            with reader:
+                yield from reader
+        else:
+            yield from reader
+
+    def _read_raw(self, file_path: str, chunk_size: Optional[int] = None, columns: Optional[List[str]] = None,
+                  conditions: Optional[List[Dict[str, Any]]] = None, **kwargs) -> Union[pd.DataFrame, pd.io.parsers.TextFileReader]:
+        ext = data_extension(file_path)
+        # data.csv.gz, data.json.zst, ...: pandas decompresses text formats while parsing
+        compression = pandas_compression(file_path, kwargs.pop('compression', 'infer'))
+        if compression is not None:
+            if ext not in ('csv', 'txt', 'json'):
+                raise ValueError(f"Compressed {ext} files are not supported")
+            kwargs['compression'] = compression
         if ext == 'csv':
-            return pd.read_csv(file_path, chunksize=chunk_size) if chunk_size else pd.read_csv(file_path)
+            if columns:
+                kwargs['usecols'] = columns
+            if self.schema_cache:
+                return self._read_csv_with_schema(file_path, chunk_size, columns, **kwargs)
+            return pd.read_csv(file_path, chunksize=chunk_size, **kwargs) if chunk_size else pd.read_csv(file_path, **kwargs)
         if ext in ('json',):
             if chunk_size:
-                return pd.read_json(file_path, lines=True, chunksize=chunk_size)
-            data = pd.read_json(file_path)
+                return pd.read_json(file_path, lines=True, chunksize=chunk_size, **kwargs)
+            data = pd.read_json(file_path, **kwargs)
             if isinstance(data, dict):
                 return pd.json_normalize(data)
             return data
         if ext in ('xls', 'xlsx'):
-            return pd.read_excel(file_path)
+            if columns:
+                kwargs['usecols'] = columns
+            return pd.read_excel(file_path, **kwargs)
         if ext == 'txt':
-            return pd.read_csv(file_path, delimiter='\t')
+            if columns:
+                kwargs['usecols'] = columns
+            if self.schema_cache:
+                return self._read_csv_with_schema(file_path, chunk_size, columns, delimiter='\t', **kwargs)
+            return pd.read_csv(file_path, delimiter='\t', chunksize=chunk_size, **kwargs) if chunk_size else pd.read_csv(file_path, delimiter='\t', **kwargs)
+        if ext in _ARROW_FORMATS:
+            return self._read_arrow(file_path, _ARROW_FORMATS[ext], chunk_size, columns, conditions)
         raise ValueError(f"Unsupported format: {ext}")
 
-    def write_data(self, data: Union[pd.DataFrame, pd.io.parsers.TextFileReader], file_path: str, format_type: Optional[str] = None) -> None:
-        ext = (format_type or os.path.splitext(file_path)[1].lower().lstrip('.'))
+    def _read_arrow(self, file_path: str, fmt: str, chunk_size: Optional[int] = None, columns: Optional[List[str]] = None,
+                    conditions: Optional[List[Dict[str, Any]]] = None) -> Union[pd.DataFrame, Iterator[pd.DataFrame]]:
+        import pyarrow.dataset as ds
+        dataset = ds.dataset(file_path, format=fmt)
+        # Parquet skips whole row groups whose min/max statistics cannot match
+        expr = _arrow_filter(conditions or [])
+        if not chunk_size:
+            return dataset.to_table(columns=columns, filter=expr).to_pandas()
+        batches = dataset.to_batches(columns=columns, filter=expr, batch_size=chunk_size)
+        return (batch.to_pandas() for batch in batches)
+
+    # ----------------- Schema sidecars -----------------
+    def _schema_path(self, file_path: str) -> str:
+        if self.schema_dir:
+            digest = hashlib.sha1(os.path.abspath(file_path).encode('utf-8')).hexdigest()
+            return os.path.join(self.schema_dir, f"{digest}.schema.json")
+        folder, name = os.path.split(os.path.abspath(file_path))
+        return os.path.join(folder, f".{name}.schema.json")
+
+    def load_schema(self, file_path: str, encoding: Optional[str] = None,
+                    compression: Compression = 'infer', check_stat: bool = True) -> Optional[Dict[str, Any]]:
+        # A sidecar only applies while the file still has the header it was recorded for.
+        # Inferred types also expire when the file's size or mtime changes (appended rows may
+        # hold nulls or text in an int column); what is left then is only the declared types,
+        # marked "partial" so the read infers the rest again.
+        try:
+            with open(self._schema_path(file_path), 'r', encoding='utf-8') as f:
+                schema = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if schema.get("header") != _csv_header(file_path, encoding, compression):
+            return None
+        if check_stat and schema.get("stat") != _file_stat(file_path):
+            return dict(_declared_schema(schema), partial=True) if schema.get("declared") else None
+        return schema
+
+    def save_schema(self, file_path: str, schema: Dict[str, Any]) -> None:
+        path = self._schema_path(file_path)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(schema, f, indent=2)
+        except OSError:
+            # Read-only data directory: keep the sidecar in the user cache instead
+            if self.schema_dir:
+                raise
+            self.schema_dir = os.path.join(os.path.expanduser("~"), ".cache", "pyeveryday", "schemas")
+            self.save_schema(file_path, schema)
+
+    @profiled(reads='file_path')
+    def infer_schema(self, file_path: str, chunk_size: int = 100_000, **kwargs) -> Dict[str, Any]:
+        # One chunked pass over the whole file, so large files get an exact sidecar too
+        if data_extension(file_path) == 'txt':
+            kwargs.setdefault('delimiter', '\t')
+        kwargs['compression'] = pandas_compression(file_path, kwargs.get('compression', 'infer'))
+        declared = self.load_schema(file_path, kwargs.get('encoding'), kwargs['compression'], check_stat=False)
+        stat = _file_stat(file_path)
+        builder = _SchemaBuilder()
+        for chunk in self._iter_reader(pd.read_csv(file_path, chunksize=chunk_size, low_memory=False, **kwargs)):
+            builder.update(chunk)
+        schema = builder.result(_csv_header(file_path, kwargs.get('encoding'), kwargs['compression']))
+        schema = _with_declared(dict(schema, stat=stat), declared and _declared_schema(declared))
+        self.save_schema(file_path, schema)
+        return schema
+
+    def declare_schema(self, file_path: str, dtype: Optional[Dict[str, str]] = None,
+                       parse_dates: Optional[List[str]] = None) -> Dict[str, Any]:
+        # Declared types override inferred ones, e.g. to persist convert_data_types conversions,
+        # and are kept when the inferred ones expire
+        schema = self.load_schema(file_path, check_stat=False) or \
+            {"header": _csv_header(file_path), "dtype": {}, "parse_dates": []}
+        schema["declared"] = sorted(set(schema.get("declared", [])) | set(dtype or {}) | set(parse_dates or []))
+        for col, kind in (dtype or {}).items():
+            if kind == 'datetime':
+                schema["dtype"].pop(col, None)
+                schema["parse_dates"] = list(dict.fromkeys(schema["parse_dates"] + [col]))
+            else:
+                schema["dtype"][col] = kind
+                schema["parse_dates"] = [c for c in schema["parse_dates"] if c != col]
+        for col in parse_dates or []:
+            schema["dtype"].pop(col, None)
+            schema["parse_dates"] = list(dict.fromkeys(schema["parse_dates"] + [col]))
+        self.save_schema(file_path, schema)
+        return schema
+
+    def _read_csv_with_schema(self, file_path: str, chunk_size: Optional[int], columns: Optional[List[str]],
+                              **kwargs) -> Union[pd.DataFrame, pd.io.parsers.TextFileReader]:
+        schema = self.load_schema(file_path, kwargs.get('encoding'), kwargs.get('compression', 'infer'))
+        custom = 'dtype' in kwargs
+        if schema is not None:
+            # Known types: no inference, no low_memory re-parse, no mixed-type warnings
+            wanted = set(columns) if columns else None
+            kwargs.setdefault('dtype', {c: t for c, t in schema["dtype"].items() if wanted is None or c in wanted})
+            dates = [c for c in schema["parse_dates"] if wanted is None or c in wanted]
+            if dates:
+                kwargs.setdefault('parse_dates', dates)
+                kwargs.setdefault('date_format', 'ISO8601')
+            if not schema.get("partial"):
+                return pd.read_csv(file_path, chunksize=chunk_size, **kwargs) if chunk_size else \
+                    pd.read_csv(file_path, **kwargs)
+
+        kwargs.setdefault('low_memory', False)
+        if chunk_size:
+            # A chunk is not the whole file; infer_schema records chunked files
+            return pd.read_csv(file_path, chunksize=chunk_size, **kwargs)
+        stat = _file_stat(file_path)
+        df = pd.read_csv(file_path, **kwargs)
+        if columns or custom:
+            return df
+        builder = _SchemaBuilder()
+        builder.update(df)
+        inferred = builder.result(_csv_header(file_path, kwargs.get('encoding'), kwargs.get('compression', 'infer')))
+        schema = _with_declared(dict(inferred, stat=stat), schema)
+        for col in schema["parse_dates"]:
+            df[col] = pd.to_datetime(df[col], format='ISO8601')
+        self.save_schema(file_path, schema)
+        if self.verbose:
+            print(f"Recorded schema for {file_path} in {self._schema_path(file_path)}")
+        return df
+
+    def iter_chunks(self, file_path: str, chunk_size: int = 100_000, **kwargs) -> Iterator[pd.DataFrame]:
+        reader = self.read_data(file_path, chunk_size=chunk_size, **kwargs)
+        if isinstance(reader, pd.DataFrame):
+            # Formats without chunked parsing (Excel) come back whole
+            yield reader
+        else:
+            yield from self._iter_reader(reader)
+
+    @profiled(writes='file_path')
+    def write_data(self, data: Union[pd.DataFrame, pd.io.parsers.TextFileReader], file_path: str, format_type: Optional[str] = None,
+                   compression: Compression = 'infer') -> None:
+        # compression: 'infer' from a .gz/.bz2/.xz/.zst suffix, None, a method, or a dict
+        # with options such as {'method': 'zstd', 'level': 19, 'threads': 8}
+        ext = (format_type or data_extension(file_path))
+        codec = pandas_compression(file_path, compression, write=True)
+        if codec is not None and ext not in ('csv', 'json'):
+            raise ValueError(f"Compressed {ext} files are not supported")
         if ext == 'csv':
             if hasattr(data, '__iter__') and not isinstance(data, pd.DataFrame):
-                first = True
-                for chunk in data:
-                    chunk.to_csv(file_path, index=False, mode='w' if first else 'a', header=first)
-                    first = False
+                # One handle for every chunk, so a compressed output is a single stream
+                with open_file(file_path, 'w', compression, newline='') as f:
+                    first = True
+                    for chunk in data:
+                        chunk.to_csv(f, index=False, header=first)
+                        first = False
             else:
-                data.to_csv(file_path, index=False)
+                data.to_csv(file_path, index=False, compression=codec)
         elif ext == 'json':
             if hasattr(data, '__iter__') and not isinstance(data, pd.DataFrame):
-                with open(file_path, 'w', encoding='utf-8') as f:
+                with open_file(file_path, 'w', compression) as f:
                     for chunk in data:
-                        for rec in chunk.to_dict(orient='records'):
-                            f.write(pd.io.json.dumps(rec, force_ascii=False) + '\n')
+                        if len(chunk):
+                            f.write(chunk.to_json(orient='records', lines=True, force_ascii=False).rstrip('\n') + '\n')
             else:
-                data.to_json(file_path, orient='records', force_ascii=False, indent=2)
+                data.to_json(file_path, orient='records', force_ascii=False, indent=2, compression=codec)
         elif ext in ('xls', 'xlsx'):
             with pd.ExcelWriter(file_path, engine='openpyxl') as writer:
                 data.to_excel(writer, index=False)
+        elif ext in _ARROW_FORMATS:
+            self._write_arrow(data, file_path, _ARROW_FORMATS[ext])
         else:
             raise ValueError(f"Unsupported format: {ext}")
         if self.verbose:
             print(f"Data saved to {file_path}")
 
+    def _write_arrow(self, data: Union[pd.DataFrame, Iterator[pd.DataFrame]], file_path: str, fmt: str) -> None:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        chunks = [data] if isinstance(data, pd.DataFrame) else data
+
+        # The file schema is fixed once the writer opens, so chunks are held back while some
+        # column has only been null; the buffer can reach the whole stream if a column never
+        # gets a value
+        writer = schema = None
+        pending = []
+
+        def flush():
+            nonlocal writer, schema
+            schema = _arrow_schema(pending)
+            writer = pq.ParquetWriter(file_path, schema) if fmt == 'parquet' else pa.ipc.new_file(file_path, schema)
+            for table in pending:
+                writer.write_table(_conform_table(table, schema))
+            pending.clear()
+
+        try:
+            for chunk in chunks:
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+                if writer is not None:
+                    writer.write_table(_conform_table(table, schema))
+                    continue
+                pending.append(table)
+                if all(any(t.column(name).null_count < t.num_rows for t in pending) for name in table.column_names):
+                    flush()
+            if pending:
+                flush()
+        finally:
+            if writer is not None:
+                writer.close()
+
+    # ----------------- Dtype compaction -----------------
+    @profiled()
+    def compact_dtypes(self, data: pd.DataFrame, category_ratio: float = 0.5, arrow_strings: bool = True,
+                       stable: bool = False) -> pd.DataFrame:
+        # Smallest lossless dtypes: downcast ints, float32 when exact, category for
+        # low-cardinality strings and Arrow-backed strings for the rest. stable=True
+        # limits this to conversions that do not depend on the values seen.
+        before = int(data.memory_usage(deep=True).sum())
+        df = data.copy(deep=False)
+        for col in df.columns:
+            series = df[col]
+            if not stable and pd.api.types.is_integer_dtype(series) and not isinstance(series.dtype, pd.api.extensions.ExtensionDtype):
+                df[col] = pd.to_numeric(series, downcast='integer')
+            elif not stable and series.dtype == np.float64:
+                narrow = series.astype(np.float32)
+                if np.array_equal(narrow.to_numpy(dtype=np.float64), series.to_numpy(), equal_nan=True):
+                    df[col] = narrow
+            elif series.dtype == 'object' and pd.api.types.infer_dtype(series, skipna=True) in ('string', 'empty'):
+                if not stable and len(series) and series.nunique() / len(series) <= category_ratio:
+                    df[col] = series.astype('category')
+                elif arrow_strings:
+                    df[col] = series.astype('string[pyarrow]')
+        df.attrs["memory_before"] = before
+        if self.verbose and not stable:
+            after = int(df.memory_usage(deep=True).sum())
+            print(f"Compacted dtypes: {before:,} -> {after:,} bytes")
+        return df
+
     # ----------------- Info -----------------
-    def get_data_info(self, data: pd.DataFrame) -> Dict[str, Any]:
-        return {
+    @profiled()
+    def get_data_info(self, data: Union[str, pd.DataFrame, Iterable[pd.DataFrame]], duplicates: str = "exact",
+                      expected_rows: int = 10_000_000, checkpoint: Optional[str] = None,
+                      chunk_size: int = 100_000) -> Dict[str, Any]:
+        if checkpoint is not None:
+            # data is an append-only CSV path; only rows added since the checkpoint are read.
+            # The exact row index grows with the file, so checkpoints keep the fixed-size Bloom filter
+            duplicates = "bloom"
+            state = self._incremental(data, checkpoint, "info", {"duplicates": duplicates, "expected_rows": expected_rows},
+                                      lambda: _InfoState(duplicates, expected_rows), chunk_size)
+            return state.result()
+        if not isinstance(data, pd.DataFrame):
+            return self._streaming_info(data, duplicates, expected_rows)
+        info = {
             "rows": int(data.shape[0]),
             "columns": int(data.shape[1]),
             "dtypes": {c: str(t) for c, t in data.dtypes.to_dict().items()},
@@ -63,6 +1257,15 @@ class DataProcessor:
             "duplicates": int(data.duplicated().sum()),
             "memory_usage": int(data.memory_usage(deep=True).sum())
         }
+        if "memory_before" in data.attrs:
+            info["memory_before_compaction"] = int(data.attrs["memory_before"])
+        return info
+
+    def _streaming_info(self, chunks: Iterable[pd.DataFrame], duplicates: str, expected_rows: int) -> Dict[str, Any]:
+        state = _InfoState(duplicates, expected_rows)
+        for chunk in self._iter_reader(chunks):
+            state.update(chunk)
+        return state.result()
 
     def preview_data(self, data: pd.DataFrame, n: int = 5) -> pd.DataFrame:
         return data.head(n)
@@ -71,97 +1274,509 @@ class DataProcessor:
         return data.shape
 
     # ----------------- Cleaning -----------------
+    @profiled()
     def clean_data(self, data: pd.DataFrame, operations: Optional[Dict[str, Any]] = None) -> pd.DataFrame:
-        df = data.copy()
         if operations is None:
             operations = {"drop_duplicates": True, "fill_nulls": True, "strip_strings": True}
 
         if operations.get("drop_duplicates"):
-            before = len(df)
-            df = df.drop_duplicates()
+            before = len(data)
+            df = data.drop_duplicates().copy(deep=False)
             if self.verbose:
                 print(f"Removed {before - len(df)} duplicate rows")
+        else:
+            # Columns are replaced, never modified in place, so a shallow copy is enough
+            df = data.copy(deep=False)
 
-        if operations.get("fill_nulls"):
-            for col in df.columns:
-                if df[col].dtype == 'object':
-                    nulls = df[col].isna().sum()
+        # Filling and stripping are fused into a single pass per column
+        for col in df.columns:
+            is_object = df[col].dtype == 'object'
+            if operations.get("fill_nulls"):
+                nulls = df[col].isna().sum()
+                if is_object:
                     df[col] = df[col].fillna("Unknown")
                     if self.verbose and nulls > 0:
                         print(f"Filled {nulls} nulls in column '{col}' with 'Unknown'")
                 else:
-                    nulls = df[col].isna().sum()
                     df[col] = df[col].fillna(df[col].mean())
                     if self.verbose and nulls > 0:
                         print(f"Filled {nulls} nulls in column '{col}' with mean value")
-
-        if operations.get("strip_strings"):
-            for col in df.select_dtypes(include=['object']).columns:
+            if operations.get("strip_strings") and is_object:
                 df[col] = df[col].astype(str).str.strip()
                 if self.verbose:
                     print(f"Stripped whitespace in column '{col}'")
 
         return df
 
+    @profiled(reads='input_path', writes='output_path')
+    def clean_file(self, input_path: str, output_path: str, operations: Optional[Dict[str, Any]] = None,
+                   chunk_size: int = 100_000, format_type: Optional[str] = None) -> Dict[str, int]:
+        chunks, summary = self.clean_stream(lambda: self.iter_chunks(input_path, chunk_size), operations)
+        self.write_data(chunks, output_path, format_type)
+        return summary
+
+    def clean_stream(self, source: Callable[[], Iterable[pd.DataFrame]],
+                     operations: Optional[Dict[str, Any]] = None) -> tuple:
+        # Streaming clean_data over a re-iterable source: pass 1 (run now) marks duplicates
+        # and gathers means over the de-duplicated rows, pass 2 (the returned iterator)
+        # cleans chunk by chunk. Returns (chunks, summary). Duplicate detection keeps an
+        # 8-byte hash per distinct row in memory, so it is not bounded by the chunk size.
+        if operations is None:
+            operations = {"drop_duplicates": True, "fill_nulls": True, "strip_strings": True}
+        dedup = bool(operations.get("drop_duplicates"))
+
+        # Pass 1: duplicate masks, column kinds and fill statistics
+        seen = _RowHashIndex() if dedup else None
+        keep_masks: List[np.ndarray] = []
+        object_cols: set = set()
+        sums: Dict[str, float] = {}
+        counts: Dict[str, int] = {}
+        nulls: Dict[str, int] = {}
+        # Numeric dtype of each column over all chunks; an int column with nulls in a later
+        # CSV chunk comes back as float64 there, and the whole column is float64 in memory
+        numeric: Dict[str, Any] = {}
+        rows_in = rows_out = 0
+        for chunk in self._iter_reader(source()):
+            rows_in += len(chunk)
+            for col in chunk.columns:
+                if pd.api.types.is_numeric_dtype(chunk[col]) and not pd.api.types.is_bool_dtype(chunk[col]):
+                    numeric[col] = _merge_dtype(numeric.get(col), chunk[col].dtype)
+            if dedup:
+                # Numeric columns are hashed as float64 so 1 and 1.0 match across chunks
+                hashed = chunk.astype({col: np.float64 for col in chunk.columns if col in numeric})
+                mask = seen.add(pd.util.hash_pandas_object(hashed, index=False).to_numpy())
+                keep_masks.append(np.packbits(mask))
+                chunk = chunk[mask]
+            rows_out += len(chunk)
+            for col in chunk.columns:
+                series = chunk[col]
+                nulls[col] = nulls.get(col, 0) + int(series.isna().sum())
+                if series.dtype == 'object':
+                    object_cols.add(col)
+                elif pd.api.types.is_numeric_dtype(series):
+                    sums[col] = sums.get(col, 0.0) + float(series.sum())
+                    counts[col] = counts.get(col, 0) + int(series.count())
+        seen = None
+        means = {col: sums[col] / counts[col] for col in sums if col not in object_cols and counts[col]}
+
+        if self.verbose:
+            if dedup:
+                print(f"Removed {rows_in - rows_out} duplicate rows")
+            if operations.get("fill_nulls"):
+                for col, n in nulls.items():
+                    if n > 0:
+                        fill = "'Unknown'" if col in object_cols else "mean value"
+                        print(f"Filled {n} nulls in column '{col}' with {fill}")
+            if operations.get("strip_strings"):
+                for col in sorted(object_cols):
+                    print(f"Stripped whitespace in column '{col}'")
+
+        # Pass 2: apply the cleaning steps chunk by chunk
+        def cleaned() -> Iterator[pd.DataFrame]:
+            for i, chunk in enumerate(self._iter_reader(source())):
+                if dedup:
+                    chunk = chunk[np.unpackbits(keep_masks[i], count=len(chunk)).astype(bool)]
+                chunk = chunk.copy(deep=False)
+                for col in chunk.columns:
+                    if col in numeric and chunk[col].dtype != numeric[col]:
+                        chunk[col] = chunk[col].astype(numeric[col])
+                    if operations.get("fill_nulls"):
+                        if col in object_cols:
+                            chunk[col] = chunk[col].fillna("Unknown")
+                        elif col in means:
+                            chunk[col] = chunk[col].fillna(means[col])
+                    if operations.get("strip_strings") and col in object_cols:
+                        chunk[col] = chunk[col].astype(str).str.strip()
+                yield chunk
+
+        return cleaned(), {"rows_in": rows_in, "rows_out": rows_out, "duplicates": rows_in - rows_out}
+
     # ----------------- Filtering -----------------
+    @profiled()
     def filter_data(self, data: pd.DataFrame, conditions: List[Dict[str, Any]]) -> pd.DataFrame:
-        df = data.copy()
-        for cond in conditions:
-            col = cond["column"]
-            op = cond["operator"]
-            val = cond.get("value")
-            if op == "equals":
-                df = df[df[col] == val]
-            elif op == "not_equals":
-                df = df[df[col] != val]
-            elif op == "greater_than":
-                df = df[df[col] > val]
-            elif op == "less_than":
-                df = df[df[col] < val]
-            elif op == "contains":
-                df = df[df[col].astype(str).str.contains(str(val), na=False)]
-            elif op == "in":
-                df = df[df[col].isin(val)]
-            elif op == "between":
-                df = df[df[col].between(val[0], val[1])]
-        return df
+        # All conditions are combined into one mask, so the frame is sliced once
+        return data[compile_conditions(conditions)(data)]
 
     # ----------------- Aggregation / Merge / Pivot -----------------
-    def aggregate_data(self, data: pd.DataFrame, group_by: Union[str, List[str]], aggregations: Dict[str, Union[str, List[str]]]) -> pd.DataFrame:
-        return data.groupby(group_by).agg(aggregations).reset_index()
+    @profiled()
+    def aggregate_data(self, data: Union[pd.DataFrame, Iterable[pd.DataFrame]], group_by: Union[str, List[str]],
+                       aggregations: Dict[str, Union[str, List[str]]], max_groups: int = 1_000_000,
+                       spill_dir: Optional[str] = None, spill_partitions: int = 16) -> pd.DataFrame:
+        if isinstance(data, pd.DataFrame):
+            return data.groupby(group_by).agg(aggregations).reset_index()
+        return self._aggregate_chunks(data, group_by, aggregations, max_groups, spill_dir, spill_partitions)
+
+    def _aggregate_chunks(self, chunks: Iterable[pd.DataFrame], group_by: Union[str, List[str]],
+                          aggregations: Dict[str, Union[str, List[str]]], max_groups: int,
+                          spill_dir: Optional[str], spill_partitions: int) -> pd.DataFrame:
+        # Per-chunk partial aggregates merged at the end; once the number of groups
+        # exceeds max_groups the state is hash-partitioned to disk and merged per partition.
+        needed: Dict[str, set] = {}
+        for col, funcs in aggregations.items():
+            for func in ([funcs] if isinstance(funcs, str) else funcs):
+                if func not in _AGG_PARTIALS:
+                    raise ValueError(f"Aggregation '{func}' is not supported on chunked input")
+                needed.setdefault(col, set()).update(_AGG_PARTIALS[func])
+
+        state: Optional[pd.DataFrame] = None
+        pending: List[pd.DataFrame] = []
+        pending_rows = 0
+        tmp_dir = None
+        spills = 0
+        try:
+            for chunk in self._iter_reader(chunks):
+                partial = _partial_aggregate(chunk, group_by, needed)
+                pending.append(partial)
+                pending_rows += len(partial)
+                if pending_rows < max_groups:
+                    continue
+                state = _combine_partials(([state] if state is not None else []) + pending)
+                pending, pending_rows = [], 0
+                if len(state) > max_groups:
+                    if tmp_dir is None:
+                        tmp_dir = tempfile.mkdtemp(prefix="aggregate_", dir=spill_dir)
+                    self._spill_partitions(state, tmp_dir, spills, spill_partitions)
+                    spills += 1
+                    state = None
+            if state is not None or pending:
+                state = _combine_partials(([state] if state is not None else []) + pending)
+            if tmp_dir is None:
+                if state is None:
+                    raise ValueError("No data to aggregate")
+                return _finalize_aggregates(state, aggregations)
+
+            if state is not None:
+                self._spill_partitions(state, tmp_dir, spills, spill_partitions)
+                spills += 1
+            if self.verbose:
+                print(f"Merging {spills} spilled aggregate states in {spill_partitions} partitions")
+            results = []
+            for part in range(spill_partitions):
+                pieces = [pd.read_pickle(os.path.join(tmp_dir, f"part{part}_{i}.pkl")) for i in range(spills)]
+                merged = _combine_partials(pieces)
+                if len(merged):
+                    results.append(_finalize_aggregates(merged, aggregations))
+            return pd.concat(results).sort_values(group_by, kind="stable").reset_index(drop=True)
+        finally:
+            if tmp_dir is not None:
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    def _spill_partitions(self, state: pd.DataFrame, tmp_dir: str, seq: int, partitions: int) -> None:
+        buckets = pd.util.hash_pandas_object(state.index, index=False).to_numpy() % partitions
+        for part in range(partitions):
+            state[buckets == part].to_pickle(os.path.join(tmp_dir, f"part{part}_{seq}.pkl"))
+
+    @profiled(rows='data1')
+    def merge_datasets(self, data1: Union[str, pd.DataFrame, Iterable[pd.DataFrame]],
+                       data2: Union[str, pd.DataFrame, Iterable[pd.DataFrame]],
+                       on: Optional[Union[str, List[str]]] = None, how: str = 'inner',
+                       partitions: Optional[int] = None, chunk_size: int = 100_000, workers: Optional[int] = None,
+                       spill_dir: Optional[str] = None) -> Union[pd.DataFrame, Iterator[pd.DataFrame]]:
+        if isinstance(data1, pd.DataFrame) and isinstance(data2, pd.DataFrame) and not partitions:
+            return pd.merge(data1, data2, on=on, how=how)
+        if on is None:
+            raise ValueError("Partitioned merge requires the join columns in 'on'")
+        return self._partitioned_merge(data1, data2, [on] if isinstance(on, str) else list(on), how,
+                                       partitions or 32, chunk_size, workers, spill_dir)
 
-    def merge_datasets(self, data1: pd.DataFrame, data2: pd.DataFrame, on: Optional[Union[str, List[str]]] = None, how: str = 'inner') -> pd.DataFrame:
-        return pd.merge(data1, data2, on=on, how=how)
+    def _partitioned_merge(self, data1: Any, data2: Any, on: List[str], how: str, partitions: int,
+                           chunk_size: int, workers: Optional[int], spill_dir: Optional[str]) -> Iterator[pd.DataFrame]:
+        # Grace hash join: both inputs are hash-partitioned on the key into spill files,
+        # then each pair of partitions is joined on its own and yielded.
+        tmp_dir = tempfile.mkdtemp(prefix="merge_", dir=spill_dir)
+        try:
+            sides = []
+            for name, data in (("left", data1), ("right", data2)):
+                if isinstance(data, str):
+                    chunks = self.iter_chunks(data, chunk_size)
+                elif isinstance(data, pd.DataFrame):
+                    chunks = [data]
+                else:
+                    chunks = self._iter_reader(data)
+                sides.append(self._spill_by_key(chunks, on, partitions, os.path.join(tmp_dir, name)))
+            (left_dir, left_empty), (right_dir, right_empty) = sides
+            jobs = [(os.path.join(left_dir, f"{part}.pkl"), os.path.join(right_dir, f"{part}.pkl"), on, how,
+                     left_empty, right_empty) for part in range(partitions)]
+            if self.verbose:
+                print(f"Joining {partitions} partitions")
+            if workers and workers > 1:
+                with ProcessPoolExecutor(max_workers=workers) as pool:
+                    pending = []
+                    for job in jobs:
+                        pending.append(pool.submit(_join_partition, *job))
+                        if len(pending) >= 2 * workers:
+                            yield pending.pop(0).result()
+                    for future in pending:
+                        yield future.result()
+            else:
+                for job in jobs:
+                    yield _join_partition(*job)
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
 
+    def _spill_by_key(self, chunks: Iterable[pd.DataFrame], on: List[str], partitions: int, out_dir: str) -> tuple:
+        # Returns the spill directory and a zero-row frame carrying the input's columns and dtypes
+        os.makedirs(out_dir)
+        empty: Optional[pd.DataFrame] = None
+        files: Dict[int, Any] = {}
+        try:
+            for chunk in chunks:
+                if empty is None:
+                    empty = chunk.iloc[0:0]
+                ids = _partition_ids(chunk, on, partitions)
+                for part in np.unique(ids):
+                    if part not in files:
+                        files[part] = open(os.path.join(out_dir, f"{part}.pkl"), 'wb')
+                    pickle.dump(chunk[ids == part], files[part], protocol=pickle.HIGHEST_PROTOCOL)
+        finally:
+            for f in files.values():
+                f.close()
+        return out_dir, empty if empty is not None else pd.DataFrame(columns=on)
+
+    @profiled()
     def pivot_data(self, data: pd.DataFrame, index: Union[str, List[str]], columns: Union[str, List[str]], values: Union[str, List[str]], aggfunc: str = 'sum') -> pd.DataFrame:
         return pd.pivot_table(data, index=index, columns=columns, values=values, aggfunc=aggfunc).reset_index()
 
     # ----------------- Sorting / Sampling -----------------
-    def sort_data(self, data: pd.DataFrame, columns: Union[str, List[str]], ascending: Union[bool, List[bool]] = True) -> pd.DataFrame:
-        return data.sort_values(by=columns, ascending=ascending)
+    @profiled()
+    def sort_data(self, data: Union[pd.DataFrame, Iterable[pd.DataFrame]], columns: Union[str, List[str]],
+                  ascending: Union[bool, List[bool]] = True, memory_limit: int = 256 * 1024 ** 2,
+                  spill_dir: Optional[str] = None) -> Union[pd.DataFrame, Iterator[pd.DataFrame]]:
+        if isinstance(data, pd.DataFrame):
+            return data.sort_values(by=columns, ascending=ascending)
+        return self._external_sort(data, columns, ascending, memory_limit, spill_dir)
+
+    def _external_sort(self, chunks: Iterable[pd.DataFrame], columns: Union[str, List[str]],
+                       ascending: Union[bool, List[bool]], memory_limit: int,
+                       spill_dir: Optional[str]) -> Iterator[pd.DataFrame]:
+        # Chunks are buffered up to memory_limit, sorted and spilled as Arrow IPC runs,
+        # then the runs are merged block-wise and the result is yielded in sorted chunks.
+        import pyarrow as pa
+        tmp_dir = tempfile.mkdtemp(prefix="sort_", dir=spill_dir)
+        runs: List[_SortRun] = []
+        try:
+            paths: List[str] = []
+            buffered: List[pd.DataFrame] = []
+            buffered_bytes = rows = 0
+            total_bytes = 0
+
+            def spill() -> None:
+                run = pd.concat(buffered, ignore_index=True).sort_values(by=columns, ascending=ascending)
+                path = os.path.join(tmp_dir, f"run{len(paths)}.arrow")
+                table = pa.Table.from_pandas(run, preserve_index=False)
+                with pa.ipc.new_file(path, table.schema) as writer:
+                    writer.write_table(table, max_chunksize=8192)
+                paths.append(path)
+
+            for chunk in self._iter_reader(chunks):
+                size = int(chunk.memory_usage(deep=True).sum())
+                buffered.append(chunk)
+                buffered_bytes += size
+                total_bytes += size
+                rows += len(chunk)
+                if buffered_bytes >= memory_limit:
+                    spill()
+                    buffered, buffered_bytes = [], 0
+            if not paths:
+                # Everything fit in the budget
+                if buffered:
+                    yield pd.concat(buffered, ignore_index=True).sort_values(by=columns, ascending=ascending)
+                return
+            if buffered:
+                spill()
+                buffered = []
+            if self.verbose:
+                print(f"Merging {len(paths)} sorted runs")
+
+            # Each run gets an equal share of the budget for its read buffer
+            row_bytes = max(1, total_bytes // max(rows, 1))
+            block_rows = max(1024, memory_limit // (2 * row_bytes * len(paths)))
+            runs = [_SortRun(path) for path in paths]
+            exhausted: set = set()
+            pending = pd.DataFrame()
+            while True:
+                # Refill every run whose buffered rows have all been emitted
+                held = set(pending['__run'].unique()) if len(pending) else set()
+                parts = [pending]
+                for i, run in enumerate(runs):
+                    if i in held or i in exhausted:
+                        continue
+                    block = run.read(block_rows)
+                    if block is None:
+                        exhausted.add(i)
+                    else:
+                        parts.append(block.assign(__run=i))
+                pending = pd.concat(parts, ignore_index=True).sort_values(
+                    by=columns, ascending=ascending, kind='mergesort', ignore_index=True)
+                if not len(pending):
+                    break
+                # Rows up to the earliest last-buffered row of any unfinished run are final
+                run_ids = pending['__run'].to_numpy()
+                live = ~np.isin(run_ids, list(exhausted))
+                if not live.any():
+                    yield pending.drop(columns='__run')
+                    break
+                cut = int(pd.Series(np.arange(len(pending))[live]).groupby(run_ids[live]).max().min())
+                yield pending.iloc[:cut + 1].drop(columns='__run')
+                pending = pending.iloc[cut + 1:]
+        finally:
+            for run in runs:
+                run.close()
+            shutil.rmtree(tmp_dir, ignore_errors=True)
 
-    def sample_data(self, data: pd.DataFrame, n: Optional[int] = None, frac: Optional[float] = None, random_state: int = 42) -> pd.DataFrame:
-        return data.sample(n=n, frac=frac, random_state=random_state)
+    @profiled()
+    def sample_data(self, data: Union[pd.DataFrame, Iterable[pd.DataFrame]], n: Optional[int] = None,
+                    frac: Optional[float] = None, random_state: int = 42, stratify: Optional[str] = None) -> pd.DataFrame:
+        if isinstance(data, pd.DataFrame):
+            if stratify:
+                return data.groupby(stratify, group_keys=False).sample(n=n, frac=frac, random_state=random_state)
+            return data.sample(n=n, frac=frac, random_state=random_state)
+
+        # Streaming: a reservoir of n rows (per stratum value when stratify is set),
+        # or a Bernoulli draw per row for frac. The same random_state and chunking
+        # give the same sample.
+        rng = np.random.default_rng(random_state)
+        if frac is not None:
+            parts = [chunk[rng.random(len(chunk)) < frac] for chunk in self._iter_reader(data)]
+            return pd.concat(parts) if parts else pd.DataFrame()
+        if n is None:
+            n = 1
+        if n <= 0:
+            # Nothing to draw; the first chunk only supplies the columns
+            first = next(iter(self._iter_reader(data)), None)
+            return first.iloc[:0] if first is not None else pd.DataFrame()
+        if not stratify:
+            reservoir = _Reservoir(n, rng)
+            for chunk in self._iter_reader(data):
+                reservoir.feed(chunk)
+            return reservoir.frame if reservoir.frame is not None else pd.DataFrame()
+        reservoirs: Dict[Any, _Reservoir] = {}
+        for chunk in self._iter_reader(data):
+            for key, group in chunk.groupby(stratify, sort=False):
+                if key not in reservoirs:
+                    reservoirs[key] = _Reservoir(n, rng)
+                reservoirs[key].feed(group)
+        frames = [r.frame for r in reservoirs.values() if r.frame is not None]
+        return pd.concat(frames) if frames else pd.DataFrame()
 
     # ----------------- Statistics -----------------
-    def get_statistics(self, data: pd.DataFrame) -> Dict[str, Any]:
-        stats = {}
-        numeric_cols = data.select_dtypes(include=['number']).columns
-        for col in numeric_cols:
-            stats[col] = {
-                "count": int(data[col].count()),
-                "mean": float(data[col].mean()),
-                "median": float(data[col].median()),
-                "std": float(data[col].std()),
-                "min": float(data[col].min()),
-                "max": float(data[col].max()),
-                "quartiles": data[col].quantile([0.25, 0.5, 0.75]).to_dict()
-            }
-        return stats
+    @profiled()
+    def get_statistics(self, data: Union[str, pd.DataFrame, Iterable[pd.DataFrame]], approximate: bool = False,
+                       workers: Optional[int] = None, sketch_size: int = 200, seed: int = 42,
+                       checkpoint: Optional[str] = None, chunk_size: int = 100_000) -> Dict[str, Any]:
+        # Exact mode sorts each column's values once; approximate mode streams Welford
+        # moments and a KLL sketch per chunk and reports the sketch's rank error.
+        if checkpoint is not None:
+            if not approximate:
+                raise ValueError("Incremental statistics need approximate=True (exact quantiles are not mergeable)")
+            state = self._incremental(data, checkpoint, "stats", {"sketch_size": sketch_size, "seed": seed},
+                                      lambda: _StatsState(sketch_size, seed), chunk_size)
+            return state.result()
+        if not approximate:
+            if isinstance(data, pd.DataFrame):
+                numeric = data.select_dtypes(include=['number'])
+                return {col: _exact_statistics(numeric[col].dropna().to_numpy(dtype=np.float64)) for col in numeric.columns}
+            # Chunked input in exact mode keeps only the numeric values in memory
+            values: Dict[str, List[np.ndarray]] = {}
+            for chunk in self._iter_reader(data):
+                for col in chunk.select_dtypes(include=['number']).columns:
+                    values.setdefault(col, []).append(chunk[col].dropna().to_numpy(dtype=np.float64))
+            return {col: _exact_statistics(np.concatenate(parts)) for col, parts in values.items()}
+
+        if isinstance(data, pd.DataFrame):
+            step = max(1, -(-len(data) // (workers or 1)))
+            chunks = (data.iloc[i:i + step] for i in range(0, max(len(data), 1), step))
+        else:
+            chunks = self._iter_reader(data)
+
+        merged = _StatsState(sketch_size, seed)
+        if workers and workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                pending = []
+                for i, chunk in enumerate(chunks):
+                    pending.append(pool.submit(_chunk_statistics, chunk, sketch_size, seed + i))
+                    # Bound the number of chunks held in flight
+                    if len(pending) >= 2 * workers:
+                        merged.absorb(pending.pop(0).result())
+                for future in pending:
+                    merged.absorb(future.result())
+        else:
+            for chunk in chunks:
+                merged.update(chunk)
+        return merged.result()
+
+    def _incremental(self, file_path: str, checkpoint: str, kind: str, params: Dict[str, Any],
+                     new_state: Callable[[], Any], chunk_size: int) -> Any:
+        # Resumes `kind` state from the checkpoint when the file still starts with the bytes
+        # it summarised, feeds it the complete lines appended since, and saves it again
+        ext = data_extension(file_path)
+        if ext not in ('csv', 'txt'):
+            raise ValueError(f"Incremental reads need a CSV or TXT file, got: {ext}")
+        if resolve(file_path) is not None:
+            # Byte offsets into a compressed stream cannot be resumed
+            raise ValueError(f"Incremental reads need an uncompressed file: {file_path}")
+        ckpt = None
+        try:
+            with open(checkpoint, 'rb') as f:
+                ckpt = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            pass
+        size = os.path.getsize(file_path)
+        with open(file_path, 'rb') as f:
+            if ckpt is not None and (ckpt.get("kind") != kind or ckpt.get("params") != params or size < ckpt["offset"]
+                                     or _region_digests(f, ckpt["offset"]) != ckpt["digests"]):
+                if self.verbose:
+                    print(f"Checkpoint {checkpoint} does not match {file_path}; rescanning")
+                ckpt = None
+            if ckpt is None:
+                ckpt = {"kind": kind, "params": params, "offset": 0, "columns": None, "dtypes": {}, "state": new_state()}
+            end = _complete_end(f, ckpt["offset"], size)
+            if end <= ckpt["offset"]:
+                return ckpt["state"]
+            f.seek(ckpt["offset"])
+            sep = '\t' if ext == 'txt' else ','
+            source = io.BufferedReader(_ByteRange(f, end))
+            if ckpt["columns"] is None:
+                reader = pd.read_csv(source, sep=sep, chunksize=chunk_size)
+            else:
+                # Float and string columns keep their dtypes so tail rows hash like earlier ones
+                reader = pd.read_csv(source, sep=sep, header=None, names=ckpt["columns"],
+                                     dtype=ckpt["dtypes"], chunksize=chunk_size)
+            rows = 0
+            for chunk in self._iter_reader(reader):
+                rows += len(chunk)
+                if ckpt["columns"] is None:
+                    ckpt["columns"] = list(chunk.columns)
+                for col in chunk.columns:
+                    if col not in ckpt["dtypes"] and chunk[col].dtype.kind in 'fO':
+                        ckpt["dtypes"][col] = chunk[col].dtype
+                ckpt["state"].update(chunk)
+            if ckpt["columns"] is None:
+                # Only a header so far; start from the top next time
+                return ckpt["state"]
+            ckpt["offset"] = end
+            ckpt["digests"] = _region_digests(f, end)
+        if self.verbose:
+            print(f"Read {rows:,} new rows from {file_path}")
+        # Written to a temp file and renamed, so a crash never leaves a truncated checkpoint
+        tmp = f"{checkpoint}.{os.getpid()}.tmp"
+        try:
+            with open(tmp, 'wb') as out:
+                pickle.dump(ckpt, out, protocol=pickle.HIGHEST_PROTOCOL)
+                out.flush()
+                os.fsync(out.fileno())
+            os.replace(tmp, checkpoint)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+        return ckpt["state"]
 
     # ----------------- Type conversions -----------------
+    @profiled()
     def convert_data_types(self, data: pd.DataFrame, conversions: Dict[str, str]) -> pd.DataFrame:
-        df = data.copy()
+        # Only converted columns are replaced on the shallow copy; DataFrame.astype would copy every column
+        df = data.copy(deep=False)
         for col, dtype in conversions.items():
             try:
                 if dtype == 'datetime':
@@ -174,6 +1789,120 @@ class DataProcessor:
                 print(f"Error converting {col} to {dtype}: {e}")
         return df
 
+    # ----------------- Lazy queries -----------------
+    def scan(self, file_path: str, chunk_size: Optional[int] = None) -> LazyFrame:
+        return LazyFrame(self, file_path, chunk_size)
+
+    # ----------------- Pipelines -----------------
+    @profiled()
+    def run_pipeline(self, spec: Dict[str, Any]) -> Dict[str, Any]:
+        # Runs spec["steps"] in order over one read of spec["input"]. write and stats steps
+        # are taps that leave the data unchanged; "as" names a step's output and "from"
+        # restarts from a named one. With spec["chunk_size"] the data stays a chunk stream
+        # until a step needs the whole frame (pivot, clean after a tap, or a "from" target).
+        steps = spec.get("steps", [])
+        for step in steps:
+            if step.get("op") not in _PIPELINE_STEPS:
+                raise ValueError(f"Unknown pipeline step: {step.get('op')}")
+        chunk_size = spec.get("chunk_size")
+        referenced = {step["from"] for step in steps if "from" in step}
+        results: Dict[str, Any] = {"outputs": []}
+        named: Dict[str, Any] = {}
+        taps: List[tuple] = []
+
+        # The leading run of lazily-plannable steps becomes one LazyFrame, so its filters
+        # and projections are pushed into the read
+        frame = self.scan(spec["input"], chunk_size)
+        if spec.get("columns"):
+            frame = frame.select(spec["columns"])
+        i = 0
+        while i < len(steps):
+            lazy = self._lazy_step(frame, steps[i])
+            if lazy is None:
+                break
+            frame = lazy
+            i += 1
+            if "as" in steps[i - 1]:
+                break
+        data = frame._execute()
+        if i and "as" in steps[i - 1]:
+            data = named[steps[i - 1]["as"]] = self._collect(data) if steps[i - 1]["as"] in referenced else data
+
+        for step in steps[i:]:
+            op = step["op"]
+            args = {k: v for k, v in step.items() if k not in ("op", "as", "from")}
+            if "from" in step:
+                self._drain(data)
+                data = named[step["from"]]
+            streaming = not isinstance(data, pd.DataFrame)
+            if op in ("write", "stats"):
+                if op == "write":
+                    results["outputs"].append(args["file_path"])
+                    ext = args.get("format_type") or data_extension(args["file_path"])
+                    if streaming and ext in ('xls', 'xlsx'):
+                        data = self._collect(data)
+                        streaming = False
+                key = step.get("as", "stats") if op == "stats" else None
+                consume = (lambda chunks, method=getattr(self, _PIPELINE_STEPS[op]), args=args:
+                           method(chunks, **args))
+                if streaming:
+                    tap = _StreamTap(consume)
+                    data = tap.wrap(data)
+                    taps.append((key, tap))
+                elif key:
+                    results[key] = consume(data)
+                else:
+                    consume(data)
+                continue
+            if streaming and op in ("filter", "convert_data_types"):
+                method = getattr(self, _PIPELINE_STEPS[op])
+                data = (lambda chunks, method, args: (method(c, **args) for c in chunks))(data, method, args)
+            elif streaming and op in ("aggregate", "sort", "sample"):
+                data = getattr(self, _PIPELINE_STEPS[op])(data, **args)
+            else:
+                data = getattr(self, _PIPELINE_STEPS[op])(self._collect(data), **args)
+            if "as" in step:
+                if step["as"] in referenced and not isinstance(data, pd.DataFrame):
+                    data = self._collect(data)
+                named[step["as"]] = data
+
+        self._drain(data)
+        for key, tap in taps:
+            value = tap.join()
+            if key:
+                results[key] = value
+        results.update({name: value for name, value in named.items() if isinstance(value, pd.DataFrame)})
+        return results
+
+    def _lazy_step(self, frame: LazyFrame, step: Dict[str, Any]) -> Optional[LazyFrame]:
+        op = step["op"]
+        args = {k: v for k, v in step.items() if k not in ("op", "as")}
+        if "from" in args:
+            return None
+        if op == "filter" and set(args) == {"conditions"}:
+            return frame.filter(args["conditions"])
+        if op == "clean" and set(args) <= {"operations"}:
+            return frame.clean(args.get("operations"))
+        if op == "convert_data_types" and set(args) == {"conversions"}:
+            return frame.convert(args["conversions"])
+        if op == "aggregate" and set(args) == {"group_by", "aggregations"}:
+            return frame.groupby(args["group_by"]).agg(args["aggregations"])
+        if op == "sort" and set(args) <= {"columns", "ascending"}:
+            return frame.sort(args["columns"], args.get("ascending", True))
+        return None
+
+    def _collect(self, data: Union[pd.DataFrame, Iterable[pd.DataFrame]]) -> pd.DataFrame:
+        if isinstance(data, pd.DataFrame):
+            return data
+        chunks = list(self._iter_reader(data))
+        return pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame()
+
+    def _drain(self, data: Any) -> None:
+        # Pulls a stream to the end so every tap on it sees all chunks
+        if not isinstance(data, pd.DataFrame):
+            for _ in data:
+                pass
+
     # ----------------- Sample data -----------------
     def create_sample_data(self) -> pd.DataFrame:
         df = pd.DataFrame({
@@ -188,16 +1917,207 @@ class DataProcessor:
         return df
 
 
+# Lazy query plan built by DataProcessor.scan(); nothing is read until collect() or sink()
+class LazyFrame:
+    def __init__(self, processor: DataProcessor, file_path: str, chunk_size: Optional[int] = None,
+                 ops: Optional[List[tuple]] = None):
+        self.processor = processor
+        self.file_path = file_path
+        self.chunk_size = chunk_size
+        self.ops = ops or []
+
+    def _with(self, *op) -> LazyFrame:
+        return LazyFrame(self.processor, self.file_path, self.chunk_size, self.ops + [op])
+
+    def filter(self, conditions: List[Dict[str, Any]]) -> LazyFrame:
+        return self._with("filter", list(conditions))
+
+    def select(self, columns: List[str]) -> LazyFrame:
+        return self._with("select", list(columns))
+
+    def clean(self, operations: Optional[Dict[str, Any]] = None) -> LazyFrame:
+        return self._with("clean", operations)
+
+    def convert(self, conversions: Dict[str, str]) -> LazyFrame:
+        return self._with("convert", dict(conversions))
+
+    def groupby(self, group_by: Union[str, List[str]]) -> _LazyGroupBy:
+        return _LazyGroupBy(self, group_by)
+
+    def sort(self, columns: Union[str, List[str]], ascending: Union[bool, List[bool]] = True) -> LazyFrame:
+        return self._with("sort", columns, ascending)
+
+    # ---------- Planning ----------
+    def _optimize(self) -> tuple:
+        # Leading filters/selects become the reader's conditions and projection
+        ops = list(self.ops)
+        conditions: List[Dict[str, Any]] = []
+        columns: Optional[List[str]] = None
+        while ops and ops[0][0] in ("filter", "select"):
+            kind, arg = ops.pop(0)
+            if kind == "filter":
+                conditions.extend(arg)
+            else:
+                columns = arg
+
+        # Columns the rest of the plan reads; a de-duplicating clean needs whole rows
+        needed: Optional[List[str]] = None
+        for op in reversed(ops):
+            kind = op[0]
+            if kind == "select":
+                needed = list(op[1])
+            elif kind == "agg":
+                keys = [op[1]] if isinstance(op[1], str) else list(op[1])
+                needed = keys + list(op[2])
+            elif kind == "filter" and needed is not None:
+                needed += [c["column"] for c in op[1]]
+            elif kind == "sort" and needed is not None:
+                needed += [op[1]] if isinstance(op[1], str) else list(op[1])
+            elif kind == "clean" and (op[1] is None or op[1].get("drop_duplicates")):
+                needed = None
+        if needed is not None:
+            needed = list(dict.fromkeys(needed))
+            columns = [c for c in columns if c in needed] if columns else needed
+
+        # Consecutive row-local operators are fused into one per-chunk stage
+        stages: List[tuple] = []
+        for op in ops:
+            if op[0] in ("filter", "select", "convert"):
+                if stages and stages[-1][0] == "rows":
+                    stages[-1][1].append(op)
+                else:
+                    stages.append(("rows", [op]))
+            else:
+                stages.append(op)
+        return columns, conditions, stages
+
+    def explain(self) -> str:
+        columns, conditions, stages = self._optimize()
+        lines = [f"Scan {self.file_path} columns={columns or '*'} conditions={conditions or []}"
+                 f"{f' chunk_size={self.chunk_size}' if self.chunk_size else ''}"]
+        for stage in stages:
+            if stage[0] == "rows":
+                lines.append("  Rows[" + ", ".join(op[0] for op in stage[1]) + "]")
+            else:
+                lines.append(f"  {stage[0].capitalize()}{list(stage[1:])}")
+        return "\n".join(lines)
+
+    # ---------- Execution ----------
+    def _row_stage(self, ops: List[tuple]) -> Callable[[pd.DataFrame], pd.DataFrame]:
+        processor = self.processor
+
+        def apply(df: pd.DataFrame) -> pd.DataFrame:
+            for kind, arg in ops:
+                if kind == "filter":
+                    df = processor.filter_data(df, arg)
+                elif kind == "select":
+                    df = df[arg]
+                else:
+                    df = processor.convert_data_types(df, {c: t for c, t in arg.items() if c in df.columns})
+            return df
+
+        return apply
+
+    def _execute(self) -> Union[pd.DataFrame, Iterator[pd.DataFrame]]:
+        processor = self.processor
+        columns, conditions, stages = self._optimize()
+        read = dict(columns=columns, conditions=conditions or None)
+        if not self.chunk_size:
+            frame = processor.read_data(self.file_path, **read)
+            for stage in stages:
+                kind = stage[0]
+                if kind == "rows":
+                    frame = self._row_stage(stage[1])(frame)
+                elif kind == "clean":
+                    frame = processor.clean_data(frame, stage[1])
+                elif kind == "agg":
+                    frame = processor.aggregate_data(frame, stage[1], stage[2])
+                elif kind == "sort":
+                    frame = processor.sort_data(frame, stage[1], stage[2])
+            return frame
+
+        # Streaming: `source` re-creates the chunk stream, so two-pass stages can re-read it
+        source: Optional[Callable[[], Iterable[pd.DataFrame]]] = \
+            lambda: processor.iter_chunks(self.file_path, self.chunk_size, **read)
+        stream: Optional[Iterator[pd.DataFrame]] = None
+        frame: Optional[pd.DataFrame] = None
+        for stage in stages:
+            kind = stage[0]
+            if frame is not None:
+                # Past a group-by the data is small; finish in memory
+                if kind == "rows":
+                    frame = self._row_stage(stage[1])(frame)
+                elif kind == "clean":
+                    frame = processor.clean_data(frame, stage[1])
+                elif kind == "agg":
+                    frame = processor.aggregate_data(frame, stage[1], stage[2])
+                else:
+                    frame = processor.sort_data(frame, stage[1], stage[2])
+                continue
+            if kind == "rows":
+                fn = self._row_stage(stage[1])
+                if source is not None:
+                    source = (lambda prev, fn: lambda: (fn(c) for c in processor._iter_reader(prev())))(source, fn)
+                else:
+                    stream = (fn(c) for c in stream)
+            elif kind == "clean":
+                if source is None:
+                    # A single-use stream (after a sort) cannot be read twice
+                    frame = processor.clean_data(pd.concat(list(stream), ignore_index=True), stage[1])
+                    continue
+                stream, _ = processor.clean_stream(source, stage[1])
+                source = None
+            elif kind == "agg":
+                frame = processor.aggregate_data(source() if source is not None else stream, stage[1], stage[2])
+            else:
+                stream = processor.sort_data(source() if source is not None else stream, stage[1], stage[2])
+                source = None
+        if frame is not None:
+            return frame
+        return stream if source is None else processor._iter_reader(source())
+
+    def collect(self) -> pd.DataFrame:
+        result = self._execute()
+        if isinstance(result, pd.DataFrame):
+            return result
+        chunks = list(result)
+        return pd.concat(chunks) if chunks else pd.DataFrame()
+
+    def sink(self, file_path: str, format_type: Optional[str] = None) -> None:
+        self.processor.write_data(self._execute(), file_path, format_type)
+
+
+class _LazyGroupBy:
+    def __init__(self, frame: LazyFrame, group_by: Union[str, List[str]]):
+        self.frame = frame
+        self.group_by = group_by
+
+    def agg(self, aggregations: Dict[str, Union[str, List[str]]]) -> LazyFrame:
+        return self.frame._with("agg", self.group_by, dict(aggregations))
+
+
 # ----------------- CLI -----------------
 if __name__ == "__main__":
-    processor = DataProcessor(verbose=True)
+    # Record/reuse CSV dtypes in a schema sidecar next to the data
+    processor = DataProcessor(verbose=True, schema_cache="--schema-cache" in sys.argv)
 
     if len(sys.argv) < 2:
-        print("Usage: python data_processor.py <command> [args] [--preview n]")
+        print("Usage: python data_processor.py <command> [args] [--preview n] [--chunk-size n] [--columns a,b] [--approx] [--workers n] [--compact] [--stratify col] [--trace out.json] [--cache] [--cache-dir dir] [--checkpoint file] [--schema-cache]")
+        print("  clean <in> <out>: with --chunk-size, two streaming passes; duplicate removal still keeps")
+        print("  an 8-byte hash per distinct row in memory")
+        print("  sample <file> <n>: DataFrame.sample(n, random_state=42) on the whole file; with --chunk-size, a")
+        print("  streaming reservoir sample (same seed, different rows) that never loads the file")
         sys.exit(1)
 
     cmd = sys.argv[1]
     preview_rows = None
+    chunk_size = None
+    columns = None
+    workers = None
+    compact = "--compact" in sys.argv
+    trace_path = None
+    cache = None
+    checkpoint = None
 
     # Check for preview flag
     if "--preview" in sys.argv:
@@ -205,6 +2125,55 @@ if __name__ == "__main__":
         if len(sys.argv) > idx + 1:
             preview_rows = int(sys.argv[idx + 1])
 
+    # Stream the input in chunks instead of loading it whole
+    if "--chunk-size" in sys.argv:
+        idx = sys.argv.index("--chunk-size")
+        if len(sys.argv) > idx + 1:
+            chunk_size = int(sys.argv[idx + 1])
+
+    # Read only these columns (comma separated)
+    if "--columns" in sys.argv:
+        idx = sys.argv.index("--columns")
+        if len(sys.argv) > idx + 1:
+            columns = sys.argv[idx + 1].split(",")
+
+    # Process pool size for approximate statistics
+    if "--workers" in sys.argv:
+        idx = sys.argv.index("--workers")
+        if len(sys.argv) > idx + 1:
+            workers = int(sys.argv[idx + 1])
+
+    # Record a per-operation trace of this command (Chrome trace-event JSON)
+    profiler = None
+    if "--trace" in sys.argv:
+        idx = sys.argv.index("--trace")
+        if len(sys.argv) > idx + 1:
+            trace_path = sys.argv[idx + 1]
+            profiler = Profiler().start()
+
+    # Append-aware info/stats: resume from this checkpoint and read only the new tail
+    if "--checkpoint" in sys.argv:
+        idx = sys.argv.index("--checkpoint")
+        if len(sys.argv) > idx + 1:
+            checkpoint = sys.argv[idx + 1]
+
+    # Opt-in: cache info/stats/sample results keyed on the file's size/mtime/inode, under
+    # --cache-dir or (with --cache) $PYEVERYDAY_CACHE_DIR / ~/.cache/pyeveryday
+    if "--cache-dir" in sys.argv:
+        idx = sys.argv.index("--cache-dir")
+        if len(sys.argv) > idx + 1:
+            cache = ResultCache(sys.argv[idx + 1])
+    elif "--cache" in sys.argv:
+        cache = ResultCache()
+    if "--no-cache" in sys.argv:
+        cache = None
+
+    def cached(file_path: str, operation: str, params: Dict[str, Any], compute: Callable[[], Any]) -> Any:
+        # Previews need the decoded frame, so they always recompute
+        if cache is None or preview_rows:
+            return compute()
+        return cache.get_or_compute(file_path, operation, dict(params, schema_cache=processor.schema_cache), compute)
+
     def maybe_preview(df: pd.DataFrame):
         if preview_rows:
             print(f"\nPreviewing first {preview_rows} rows:")
@@ -212,52 +2181,111 @@ if __name__ == "__main__":
 
     if cmd == "info":
         file_path = sys.argv[2]
-        df = processor.read_data(file_path)
-        maybe_preview(df)
-        info = processor.get_data_info(df)
+
+        def compute_info() -> Dict[str, Any]:
+            if checkpoint:
+                return processor.get_data_info(file_path, checkpoint=checkpoint, chunk_size=chunk_size or 100_000)
+            if chunk_size:
+                return processor.get_data_info(processor.read_data(file_path, chunk_size=chunk_size, columns=columns))
+            df = processor.read_data(file_path, columns=columns, compact=compact)
+            maybe_preview(df)
+            return processor.get_data_info(df)
+
+        info = cached(file_path, "info", {"chunk_size": chunk_size, "columns": columns, "compact": compact,
+                                          "checkpoint": checkpoint}, compute_info)
         print(f"\nDataset Information for {file_path}")
         print("="*40)
         print(f"Rows: {info['rows']}, Columns: {info['columns']}")
         print(f"Memory usage: {info['memory_usage']:,} bytes")
+        if "memory_before_compaction" in info:
+            print(f"Memory before compaction: {info['memory_before_compaction']:,} bytes")
         print(f"Duplicates: {info['duplicates']}")
         print("\nNull counts per column:")
         for k, v in info['null_counts'].items():
             print(f" {k}: {v}")
+        if "distinct_counts" in info:
+            print(f"\nApproximate distinct values per column (±{info['distinct_error']:.1%}):")
+            for k, v in info['distinct_counts'].items():
+                print(f" {k}: {v:,}")
 
     elif cmd == "clean":
         input_file = sys.argv[2]
         output_file = sys.argv[3]
-        df = processor.read_data(input_file)
-        maybe_preview(df)
-        cleaned = processor.clean_data(df)
-        processor.write_data(cleaned, output_file)
+        if chunk_size:
+            processor.clean_file(input_file, output_file, chunk_size=chunk_size)
+        else:
+            df = processor.read_data(input_file, columns=columns)
+            maybe_preview(df)
+            cleaned = processor.clean_data(df)
+            processor.write_data(cleaned, output_file)
 
     elif cmd == "convert":
         input_file = sys.argv[2]
         output_file = sys.argv[3]
         fmt = sys.argv[4]
-        df = processor.read_data(input_file)
+        df = processor.read_data(input_file, columns=columns)
         maybe_preview(df)
         processor.write_data(df, output_file, fmt)
 
     elif cmd == "stats":
         file_path = sys.argv[2]
-        df = processor.read_data(file_path)
-        maybe_preview(df)
-        stats = processor.get_statistics(df)
+        approximate = "--approx" in sys.argv
+
+        def compute_stats() -> Dict[str, Any]:
+            if checkpoint:
+                return processor.get_statistics(file_path, approximate=True, checkpoint=checkpoint,
+                                                chunk_size=chunk_size or 100_000)
+            if chunk_size:
+                return processor.get_statistics(processor.read_data(file_path, chunk_size=chunk_size, columns=columns),
+                                                approximate=approximate, workers=workers)
+            df = processor.read_data(file_path, columns=columns, compact=compact)
+            maybe_preview(df)
+            return processor.get_statistics(df, approximate=approximate, workers=workers)
+
+        stats = cached(file_path, "stats", {"chunk_size": chunk_size, "columns": columns, "compact": compact,
+                                            "approximate": approximate or bool(checkpoint), "workers": workers,
+                                            "checkpoint": checkpoint}, compute_stats)
         print(stats)
 
     elif cmd == "sample":
         file_path = sys.argv[2]
         n = int(sys.argv[3])
-        df = processor.read_data(file_path)
-        maybe_preview(df)
-        sample = processor.sample_data(df, n=n)
+        stratify = sys.argv[sys.argv.index("--stratify") + 1] if "--stratify" in sys.argv else None
+
+        def compute_sample() -> pd.DataFrame:
+            if chunk_size:
+                # Reservoir-sample the file chunk by chunk instead of loading it. Same seed, but
+                # not the same rows as DataFrame.sample on the whole file.
+                reader = processor.read_data(file_path, chunk_size=chunk_size, columns=columns)
+                return processor.sample_data(reader, n=n, stratify=stratify)
+            df = processor.read_data(file_path, columns=columns, compact=compact)
+            maybe_preview(df)
+            return processor.sample_data(df, n=n, stratify=stratify)
+
+        sample = cached(file_path, "sample", {"n": n, "chunk_size": chunk_size, "columns": columns,
+                                              "stratify": stratify}, compute_sample)
         print(sample)
 
+    elif cmd == "pipeline":
+        with open(sys.argv[2], 'r', encoding='utf-8') as f:
+            spec = json.load(f)
+        if chunk_size:
+            spec.setdefault("chunk_size", chunk_size)
+        results = processor.run_pipeline(spec)
+        for path in results.pop("outputs"):
+            print(f"Wrote {path}")
+        for name, value in results.items():
+            print(f"\n{name}:")
+            print(value)
+
     elif cmd == "create_sample":
         df = processor.create_sample_data()
         maybe_preview(df)
 
     else:
         print(f"Unknown command: {cmd}")
+
+    if profiler is not None:
+        profiler.stop()
+        profiler.export_chrome_trace(trace_path)
+        print(f"Trace written to {trace_path}")
@@ -0,0 +1,301 @@
+from __future__ import annotations
+import functools
+import inspect
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections.abc import Iterator as IteratorABC
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+_state = threading.local()
+
+
+def _profilers() -> List[Profiler]:
+    if not hasattr(_state, "profilers"):
+        _state.profilers = []
+        _state.spans = []
+    return _state.profilers
+
+
+def _spans() -> List[_Span]:
+    _profilers()
+    return _state.spans
+
+
+# fn wrapped to run with the calling thread's active profilers, so profiled calls made in a
+# thread it is handed to (e.g. a pipeline tap) are recorded too
+def with_profilers(fn: Callable) -> Callable:
+    profilers = list(_profilers())
+
+    @functools.wraps(fn)
+    def run(*args, **kwargs):
+        own = _profilers()
+        added = [p for p in profilers if p not in own]
+        own.extend(added)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            for p in added:
+                if p in own:
+                    own.remove(p)
+
+    return run
+
+
+def _rss_peak() -> Optional[int]:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return int(peak if sys.platform == 'darwin' else peak * 1024)
+
+
+def _rows(value: Any) -> Optional[int]:
+    # DataFrames and lists of records have a row count; lazy iterators do not
+    if hasattr(value, "shape") and len(getattr(value, "shape")) >= 1:
+        return int(value.shape[0])
+    if isinstance(value, list):
+        return len(value)
+    return None
+
+
+def _size(path: Any) -> Optional[int]:
+    if isinstance(path, str) and os.path.isfile(path):
+        return os.path.getsize(path)
+    return None
+
+
+class _Span:
+    def __init__(self, name: str, profilers: List[Profiler], args: Optional[Dict[str, Any]] = None):
+        self.name = name
+        self.profilers = profilers
+        self.fields: Dict[str, Any] = {"rows_in": None, "rows_out": None, "bytes_read": None, "bytes_written": None}
+        self.args = args or {}
+        self.peak = 0
+
+    def __enter__(self) -> _Span:
+        spans = _spans()
+        self.depth = len(spans)
+        self.tracing = tracemalloc.is_tracing()
+        if self.tracing:
+            # Fold the running peak into the open spans before resetting it for this one
+            peak = tracemalloc.get_traced_memory()[1]
+            for span in spans:
+                span.peak = max(span.peak, peak)
+            tracemalloc.reset_peak()
+            self.mem_start = tracemalloc.get_traced_memory()[0]
+        else:
+            self.mem_start = _rss_peak()
+        spans.append(self)
+        self.wall_start = time.perf_counter()
+        self.cpu_start = time.process_time()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        wall = time.perf_counter() - self.wall_start
+        cpu = time.process_time() - self.cpu_start
+        if self in _spans():
+            _spans().remove(self)
+        if self.tracing and tracemalloc.is_tracing():
+            self.peak = max(self.peak, tracemalloc.get_traced_memory()[1])
+            for span in _spans():
+                span.peak = max(span.peak, self.peak)
+            memory = self.peak - self.mem_start
+        else:
+            end = _rss_peak()
+            memory = end - self.mem_start if end is not None and self.mem_start is not None else None
+        record = {
+            "name": self.name,
+            "start": self.wall_start,
+            "wall_s": wall,
+            "cpu_s": cpu,
+            **self.fields,
+            "peak_memory_delta": memory,
+            "depth": self.depth,
+            "error": exc_type.__name__ if exc_type else None,
+            "args": self.args,
+        }
+        for profiler in self.profilers:
+            profiler.add(record)
+
+
+# Collects per-operation records from profiled DataProcessor/DataConverter calls made
+# while it is active: wall and CPU time, rows in/out, bytes read/written and peak memory
+# growth (traced allocations with trace_memory=True, otherwise the process max RSS).
+class Profiler:
+    def __init__(self, callback: Optional[Callable[[Dict[str, Any]], None]] = None, trace_memory: bool = False):
+        self.callback = callback
+        self.trace_memory = trace_memory
+        self.records: List[Dict[str, Any]] = []
+        self._origin = time.perf_counter()
+        self._started_tracing = False
+
+    def start(self) -> Profiler:
+        self._origin = time.perf_counter()
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        _profilers().append(self)
+        return self
+
+    def stop(self) -> None:
+        profilers = _profilers()
+        if self in profilers:
+            profilers.remove(self)
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def __enter__(self) -> Profiler:
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.stop()
+
+    def add(self, record: Dict[str, Any]) -> None:
+        record = dict(record, start=record["start"] - self._origin)
+        self.records.append(record)
+        if self.callback:
+            self.callback(record)
+
+    @contextmanager
+    def span(self, name: str, **args) -> Iterator[Dict[str, Any]]:
+        # Times an arbitrary block; set rows_in/rows_out/bytes_* on the yielded dict
+        with _Span(name, list(_profilers()) or [self], args) as span:
+            yield span.fields
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        out: Dict[str, Dict[str, float]] = {}
+        for r in self.records:
+            s = out.setdefault(r["name"], {"calls": 0, "wall_s": 0.0, "cpu_s": 0.0})
+            s["calls"] += 1
+            s["wall_s"] += r["wall_s"]
+            s["cpu_s"] += r["cpu_s"]
+        return out
+
+    def export_json(self, file_path: str) -> None:
+        with open(file_path, 'w', encoding='utf-8') as f:
+            json.dump({"records": self.records, "summary": self.summary()}, f, indent=2, default=str)
+
+    def export_chrome_trace(self, file_path: str) -> None:
+        # Trace Event Format, viewable in chrome://tracing or Perfetto
+        pid, tid = os.getpid(), threading.get_ident()
+        events = []
+        for r in self.records:
+            args = {k: v for k, v in r.items() if k not in ("name", "start", "wall_s", "args") and v is not None}
+            args.update(r["args"])
+            events.append({"name": r["name"], "cat": r["name"].split(".")[0], "ph": "X", "pid": pid, "tid": tid,
+                           "ts": r["start"] * 1e6, "dur": r["wall_s"] * 1e6, "args": args})
+        with open(file_path, 'w', encoding='utf-8') as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f, default=str)
+
+
+# An iterator result of a profiled call: the call's span stays open until the iterator is
+# exhausted or closed, and rows_out counts DataFrame rows (or items) across chunks. The span is
+# back on the span stack while a chunk is produced, so calls made then nest under it.
+class _ProfiledIterator:
+    def __init__(self, iterator: Iterator[Any], span: _Span):
+        self._iterator = iterator
+        self._span = span
+        self._rows = 0
+        self._open = True
+
+    def __iter__(self) -> _ProfiledIterator:
+        return self
+
+    def __next__(self) -> Any:
+        if not self._open:
+            return next(self._iterator)
+        spans = _spans()
+        spans.append(self._span)
+        try:
+            item = next(self._iterator)
+        except StopIteration:
+            self._finish(None)
+            raise
+        except BaseException as e:
+            self._finish(type(e))
+            raise
+        finally:
+            if self._span in spans:
+                spans.remove(self._span)
+        rows = _rows(item)
+        self._rows += 1 if rows is None else rows
+        return item
+
+    def _finish(self, exc_type: Any) -> None:
+        if self._open:
+            self._open = False
+            self._span.fields["rows_out"] = self._rows
+            self._span.__exit__(exc_type, None, None)
+
+    def close(self) -> None:
+        # Stopping early still records the span, with the rows produced so far
+        try:
+            if hasattr(self._iterator, "close"):
+                self._iterator.close()
+        finally:
+            self._finish(None)
+
+    def __enter__(self) -> _ProfiledIterator:
+        if hasattr(self._iterator, "__enter__"):
+            self._iterator.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        try:
+            if hasattr(self._iterator, "__exit__"):
+                self._iterator.__exit__(exc_type, exc, tb)
+        finally:
+            self._finish(exc_type)
+
+    def __getattr__(self, name: str) -> Any:
+        # Anything else (e.g. a TextFileReader's get_chunk) goes to the wrapped iterator
+        if "_iterator" not in self.__dict__:
+            raise AttributeError(name)
+        return getattr(self._iterator, name)
+
+
+# Records a method call in every active Profiler. reads/writes name the path arguments
+# whose file sizes count as bytes read/written; rows names the argument counted as rows in.
+def profiled(reads: Optional[str] = None, writes: Optional[str] = None, rows: str = "data") -> Callable:
+    def decorator(fn: Callable) -> Callable:
+        sig = inspect.signature(fn)
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            profilers = _profilers()
+            if not profilers:
+                return fn(*args, **kwargs)
+            bound = sig.bind_partial(*args, **kwargs).arguments
+            name = f"{type(args[0]).__name__}.{fn.__name__}" if args else fn.__name__
+            span = _Span(name, list(profilers)).__enter__()
+            span.fields["rows_in"] = _rows(bound.get(rows))
+            if reads:
+                span.fields["bytes_read"] = _size(bound.get(reads))
+            try:
+                result = fn(*args, **kwargs)
+            except BaseException as e:
+                span.__exit__(type(e), e, None)
+                raise
+            if isinstance(result, IteratorABC):
+                # Generators and chunk readers do their work as they are consumed
+                _spans().remove(span)
+                return _ProfiledIterator(result, span)
+            span.fields["rows_out"] = _rows(result)
+            if writes:
+                span.fields["bytes_written"] = _size(bound.get(writes))
+            span.__exit__(None, None, None)
+            return result
+
+        return wrapper
+
+    return decorator
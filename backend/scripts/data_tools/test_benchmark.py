@@ -0,0 +1,48 @@
+import multiprocessing
+import os
+
+import pandas as pd
+import pytest
+
+import benchmark
+
+
+# ---------- Synthetic data ----------
+def test_generate_dataset_in_chunks_is_reproducible(tmp_path):
+    first = benchmark.generate_dataset(str(tmp_path / "a.csv"), 2500, seed=7, chunk_rows=1000)
+    benchmark.generate_dataset(str(tmp_path / "b.csv"), 2500, seed=7, chunk_rows=1000)
+
+    df = pd.read_csv(first)
+    assert len(df) == 2500 and df["id"].tolist() == list(range(2500))
+    assert df["city"].isna().any() and not df["name"].isna().any()
+    assert (tmp_path / "a.csv").read_text() == (tmp_path / "b.csv").read_text()
+
+
+# ---------- Runner ----------
+def test_cases_agree_between_in_memory_and_streaming(tmp_path):
+    path = benchmark.generate_dataset(str(tmp_path / "data.csv"), 500)
+
+    for name in ("read", "clean", "filter", "aggregate"):
+        assert benchmark.CASES[name](path, str(tmp_path), False) == 500
+        assert benchmark.CASES[name](path, str(tmp_path), True) == 500
+    assert benchmark.CASES["convert"](path, str(tmp_path), True) is None
+
+
+@pytest.mark.skipif(multiprocessing.get_start_method() != "fork", reason="the patched case must reach the child")
+def test_run_case_reports_a_child_that_dies(tmp_path, monkeypatch):
+    monkeypatch.setitem(benchmark.CASES, "crash", lambda path, work, stream: os._exit(3))
+
+    result = benchmark.run_case("crash", str(tmp_path / "missing.csv"), str(tmp_path), False)
+
+    assert result == {"status": "error", "error": "exit code 3"}
+
+
+def test_compare_flags_slower_and_larger_cases():
+    def results(wall, rss, status="ok"):
+        return {"results": [{"case": "read", "size": 1000, "stream": False, "status": status,
+                             "wall_s": wall, "peak_rss_bytes": rss}]}
+
+    assert benchmark.compare(results(1.1, 100), results(1.0, 100)) == []
+    flagged = benchmark.compare(results(2.0, 200), results(1.0, 100))
+    assert len(flagged) == 2 and "wall_s" in flagged[0] and "+100%" in flagged[1]
+    assert benchmark.compare(results(2.0, 200), results(1.0, 100, status="error")) == []
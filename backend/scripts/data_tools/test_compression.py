@@ -0,0 +1,42 @@
+import gzip
+
+import pytest
+
+from compression import data_extension, open_file, pandas_compression, resolve, split_compression
+
+
+def test_split_compression_and_data_extension():
+    assert split_compression("dir/data.csv.gz") == ("dir/data.csv", "gzip")
+    assert split_compression("data.csv") == ("data.csv", None)
+    assert data_extension("data.JSONL.zst") == "jsonl"
+
+
+def test_resolve_sniffs_magic_bytes_on_read(tmp_path):
+    path = tmp_path / "data.csv"
+    path.write_bytes(gzip.compress(b"a\n1\n"))
+
+    assert resolve(str(path)) == {"method": "gzip"}
+    assert resolve(str(path), write=True) is None
+    assert resolve("out.csv.zst", write=True) == {"method": "zstd", "level": 3, "threads": -1}
+    with pytest.raises(ValueError, match="lz4"):
+        resolve("out.csv", "lz4")
+
+
+def test_pandas_compression_levels():
+    assert pandas_compression("out.csv.gz", {"method": "gzip", "level": 1}, write=True) == \
+        {"method": "gzip", "compresslevel": 1}
+    assert pandas_compression("out.csv.xz", {"method": "xz", "level": 6}, write=True) == {"method": "xz", "preset": 6}
+    assert pandas_compression("in.csv.bz2") == "bz2"
+
+
+@pytest.mark.parametrize("suffix", ["gz", "bz2", "xz", "zst"])
+def test_open_file_round_trip(tmp_path, suffix):
+    if suffix == "zst":
+        pytest.importorskip("zstandard")
+    path = str(tmp_path / f"data.txt.{suffix}")
+
+    with open_file(path, "w") as f:
+        f.write("héllo\nwörld\n")
+
+    with open_file(path, "r") as f:
+        assert list(f) == ["héllo\n", "wörld\n"]
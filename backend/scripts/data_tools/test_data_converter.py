@@ -0,0 +1,324 @@
+import json
+import os
+import xml.etree.ElementTree as ET
+from xml.dom import minidom
+
+import pandas as pd
+import pytest
+
+from data_converter import DataConverter
+
+
+@pytest.fixture
+def converter():
+    return DataConverter()
+
+
+# ---------- compare_data ----------
+@pytest.mark.parametrize("presorted", [False, True])
+def test_compare_by_keys_with_null_keys(tmp_path, converter, presorted):
+    left = pd.DataFrame({"id": [1, 2, 3, None, None], "v": ["a", "b", "c", "x", "only-left"]})
+    right = pd.DataFrame({"id": [1, 2, 4, None], "v": ["a", "B", "d", "y"]})
+    left.to_csv(tmp_path / "left.csv", index=False)
+    right.to_csv(tmp_path / "right.csv", index=False)
+
+    report = converter.compare_data(str(tmp_path / "left.csv"), str(tmp_path / "right.csv"),
+                                    keys="id", chunk_size=2, presorted=presorted)
+
+    assert not report["equal"]
+    assert report["removed"]["v"].tolist() == ["c", "only-left"]
+    assert report["added"]["v"].tolist() == ["d"]
+    assert report["changed_rows"] == 2
+    assert sorted(report["changed_cells"]["new"]) == ["B", "y"]
+
+
+def test_compare_by_keys_null_keys_on_one_side_only(tmp_path, converter):
+    pd.DataFrame({"id": [None, None], "v": [1, 2]}).to_csv(tmp_path / "left.csv", index=False)
+    pd.DataFrame({"id": [1], "v": [1]}).to_csv(tmp_path / "right.csv", index=False)
+
+    report = converter.compare_data(str(tmp_path / "left.csv"), str(tmp_path / "right.csv"), keys="id")
+
+    assert len(report["removed"]) == 2
+    assert len(report["added"]) == 1
+    assert report["changed_rows"] == 0
+
+
+# ---------- Flatten / Unflatten ----------
+def test_flatten_json_lists_match_json_dumps(converter):
+    record = {"id": 1, "tags": ["é", {"k": 1.5}, None], "meta": {"empty": [], "deep": {"x": [1, 2]}}}
+
+    flat = converter.flatten_json(record)
+
+    assert flat == {"id": 1, "tags": json.dumps(record["tags"], ensure_ascii=False),
+                    "meta.empty": "[]", "meta.deep.x": "[1, 2]"}
+    assert converter.unflatten_json(flat, lists="json") == record
+
+
+@pytest.mark.parametrize("lists", ["json", "index"])
+def test_flatten_round_trip_with_deep_nesting(converter, lists):
+    record = leaf = {}
+    for _ in range(500):
+        leaf["n"] = leaf = {}
+    leaf.update({"v": [1, 2, 3], "s": "x"})
+
+    flat = converter.flatten_json([record, {"other": True}], lists=lists)
+
+    assert len(flat[0]) == (1 if lists == "json" else 3) + 1
+    assert converter.unflatten_json(flat, lists=lists) == [record, {"other": True}]
+
+
+def test_flatten_explode_lists(converter):
+    rows = converter.flatten_json([{"id": 1, "items": [{"a": 1}, {"a": 2}]}, {"id": 2, "items": []}],
+                                  lists="explode")
+
+    assert [row["id"] for row in rows] == [1, 1, 2]
+    assert [row.get("items.a") for row in rows] == [1, 2, None]
+
+
+# ---------- XML ----------
+def _minidom_xml(rows):
+    root = ET.Element("root")
+    for row in rows:
+        item = ET.SubElement(root, "item")
+        for k, v in row.items():
+            if k.startswith("@"):
+                item.set(k[1:], str(v))
+            else:
+                ET.SubElement(item, k).text = "" if v is None else str(v)
+    return minidom.parseString(ET.tostring(root, encoding="utf-8")).toprettyxml(indent=" ")
+
+
+def test_write_xml_matches_minidom_output(tmp_path, converter):
+    rows = [{"@id": '1"', "name": "a & b", "note": None}, {"@id": "2", "name": "<c>", "note": "x"}]
+    path = tmp_path / "out.xml"
+
+    assert converter.write_xml(rows, str(path))
+
+    assert path.read_text(encoding="utf-8") == _minidom_xml(rows)
+    assert converter.read_xml(str(path)) == [{"name": "a & b", "note": None, "@id": '1"'},
+                                             {"name": "<c>", "note": "x", "@id": "2"}]
+
+
+@pytest.mark.parametrize("rows, names", [
+    ([{"first name": 1}], {}),
+    ([{"id": 1}, {"2nd": 2}], {}),
+    ([{"@bad attr": 1, "id": 1}], {}),
+    ([{"id": 1}], {"root_element": "my root"}),
+    ([{"id": 1}], {"item_element": "ns:item"}),
+])
+def test_write_xml_rejects_invalid_names(tmp_path, converter, rows, names):
+    path = tmp_path / "out.xml"
+
+    assert not converter.write_xml(rows, str(path), **names)
+    assert not path.exists()
+
+
+def test_xml_streams_in_chunks(tmp_path, converter):
+    df = pd.DataFrame({"id": [str(i) for i in range(2500)], "v": ["x"] * 2500})
+    path = str(tmp_path / "big.xml")
+
+    assert converter.write_xml((df.iloc[i:i + 700] for i in range(0, 2500, 700)), path, pretty=False)
+
+    chunks = list(converter.iter_xml(path, chunk_size=1000))
+    assert [len(c) for c in chunks] == [1000, 1000, 500]
+    pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), df)
+
+
+# ---------- JSON / NDJSON ----------
+def test_read_json_accepts_nan_and_infinity(tmp_path, converter):
+    path = tmp_path / "nan.json"
+    path.write_text('[{"a": NaN, "b": 1}, {"a": Infinity, "b": 2}]', encoding="utf-8")
+
+    df = converter.read_json(str(path))
+
+    assert df is not None
+    assert df["a"].isna().iloc[0] and df["a"].iloc[1] == float("inf")
+    assert [r["b"] for r in converter.iter_json(str(path))] == [1, 2]
+
+
+def test_read_ndjson_accepts_nan(tmp_path, converter):
+    path = tmp_path / "nan.ndjson"
+    path.write_text('{"a": NaN}\n{"a": 1.5}\n', encoding="utf-8")
+
+    assert converter.read_ndjson(str(path))["a"].tolist()[1] == 1.5
+
+
+@pytest.mark.parametrize("fast", [True, False])
+def test_write_json_matches_json_dump(tmp_path, converter, fast):
+    records = [{"id": i, "name": f"n{i}", "nested": {"x": [i, None]}} for i in range(5)]
+    path = tmp_path / "out.json"
+
+    assert converter.write_json(records, str(path), fast=fast)
+
+    assert path.read_text(encoding="utf-8") == json.dumps(records, indent=2)
+    assert converter.read_json(str(path)).to_dict(orient="records") == records
+
+
+@pytest.mark.parametrize("value", ["hello world", 42, None, 1.5, {"a": [1, "é"]}, (1, 2)])
+def test_write_json_writes_non_record_values_whole(tmp_path, converter, value):
+    path = tmp_path / "out.json"
+
+    assert converter.write_json(value, str(path))
+
+    assert path.read_text(encoding="utf-8") == json.dumps(value, ensure_ascii=False, indent=2)
+
+
+def test_convert_text_to_json(tmp_path, converter):
+    (tmp_path / "note.txt").write_text("hello world", encoding="utf-8")
+
+    assert converter.convert_file(str(tmp_path / "note.txt"), str(tmp_path / "note.json"))
+
+    assert json.loads((tmp_path / "note.json").read_text(encoding="utf-8")) == "hello world"
+
+
+def test_ndjson_round_trip_in_chunks(tmp_path, converter):
+    df = pd.DataFrame({"id": range(25), "v": [f"x{i}" for i in range(25)]})
+    path = str(tmp_path / "data.ndjson")
+
+    assert converter.write_ndjson(df, path)
+
+    chunks = list(converter.iter_ndjson(path, chunk_size=10))
+    assert [len(c) for c in chunks] == [10, 10, 5]
+    pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), df)
+
+
+# ---------- Directory conversion ----------
+@pytest.fixture
+def tree(tmp_path):
+    src = tmp_path / "src"
+    for i, sub in enumerate(["", "a", "a/b"]):
+        (src / sub).mkdir(parents=True, exist_ok=True)
+        pd.DataFrame({"id": range(i * 10, i * 10 + 10)}).to_csv(src / sub / f"part{i}.csv", index=False)
+    (src / "notes.md").write_text("not data")
+    return src
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_convert_tree_mirrors_the_source_tree(tmp_path, converter, tree, workers):
+    result = converter.convert_tree(str(tree), str(tmp_path / "out"), "ndjson", workers=workers)
+
+    assert result["summary"]["converted"] == 3 and result["summary"]["failed"] == 0
+    assert converter.read_ndjson(str(tmp_path / "out" / "a" / "b" / "part2.ndjson"))["id"].tolist() == list(range(20, 30))
+    again = converter.convert_tree(str(tree), str(tmp_path / "out"), "ndjson", workers=workers)
+    assert again["summary"]["skipped"] == 3
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_convert_tree_keeps_sources_with_the_same_stem_apart(tmp_path, converter, workers):
+    src = tmp_path / "src"
+    src.mkdir()
+    converter.write_json([{"id": 1}], str(src / "x.json"))
+    converter.write_xml([{"id": "2"}], str(src / "x.xml"))
+    converter.write_json([{"id": 3}], str(src / "y.json"))
+
+    result = converter.convert_tree(str(src), str(tmp_path / "out"), "csv", workers=workers)
+
+    assert result["summary"]["converted"] == 3
+    assert sorted(os.listdir(tmp_path / "out")) == ["x.json.csv", "x.xml.csv", "y.csv"]
+    assert converter.read_csv(str(tmp_path / "out" / "x.xml.csv"))["id"].tolist() == [2]
+
+
+def test_convert_tree_rejects_unresolvable_collisions(tmp_path, converter):
+    src = tmp_path / "src"
+    src.mkdir()
+    for name in ("x.json", "x.xml", "x.json.csv"):
+        (src / name).write_text("")
+
+    with pytest.raises(ValueError, match="x.json.csv"):
+        converter.convert_tree(str(src), str(tmp_path / "out"), "csv")
+
+
+def test_convert_tree_hash_check_and_failures(tmp_path, converter, tree):
+    out = tmp_path / "out"
+    converter.convert_tree(str(tree), str(out), "json", check="hash")
+    os.utime(tree / "part0.csv")
+    (tree / "a" / "part1.csv").write_text("id\n99\n")
+    (tree / "a" / "b" / "part2.csv").write_bytes(b"\x00\xff")
+
+    result = converter.convert_tree(str(tree), str(out), "json", check="hash")
+
+    status = {os.path.basename(item["source"]): item["status"] for item in result["files"]}
+    assert status == {"part0.csv": "skipped", "part1.csv": "converted", "part2.csv": "failed"}
+    assert json.loads((out / "a" / "part1.json").read_text()) == [{"id": 99}]
+    assert not [name for name in os.listdir(out / "a" / "b") if name.startswith(".")]
+
+
+# ---------- Compression ----------
+@pytest.mark.parametrize("target", ["out.json.gz", "out.ndjson.zst", "out.xml.bz2", "out.csv.xz"])
+def test_convert_to_and_from_compressed_files(tmp_path, converter, target):
+    if target.endswith(".zst"):
+        pytest.importorskip("zstandard")
+    df = pd.DataFrame({"id": [str(i) for i in range(50)], "name": [f"é{i}" for i in range(50)]})
+    src = str(tmp_path / "in.csv.gz")
+    converter.write_csv(df, src)
+
+    assert converter.convert_file(src, str(tmp_path / target))
+    assert converter.convert_file(str(tmp_path / target), str(tmp_path / "back.csv"))
+
+    back = converter.read_csv(str(tmp_path / "back.csv")).astype(str)
+    pd.testing.assert_frame_equal(back, df)
+
+
+# ---------- Conversion routes ----------
+@pytest.fixture
+def table():
+    return pd.DataFrame({"id": [1, 2, 3], "when": ["2024-01-02", "2024-01-03", None],
+                         "at": ["2024-01-02T10:00:00"] * 3, "zero": [0.0, 1.5, 0.0], "flag": [True, False, True],
+                         "name": ["a", "b, c", 'say "hi"']})
+
+
+@pytest.mark.parametrize("source", ["csv", "ndjson", "csv.gz"])
+@pytest.mark.parametrize("target", ["parquet", "feather"])
+def test_direct_conversion_matches_pandas_route(tmp_path, converter, table, source, target):
+    src = str(tmp_path / f"data.{source}")
+    table.to_csv(src, index=False) if source.startswith("csv") else converter.write_ndjson(table, src)
+
+    assert converter.convert_file(src, str(tmp_path / f"direct.{target}"))
+    assert converter.convert_file(src, str(tmp_path / f"pandas.{target}"), direct=False)
+
+    direct = converter.auto_read(str(tmp_path / f"direct.{target}"))
+    pd.testing.assert_frame_equal(direct, converter.auto_read(str(tmp_path / f"pandas.{target}")), check_dtype=False)
+    assert direct["when"].tolist()[:2] == ["2024-01-02", "2024-01-03"] and direct["at"].dtype == object
+
+
+def test_ndjson_to_csv_keeps_pandas_conventions(tmp_path, converter, table):
+    src = str(tmp_path / "data.ndjson")
+    converter.write_ndjson(table, src)
+
+    assert converter.convert_file(src, str(tmp_path / "out.csv"))
+
+    assert (tmp_path / "out.csv").read_text() == table.to_csv(index=False)
+
+
+@pytest.mark.parametrize("text, value", [("42", 42), ('"x"', "x"), ("null", None)])
+def test_json_scalars_keep_the_json_codec(tmp_path, converter, text, value):
+    path = tmp_path / "value.json"
+    path.write_text(text)
+
+    assert converter.detect_format(str(path)) == "json"
+    assert converter.auto_read(str(path)) == value
+
+
+@pytest.mark.parametrize("header", ["[Date],Value", "{id},Value", "<tag>,Value"])
+def test_csv_with_bracketed_header_keeps_the_csv_codec(tmp_path, converter, header):
+    path = tmp_path / "data.csv"
+    path.write_text(f"{header}\n2024-01-02,1\n")
+
+    assert converter.detect_format(str(path)) == "csv"
+    assert converter.auto_read(str(path)).columns.tolist() == header.split(",")
+    assert converter.convert_file(str(path), str(tmp_path / "data.json"))
+
+
+@pytest.mark.parametrize("name", ["data", "data.csv"])
+def test_detect_trusts_binary_magic_over_extension(tmp_path, converter, table, name):
+    path = tmp_path / name
+    table.to_parquet(path)
+
+    assert converter.detect_format(str(path)) == "parquet"
+    pd.testing.assert_frame_equal(converter.auto_read(str(path)), table)
+
+
+def test_detect_sniffs_text_without_extension(tmp_path, converter):
+    (tmp_path / "records").write_text('{"a": 1}\n{"a": 2}\n')
+
+    assert converter.detect_format(str(tmp_path / "records")) == "ndjson"
@@ -0,0 +1,505 @@
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import data_processor
+from data_processor import DataProcessor
+
+
+@pytest.fixture
+def processor():
+    return DataProcessor(verbose=False)
+
+
+@pytest.fixture
+def frame():
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        "id": np.arange(1000),
+        "group": rng.choice(["a", "b", "c"], 1000),
+        "value": rng.normal(size=1000).round(6),
+    })
+
+
+def _chunks(df, size):
+    return (df.iloc[start:start + size] for start in range(0, len(df), size))
+
+
+# ---------- Cleaning ----------
+def test_clean_file_matches_clean_data(tmp_path, processor):
+    df = pd.DataFrame({"name": [" a", "b ", None, " a", "c"] * 40, "value": [1.0, None, 3.0, 1.0, 5.0] * 40,
+                       "n": range(200)})
+    df = pd.concat([df, df.iloc[:30]], ignore_index=True)
+    src, dst = str(tmp_path / "raw.csv"), str(tmp_path / "clean.csv")
+    df.to_csv(src, index=False)
+
+    summary = processor.clean_file(src, dst, chunk_size=64)
+
+    expected = processor.clean_data(processor.read_data(src)).reset_index(drop=True)
+    assert summary == {"rows_in": 230, "rows_out": 200, "duplicates": 30}
+    pd.testing.assert_frame_equal(processor.read_data(dst), expected, check_dtype=False)
+
+
+def test_clean_file_with_nulls_only_in_later_chunks(tmp_path, processor):
+    src, dst = tmp_path / "raw.csv", str(tmp_path / "clean.csv")
+    src.write_text("a,b\n1,p\n2,q\n3,r\n1,p\n,s\n2,q\n")
+
+    summary = processor.clean_file(str(src), dst, chunk_size=3)
+
+    assert summary["duplicates"] == 2
+    assert (tmp_path / "clean.csv").read_text() == processor.clean_data(pd.read_csv(src)).to_csv(index=False)
+
+
+# ---------- Filtering ----------
+def test_filter_data_combines_conditions(processor, frame):
+    frame = frame.assign(label=[None if i % 7 == 0 else f"item-{i}" for i in range(len(frame))])
+    conditions = [
+        {"column": "value", "operator": "greater_than", "value": 0},
+        {"column": "label", "operator": "contains", "value": "1"},
+        {"column": "group", "operator": "in", "value": ["a", "b"]},
+        {"column": "id", "operator": "between", "value": [100, 900]},
+        {"column": "id", "operator": "no_such_operator", "value": 1},
+    ]
+
+    out = processor.filter_data(frame, conditions)
+
+    expected = frame[(frame["value"] > 0) & frame["label"].str.contains("1", na=False)
+                     & frame["group"].isin(["a", "b"]) & frame["id"].between(100, 900)]
+    pd.testing.assert_frame_equal(out, expected)
+
+
+# ---------- Dtype compaction ----------
+def test_compact_dtypes_is_lossless(processor, frame):
+    frame = frame.assign(half=np.arange(len(frame)) / 2, name=[f"row-{i}" for i in range(len(frame))])
+
+    out = processor.compact_dtypes(frame)
+
+    assert out["id"].dtype == np.int16 and out["half"].dtype == np.float32 and out["value"].dtype == np.float64
+    assert out["group"].dtype == "category" and out["name"].dtype == "string"
+    assert processor.get_data_info(out)["memory_before_compaction"] > out.memory_usage(deep=True).sum()
+    pd.testing.assert_frame_equal(out.astype(frame.dtypes.to_dict()), frame)
+
+
+def test_compact_dtypes_stable_only_converts_strings(processor, frame):
+    out = processor.compact_dtypes(frame, stable=True)
+
+    assert out["id"].dtype == np.int64 and out["group"].dtype == "string"
+
+
+# ---------- Columnar IO ----------
+@pytest.mark.parametrize("ext", ["parquet", "feather", "arrow"])
+def test_write_arrow_formats_in_chunks(tmp_path, processor, frame, ext):
+    path = str(tmp_path / f"data.{ext}")
+    processor.write_data(_chunks(frame, 300), path)
+
+    pd.testing.assert_frame_equal(processor.read_data(path), frame)
+    assert sum(len(chunk) for chunk in processor.iter_chunks(path, 250)) == len(frame)
+
+
+@pytest.mark.parametrize("ext", ["parquet", "feather"])
+def test_write_arrow_types_columns_that_start_all_null(tmp_path, processor, ext):
+    path = str(tmp_path / f"data.{ext}")
+    chunks = [pd.DataFrame({"id": [1, 2], "note": [np.nan, np.nan]}),
+              pd.DataFrame({"id": [3, 4], "note": ["x", None]}),
+              pd.DataFrame({"id": [5], "note": [np.nan]})]
+
+    processor.write_data(iter(chunks), path)
+
+    assert processor.read_data(path)["note"].tolist() == [None, None, "x", None, None]
+
+
+def test_read_parquet_projection_and_filter(tmp_path, processor, frame):
+    path = str(tmp_path / "data.parquet")
+    processor.write_data(frame, path)
+
+    out = processor.read_data(path, columns=["id"], conditions=[{"column": "group", "operator": "equals", "value": "a"}])
+
+    assert list(out.columns) == ["id"]
+    assert out["id"].tolist() == frame.loc[frame["group"] == "a", "id"].tolist()
+
+
+# ---------- Aggregation ----------
+@pytest.mark.parametrize("max_groups", [1_000_000, 50])
+def test_chunked_aggregate_matches_groupby(tmp_path, processor, frame, max_groups):
+    frame = frame.assign(bucket=frame["id"] % 97)
+    aggregations = {"value": ["sum", "mean", "std", "min", "max", "count"], "id": "size"}
+
+    out = processor.aggregate_data(_chunks(frame, 64), ["group", "bucket"], aggregations,
+                                   max_groups=max_groups, spill_dir=str(tmp_path), spill_partitions=4)
+
+    expected = processor.aggregate_data(frame, ["group", "bucket"], aggregations)
+    sort = ["group", "bucket"]
+    pd.testing.assert_frame_equal(out.sort_values(sort, ignore_index=True), expected.sort_values(sort, ignore_index=True),
+                                  check_dtype=False)
+    assert os.listdir(tmp_path) == []
+
+
+def test_chunked_aggregate_rejects_unmergeable_functions(processor, frame):
+    with pytest.raises(ValueError, match="median"):
+        processor.aggregate_data(_chunks(frame, 100), "group", {"value": "median"})
+
+
+# ---------- Statistics ----------
+def test_exact_statistics_match_pandas(processor, frame):
+    stats = processor.get_statistics(frame)
+    chunked = processor.get_statistics(_chunks(frame, 128))
+
+    value = frame["value"]
+    assert set(stats) == {"id", "value"}
+    assert stats["value"]["mean"] == pytest.approx(value.mean())
+    assert stats["value"]["std"] == pytest.approx(value.std())
+    assert stats["value"]["median"] == pytest.approx(value.median())
+    assert stats["value"]["quartiles"][0.25] == pytest.approx(value.quantile(0.25))
+    assert chunked == stats
+
+
+@pytest.mark.parametrize("workers", [None, 2])
+def test_approximate_statistics_within_rank_error(processor, workers):
+    values = pd.Series(np.random.default_rng(1).exponential(size=20_000))
+    data = pd.DataFrame({"x": values})
+
+    stats = processor.get_statistics(data, approximate=True, workers=workers)["x"]
+
+    assert stats["count"] == len(values) and stats["min"] == values.min() and stats["max"] == values.max()
+    assert stats["mean"] == pytest.approx(values.mean()) and stats["std"] == pytest.approx(values.std())
+    for q, estimate in stats["quartiles"].items():
+        assert abs((values <= estimate).mean() - q) <= 2 * stats["rank_error"]
+
+
+# ---------- Lazy plans ----------
+def test_lazy_plan_pushes_down_filters_and_projection(tmp_path, processor, frame):
+    path = str(tmp_path / "data.csv")
+    frame.assign(extra="unused").to_csv(path, index=False)
+    plan = (processor.scan(path).filter([{"column": "value", "operator": "greater_than", "value": 0}])
+            .convert({"id": "int32"}).filter([{"column": "group", "operator": "not_equals", "value": "c"}])
+            .groupby("group").agg({"value": ["sum", "count"]}))
+
+    lines = plan.explain().splitlines()
+
+    assert "columns=['group', 'value']" in lines[0] and "greater_than" in lines[0]
+    assert lines[1] == "  Rows[convert, filter]" and lines[2].startswith("  Agg")
+
+
+@pytest.mark.parametrize("chunk_size", [None, 128])
+def test_lazy_plan_matches_eager_pandas(tmp_path, processor, frame, chunk_size):
+    path = str(tmp_path / "data.csv")
+    frame.to_csv(path, index=False)
+    positive = [{"column": "value", "operator": "greater_than", "value": 0}]
+
+    out = processor.scan(path, chunk_size).filter(positive).select(["id", "group"]).sort("id", False).collect()
+    grouped = processor.scan(path, chunk_size).filter(positive).groupby("group").agg({"value": "mean"}).collect()
+
+    kept = frame[frame["value"] > 0]
+    pd.testing.assert_frame_equal(out.reset_index(drop=True),
+                                  kept[["id", "group"]].sort_values("id", ascending=False, ignore_index=True))
+    expected = kept.groupby("group").agg({"value": "mean"}).reset_index()
+    pd.testing.assert_frame_equal(grouped.sort_values("group", ignore_index=True), expected)
+
+
+# ---------- Pipelines ----------
+@pytest.mark.parametrize("chunk_size", [None, 128])
+def test_pipeline_runs_steps_over_one_read(tmp_path, processor, frame, chunk_size):
+    path = str(tmp_path / "data.csv")
+    frame.to_csv(path, index=False)
+    spec = {"input": path, "chunk_size": chunk_size, "steps": [
+        {"op": "filter", "conditions": [{"column": "value", "operator": "greater_than", "value": 0}], "as": "positive"},
+        {"op": "write", "file_path": str(tmp_path / "positive.parquet")},
+        {"op": "stats", "approximate": True, "as": "positive_stats"},
+        {"op": "aggregate", "group_by": "group", "aggregations": {"value": "sum"}, "as": "totals"},
+        {"op": "sort", "columns": "id", "ascending": False, "from": "positive", "as": "by_id"},
+    ]}
+
+    results = processor.run_pipeline(spec)
+
+    positive = frame[frame["value"] > 0]
+    assert results["outputs"] == [str(tmp_path / "positive.parquet")]
+    assert len(processor.read_data(str(tmp_path / "positive.parquet"))) == len(positive)
+    assert results["positive_stats"]["id"]["count"] == len(positive)
+    assert results["totals"].set_index("group")["value"].to_dict() == pytest.approx(
+        positive.groupby("group")["value"].sum().to_dict())
+    assert results["by_id"]["id"].tolist() == sorted(positive["id"], reverse=True)
+
+
+def test_pipeline_rejects_unknown_steps(processor):
+    with pytest.raises(ValueError, match="explode"):
+        processor.run_pipeline({"input": "unused.csv", "steps": [{"op": "explode"}]})
+
+
+# ---------- Multi-file datasets ----------
+@pytest.fixture
+def dataset(tmp_path, frame):
+    root = tmp_path / "dataset"
+    for year in (2023, 2024):
+        for group, part in frame[frame["id"] % 2 == year % 2].groupby("group"):
+            directory = root / f"year={year}" / f"group={group}"
+            directory.mkdir(parents=True)
+            part.drop(columns="group").to_parquet(directory / "part-0.parquet", index=False)
+    (root / "_SUCCESS").write_text("")
+    return root
+
+
+@pytest.mark.parametrize("workers", [None, 2])
+def test_read_partitioned_directory(processor, frame, dataset, workers):
+    out = processor.read_data(str(dataset), workers=workers)
+
+    assert sorted(out.columns) == ["group", "id", "value", "year"]
+    assert out["year"].dtype.kind == "i"
+    pd.testing.assert_frame_equal(out.sort_values("id", ignore_index=True)[["id", "group", "value"]], frame)
+
+
+def test_read_dataset_prunes_partitions_and_streams(processor, frame, dataset):
+    conditions = [{"column": "year", "operator": "equals", "value": 2024},
+                  {"column": "value", "operator": "greater_than", "value": 0}]
+
+    chunks = list(processor.read_data(str(dataset), chunk_size=50, columns=["id", "year"], conditions=conditions))
+    globbed = processor.read_data(str(dataset / "year=2023" / "*" / "*.parquet"))
+
+    out = pd.concat(chunks, ignore_index=True)
+    expected = frame[(frame["id"] % 2 == 0) & (frame["value"] > 0)]
+    assert list(out.columns) == ["id", "year"] and set(out["year"]) == {2024}
+    assert sorted(out["id"]) == sorted(expected["id"])
+    assert sorted(globbed["id"]) == list(range(1, 1000, 2))
+
+
+# ---------- Compression ----------
+@pytest.mark.parametrize("name", ["data.csv.gz", "data.csv.bz2", "data.csv.xz", "data.csv.zst", "data.json.gz"])
+def test_compressed_round_trip(tmp_path, processor, frame, name):
+    if name.endswith(".zst"):
+        pytest.importorskip("zstandard")
+    path = str(tmp_path / name)
+
+    processor.write_data(_chunks(frame, 300) if ".csv" in name else frame, path)
+
+    pd.testing.assert_frame_equal(processor.read_data(path), frame)
+    if ".csv" in name:
+        assert sum(len(chunk) for chunk in processor.read_data(path, chunk_size=256)) == len(frame)
+
+
+def test_compressed_csv_without_suffix_is_sniffed(tmp_path, processor, frame):
+    path = str(tmp_path / "data.csv")
+    processor.write_data(frame, path, compression="gzip")
+
+    with open(path, "rb") as f:
+        assert f.read(2) == b"\x1f\x8b"
+    pd.testing.assert_frame_equal(processor.read_data(path), frame)
+
+
+def test_compressed_columnar_formats_are_rejected(tmp_path, processor, frame):
+    with pytest.raises(ValueError, match="parquet"):
+        processor.write_data(frame, str(tmp_path / "data.parquet.gz"))
+
+
+# ---------- Partitioned merge ----------
+@pytest.mark.parametrize("how", ["inner", "left", "outer"])
+def test_partitioned_merge_matches_pd_merge(processor, how):
+    left = pd.DataFrame({"key": np.arange(50), "amount": np.arange(50) * 2, "label": [f"l{i}" for i in range(50)]})
+    right = pd.DataFrame({"key": np.arange(25, 60), "weight": np.arange(35, dtype=np.int32)})
+
+    # Many more partitions than keys, so plenty of partitions have rows on one side only
+    parts = list(processor.merge_datasets(_chunks(left, 7), _chunks(right, 9), on="key", how=how, partitions=64))
+    dtypes = {tuple(part.dtypes.astype(str)) for part in parts}
+    out = pd.concat(parts, ignore_index=True).sort_values("key", ignore_index=True)
+    expected = pd.merge(left, right, on="key", how=how).sort_values("key", ignore_index=True)
+
+    assert len(dtypes) == 1
+    assert out["key"].dtype == np.int64 and out["label"].dtype == object
+    pd.testing.assert_frame_equal(out, expected, check_dtype=False)
+
+
+def test_partitioned_merge_to_parquet_sink(tmp_path, processor):
+    left = pd.DataFrame({"key": np.arange(40), "amount": np.arange(40.0)})
+    right = pd.DataFrame({"key": np.arange(0, 40, 3), "tag": np.arange(14), "flag": [True] * 14})
+    path = str(tmp_path / "joined.parquet")
+
+    processor.write_data(processor.merge_datasets(left, right, on="key", how="left", partitions=16), path)
+
+    out = processor.read_data(path).sort_values("key", ignore_index=True)
+    assert len(out) == 40
+    assert out["tag"].notna().sum() == 14
+
+
+# ---------- Schema sidecars ----------
+def test_schema_sidecar_expires_when_rows_are_appended(tmp_path):
+    processor = DataProcessor(verbose=False, schema_cache=True)
+    path = tmp_path / "data.csv"
+    path.write_text("id,name\n1,a\n2,b\n")
+    assert processor.read_data(str(path))["id"].dtype == np.int64
+
+    with open(path, "a") as f:
+        f.write(",c\n")
+    out = processor.read_data(str(path))
+
+    pd.testing.assert_frame_equal(out, pd.read_csv(path))
+    assert processor.load_schema(str(path))["dtype"]["id"] == "float64"
+
+
+def test_declared_schema_types_survive_appends(tmp_path):
+    processor = DataProcessor(verbose=False, schema_cache=True)
+    path = tmp_path / "data.csv"
+    path.write_text("id,name,when\n1,a,2024-01-02\n2,b,2024-01-03\n")
+    processor.read_data(str(path))
+    processor.declare_schema(str(path), dtype={"name": "category"})
+
+    with open(path, "a") as f:
+        f.write(",a,2024-01-04\n")
+    out = processor.read_data(str(path))
+
+    assert out["name"].dtype == "category" and out["id"].dtype == np.float64
+    assert str(out["when"].dtype).startswith("datetime64")
+    assert processor.load_schema(str(path))["declared"] == ["name"]
+
+
+# ---------- Type conversions ----------
+def test_convert_data_types_only_replaces_converted_columns(processor, frame):
+    frame = frame.assign(when=["2024-01-02"] * len(frame))
+
+    out = processor.convert_data_types(frame, {"id": "int32", "when": "datetime", "missing": "int8"})
+
+    assert out["id"].dtype == np.int32 and str(out["when"].dtype).startswith("datetime64")
+    assert frame["id"].dtype == np.int64 and frame["when"].dtype == object
+    # Untouched columns share memory with the input instead of being copied
+    assert np.shares_memory(out["value"].to_numpy(), frame["value"].to_numpy())
+
+
+def _cli(*args, cwd=None):
+    result = subprocess.run([sys.executable, data_processor.__file__, *args], capture_output=True, text=True,
+                            cwd=cwd, env=dict(os.environ, HOME=str(cwd)) if cwd else None)
+    assert result.returncode == 0, result.stderr
+    return result.stdout
+
+
+# ---------- Sorting ----------
+@pytest.mark.parametrize("memory_limit", [1, 256 * 1024 ** 2])
+def test_external_sort_matches_sort_values(tmp_path, processor, frame, memory_limit):
+    columns, ascending = ["group", "value"], [True, False]
+
+    parts = list(processor.sort_data(_chunks(frame, 70), columns, ascending, memory_limit=memory_limit,
+                                     spill_dir=str(tmp_path)))
+
+    expected = frame.sort_values(columns, ascending=ascending, ignore_index=True)
+    pd.testing.assert_frame_equal(pd.concat(parts, ignore_index=True), expected)
+    assert os.listdir(tmp_path) == []
+
+
+# ---------- Sampling ----------
+def test_cli_sample_matches_dataframe_sample(tmp_path, frame):
+    path = tmp_path / "data.csv"
+    frame.to_csv(path, index=False)
+
+    out = _cli("sample", str(path), "5", cwd=tmp_path)
+
+    assert str(frame.sample(n=5, random_state=42)) in out
+
+
+def test_streaming_sample_is_reproducible(processor, frame):
+    first = processor.sample_data(_chunks(frame, 64), n=20)
+    second = processor.sample_data(_chunks(frame, 64), n=20)
+
+    assert len(first) == 20 and first["id"].is_unique
+    pd.testing.assert_frame_equal(first, second)
+
+
+@pytest.mark.parametrize("stratify", [None, "group"])
+def test_streaming_sample_of_zero_rows(processor, frame, stratify):
+    out = processor.sample_data(_chunks(frame, 64), n=0, stratify=stratify)
+
+    pd.testing.assert_frame_equal(out, processor.sample_data(frame, n=0, stratify=stratify))
+
+
+def test_streaming_stratified_sample(processor, frame):
+    out = processor.sample_data(_chunks(frame, 100), n=5, stratify="group")
+
+    assert out.groupby("group").size().to_dict() == {"a": 5, "b": 5, "c": 5}
+
+
+# ---------- Streaming info ----------
+@pytest.mark.parametrize("duplicates", ["exact", "bloom"])
+def test_streaming_info_matches_in_memory(processor, frame, duplicates):
+    frame = pd.concat([frame, frame.iloc[::10]], ignore_index=True)
+    frame.loc[::50, "value"] = np.nan
+
+    info = processor.get_data_info(_chunks(frame, 128), duplicates=duplicates, expected_rows=10_000)
+
+    expected = processor.get_data_info(frame)
+    for key in ("rows", "columns", "dtypes", "null_counts", "duplicates"):
+        assert info[key] == expected[key], key
+    assert info["distinct_counts"]["group"] == 3
+    assert abs(info["distinct_counts"]["id"] - 1000) <= 3 * info["distinct_error"] * 1000
+    assert ("duplicates_error_rate" in info) == (duplicates == "bloom")
+
+
+# ---------- Checkpoints ----------
+def test_incremental_info_and_stats_match_full_scan(tmp_path, processor, frame):
+    frame = pd.concat([frame, frame.head(10)], ignore_index=True)
+    path = str(tmp_path / "data.csv")
+    frame.iloc[:600].to_csv(path, index=False)
+    processor.get_data_info(path, checkpoint=str(tmp_path / "info.ckpt"), expected_rows=10_000, chunk_size=128)
+    processor.get_statistics(path, approximate=True, checkpoint=str(tmp_path / "stats.ckpt"), chunk_size=128)
+    frame.iloc[600:].to_csv(path, mode="a", header=False, index=False)
+
+    info = processor.get_data_info(path, checkpoint=str(tmp_path / "info.ckpt"), expected_rows=10_000, chunk_size=128)
+    stats = processor.get_statistics(path, approximate=True, checkpoint=str(tmp_path / "stats.ckpt"), chunk_size=128)
+
+    assert info["rows"] == len(frame) and info["duplicates"] == 10
+    assert info["null_counts"] == {"id": 0, "group": 0, "value": 0}
+    assert stats["value"]["count"] == len(frame)
+    assert stats["value"]["mean"] == pytest.approx(frame["value"].mean())
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
+
+
+def test_info_checkpoint_size_does_not_grow_with_rows(tmp_path, processor):
+    path, ckpt = str(tmp_path / "data.csv"), str(tmp_path / "info.ckpt")
+    pd.DataFrame({"id": range(100)}).to_csv(path, index=False)
+    processor.get_data_info(path, checkpoint=ckpt, expected_rows=10_000)
+    small = os.path.getsize(ckpt)
+
+    pd.DataFrame({"id": range(100, 50_000)}).to_csv(path, mode="a", header=False, index=False)
+    info = processor.get_data_info(path, checkpoint=ckpt, expected_rows=10_000)
+
+    assert info["rows"] == 50_000
+    assert os.path.getsize(ckpt) < small + 4096
+
+
+# ---------- Result cache ----------
+def test_result_cache_creates_directory_on_first_put(tmp_path, frame):
+    path = tmp_path / "data.csv"
+    frame.to_csv(path, index=False)
+    cache = data_processor.ResultCache(str(tmp_path / "cache"))
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return {"rows": len(frame)}
+
+    cache.clear()
+    assert not (tmp_path / "cache").exists()
+    assert cache.get(cache.key(str(path), "info")) == (False, None)
+    assert cache.get_or_compute(str(path), "info", None, compute) == {"rows": 1000}
+    assert cache.get_or_compute(str(path), "info", None, compute) == {"rows": 1000}
+    assert len(calls) == 1 and (tmp_path / "cache").is_dir()
+
+
+def test_cli_cache_is_opt_in(tmp_path, frame):
+    path = tmp_path / "data.csv"
+    frame.to_csv(path, index=False)
+
+    _cli("info", str(path), cwd=tmp_path)
+    _cli("info", str(path), "--cache-dir", cwd=tmp_path)
+    assert not (tmp_path / ".cache").exists()
+
+    _cli("info", str(path), "--cache-dir", str(tmp_path / "cache"), cwd=tmp_path)
+    assert [name for name in os.listdir(tmp_path / "cache") if name.endswith(".pkl")]
+
+
+def test_cli_info_with_checkpoint(tmp_path, frame):
+    path = tmp_path / "data.csv"
+    frame.to_csv(path, index=False)
+
+    _cli("info", str(path), "--checkpoint", cwd=tmp_path)
+    _cli("info", str(path), "--checkpoint", str(tmp_path / "info.ckpt"), cwd=tmp_path)
+
+    assert (tmp_path / "info.ckpt").is_file()
@@ -0,0 +1,93 @@
+import json
+
+import pandas as pd
+import pytest
+
+from data_converter import DataConverter
+from data_processor import DataProcessor
+from profiling import Profiler
+
+
+@pytest.fixture
+def frame():
+    return pd.DataFrame({"id": range(100), "group": ["a", "b"] * 50})
+
+
+# ---------- Records ----------
+def test_profiler_records_rows_and_bytes(tmp_path, frame):
+    processor = DataProcessor(verbose=False)
+    path = str(tmp_path / "data.csv")
+    seen = []
+
+    with Profiler(callback=seen.append, trace_memory=True) as profiler:
+        processor.write_data(frame, path)
+        df = processor.read_data(path)
+        processor.filter_data(df, [{"column": "group", "operator": "equals", "value": "a"}])
+        DataConverter().convert_file(path, str(tmp_path / "data.json"))
+
+    records = {r["name"]: r for r in profiler.records}
+    assert seen == profiler.records
+    assert records["DataProcessor.filter_data"]["rows_in"] == 100
+    assert records["DataProcessor.filter_data"]["rows_out"] == 50
+    assert records["DataConverter.convert_file"]["bytes_read"] == (tmp_path / "data.csv").stat().st_size
+    assert records["DataConverter.convert_file"]["bytes_written"] == (tmp_path / "data.json").stat().st_size
+    assert all(r["peak_memory_delta"] is not None and r["error"] is None for r in profiler.records)
+
+
+def test_profiler_nests_spans_and_stops_recording(frame):
+    processor = DataProcessor(verbose=False)
+    profiler = Profiler().start()
+    with profiler.span("batch", label="x") as fields:
+        processor.clean_data(frame)
+        fields["rows_in"] = len(frame)
+    profiler.stop()
+    processor.clean_data(frame)
+
+    assert [(r["name"], r["depth"]) for r in profiler.records] == [("DataProcessor.clean_data", 1), ("batch", 0)]
+    assert profiler.records[1]["rows_in"] == 100 and profiler.records[1]["args"] == {"label": "x"}
+    assert profiler.summary()["DataProcessor.clean_data"]["calls"] == 1
+
+
+# ---------- Streams and threads ----------
+def test_profiler_spans_cover_streamed_results(tmp_path, frame):
+    processor = DataProcessor(verbose=False)
+    path = str(tmp_path / "data.csv")
+    frame.to_csv(path, index=False)
+
+    with Profiler() as profiler:
+        chunks = processor.sort_data((frame.iloc[i:i + 30] for i in range(0, 100, 30)), "id", memory_limit=1)
+        assert profiler.records == []
+        assert sum(len(chunk) for chunk in chunks) == 100
+        reader = processor.read_data(path, chunk_size=40)
+        first = next(iter(reader))
+        reader.close()
+
+    records = {r["name"]: r for r in profiler.records}
+    assert records["DataProcessor.sort_data"]["rows_out"] == 100
+    assert records["DataProcessor.read_data"]["rows_out"] == len(first) == 40
+
+
+def test_profiler_records_pipeline_tap_threads(tmp_path, frame):
+    path = str(tmp_path / "data.csv")
+    frame.to_csv(path, index=False)
+    spec = {"input": path, "chunk_size": 25,
+            "steps": [{"op": "stats", "approximate": True}, {"op": "write", "file_path": str(tmp_path / "out.csv")}]}
+
+    with Profiler() as profiler:
+        DataProcessor(verbose=False).run_pipeline(spec)
+
+    names = [r["name"] for r in profiler.records]
+    assert "DataProcessor.get_statistics" in names and "DataProcessor.write_data" in names
+
+
+# ---------- Export ----------
+def test_profiler_exports_chrome_trace(tmp_path, frame):
+    with Profiler() as profiler:
+        DataProcessor(verbose=False).get_data_info(frame)
+    path = tmp_path / "trace.json"
+
+    profiler.export_chrome_trace(str(path))
+
+    events = json.loads(path.read_text())["traceEvents"]
+    assert [(e["name"], e["ph"], e["cat"]) for e in events] == [("DataProcessor.get_data_info", "X", "DataProcessor")]
+    assert events[0]["args"]["rows_in"] == 100